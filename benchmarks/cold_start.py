@@ -0,0 +1,131 @@
+"""
+起動直後の初回表示にかかるモジュールの読み込み時間とウォームアップの時間のベンチマーク.
+
+ナビゲーション (src/main.py) と各ページのスクリプトが先頭で読み込むモジュールを, 新しいプロセスで読み込む時間を計測する.
+Streamlit 自体はサーバの起動時に読み込まれているため, 計測から除く.
+
+    uv run python benchmarks/cold_start.py
+    uv run python benchmarks/cold_start.py --warmup
+
+--warmup を指定した場合はウォームアップを実行し, 段階ごとの時間を表示する.
+ウォームアップはプロバイダから価格データを取得するため, ネットワークに接続する.
+"""
+
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from investment_analytics.services.warmup import run_warmup
+
+SOURCE_DIRECTORY = Path(__file__).resolve().parent.parent / "src"
+
+SCRIPTS = {
+    "navigation": SOURCE_DIRECTORY / "main.py",
+    "top": SOURCE_DIRECTORY / "investment_analytics" / "pages" / "top.py",
+    "realtime": SOURCE_DIRECTORY / "investment_analytics" / "pages" / "realtime.py",
+    "history": SOURCE_DIRECTORY / "investment_analytics" / "pages" / "history.py",
+    "screener": SOURCE_DIRECTORY / "investment_analytics" / "pages" / "screener.py",
+}
+
+DEFAULT_REPEAT = 5
+
+# 新しいプロセスで Streamlit を読み込んだ後, 指定したモジュールの読み込み時間 (秒) を出力する
+IMPORT_TIMER = """
+import importlib, sys, time
+import streamlit
+started_at = time.perf_counter()
+for module in sys.argv[1:]:
+    importlib.import_module(module)
+print(time.perf_counter() - started_at)
+"""
+
+
+def _collect_imports(path: Path) -> list[str]:
+    """
+    スクリプトの先頭 (モジュールの直下) で読み込むモジュールを列挙する.
+
+    - 条件分岐や関数の中で読み込むモジュールは含めない.
+
+    Args:
+        path (Path): スクリプトのパス.
+
+    Returns:
+        list[str]: モジュールの名前のリスト.
+    """
+    modules = []
+
+    for node in ast.parse(path.read_text()).body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        if isinstance(node, ast.ImportFrom) and node.module is not None:
+            modules.append(node.module)
+
+    return list(dict.fromkeys(modules))
+
+
+def _measure_import(modules: list[str], repeat: int) -> list[float]:
+    """
+    新しいプロセスでモジュールを読み込む時間を計測する.
+
+    Args:
+        modules (list[str]): モジュールの名前のリスト.
+        repeat (int): 計測の回数.
+
+    Returns:
+        list[float]: 読み込み時間 (秒) のリスト.
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(SOURCE_DIRECTORY), os.environ.get("PYTHONPATH", "")])}
+    seconds_list = []
+
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_TIMER, *modules],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        seconds_list.append(float(result.stdout))
+
+    return seconds_list
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="各スクリプトの計測の回数")
+    parser.add_argument("--warmup", action="store_true", help="ウォームアップを実行して段階ごとの時間を表示する")
+    args = parser.parse_args()
+
+    header = f"{'script':<12} {'modules':>7} {'min ms':>10} {'median ms':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for name, path in SCRIPTS.items():
+        modules = _collect_imports(path)
+
+        try:
+            seconds_list = _measure_import(modules, args.repeat)
+        except subprocess.CalledProcessError as e:
+            print(f"{name:<12} {len(modules):>7} failed: {e.stderr.strip().splitlines()[-1]}")
+            continue
+
+        print(
+            f"{name:<12} {len(modules):>7} {min(seconds_list) * 1000:>10.1f}"
+            f" {statistics.median(seconds_list) * 1000:>10.1f}"
+        )
+
+    if args.warmup:
+        report = run_warmup()
+        print()
+        for phase, seconds in report.phase_to_seconds.items():
+            print(f"warmup {phase:<10} {seconds * 1000:>10.1f} ms")
+        for error in report.errors:
+            print(f"error: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+時系列チャートのハイライト算出のベンチマーク.
+
+1 年・10 年・30 年の合成データで create_history_chart_options の実行時間を計測する.
+
+    uv run python benchmarks/highlight_areas.py
+"""
+
+import datetime
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from investment_analytics.components.charts import create_history_chart_options
+from investment_analytics.services.analysis import compute_daily_metrics
+from investment_analytics.services.analysis import compute_weekly_metrics
+
+YEARS_LIST = [1, 10, 30]
+
+REPEAT = 5
+
+
+def _create_daily_df(years: int) -> pd.DataFrame:
+    """
+    合成した日次の価格データを生成する.
+
+    Args:
+        years (int): 期間 (年).
+
+    Returns:
+        pd.DataFrame: 日次の価格データ.
+    """
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range(end="2025-01-01", periods=years * 252, tz="America/New_York")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.012, len(index))))
+    return pd.DataFrame({"Close": close}, index=index)
+
+
+def main() -> None:
+    print(f"{'years':>5} {'rows':>6} {'areas':>6} {'seconds':>10}")
+
+    for years in YEARS_LIST:
+        raw_df = _create_daily_df(years)
+        start_date = raw_df.index[0].date() + datetime.timedelta(days=7)
+        daily_df = compute_daily_metrics(raw_df, 100, start_date)
+        weekly_df = compute_weekly_metrics(daily_df, start_date)
+
+        def run() -> dict:
+            # 閾値を低くしてハイライトされる週を多くする
+            return create_history_chart_options(daily_df, weekly_df, 0.5, "下落", "red")  # noqa: B023
+
+        seconds = min(timeit.repeat(run, number=1, repeat=REPEAT))
+        areas = len(run()["series"][0]["markArea"]["data"])
+        print(f"{years:>5} {len(daily_df):>6} {areas:>6} {seconds:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+複数のセッションの再実行を模擬する負荷試験.
+
+ReplayProvider (生成した価格データを遅延・エラー付きで返す) に切り替え, ネットワークに接続せずに実行する.
+各セッションはスレッドとして並行に動作し, リアルタイム分析 (初期表示の全銘柄のリアルタイム情報とチャート) または
+時系列分析 (ランダムな銘柄・期間の価格データ, 指標, チャート) の処理を 1 回の再実行として繰り返す.
+
+    uv run python benchmarks/load_test.py
+    uv run python benchmarks/load_test.py --sessions 32 --reruns 50 --latency 0.2 --error-rate 0.05
+    uv run python benchmarks/load_test.py --warmup
+
+スループット (再実行/秒), 再実行の時間の p50/p99, プロバイダの呼び出し回数, キャッシュのヒット率を表示する.
+"""
+
+import argparse
+import datetime
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+from investment_analytics.components.charts import create_history_chart_html
+from investment_analytics.components.charts import create_history_chart_options
+from investment_analytics.components.charts import create_realtime_chart_options
+from investment_analytics.models.ticker import get_ticker_registry
+from investment_analytics.services import market_data
+from investment_analytics.services.incremental_metrics import IncrementalMetrics
+from investment_analytics.services.market_data import HISTORY_LOOKBACK
+from investment_analytics.services.market_data import fetch_history
+from investment_analytics.services.providers import ReplayProvider
+from investment_analytics.services.providers import set_provider
+from investment_analytics.services.realtime_snapshot import fetch_realtime_snapshots
+from investment_analytics.services.realtime_state import DEFAULT_TICKER_SYMBOLS
+from investment_analytics.services.warmup import run_warmup
+
+HISTORY_YEARS = (1, 5, 10, 30)
+
+MA_PERIOD = 100
+
+
+@dataclass(frozen=True)
+class RerunResult:
+    """
+    1 回の再実行の結果を表すデータクラス.
+
+    Attributes:
+        page (str): 再実行したページ ("realtime" または "history").
+        seconds (float): 再実行の時間 (秒).
+        succeeded (bool): 例外が発生せずに終了した場合は True.
+    """
+
+    page: str
+    seconds: float
+    succeeded: bool
+
+
+def _rerun_realtime() -> None:
+    """
+    リアルタイム分析の再実行を模擬する (初期表示の全銘柄のリアルタイム情報の取得とチャートの生成).
+    """
+    symbol_to_snapshot = fetch_realtime_snapshots(DEFAULT_TICKER_SYMBOLS)
+
+    for symbol, snapshot in symbol_to_snapshot.items():
+        if not snapshot.intraday_df.empty:
+            color = "green" if snapshot.change >= 0 else "red"
+            trading_hours = get_ticker_registry().get(symbol).trading_hours
+            create_realtime_chart_options(snapshot.intraday_df, trading_hours, snapshot.previous_price, color)
+
+
+def _rerun_history(rng: random.Random) -> None:
+    """
+    時系列分析の再実行を模擬する (価格データの取得, 指標の算出, チャートの生成).
+
+    Args:
+        rng (random.Random): 銘柄と期間を選ぶ乱数生成器.
+    """
+    symbol = rng.choice(get_ticker_registry().symbols)
+    today = datetime.date.today()
+    start_date = today - relativedelta(years=rng.choice(HISTORY_YEARS))
+    bars = fetch_history(symbol, start=start_date - HISTORY_LOOKBACK, end=today + datetime.timedelta(days=1))
+
+    daily_df, weekly_df = IncrementalMetrics(start_date).update(bars.to_frame(), MA_PERIOD)
+    options = create_history_chart_options(daily_df, weekly_df, 5.0, "下落", "red", max_points=2000)
+    create_history_chart_html(options)
+
+
+def _run_session(session_index: int, num_reruns: int, realtime_ratio: float, think_time: float) -> list[RerunResult]:
+    """
+    1 つのセッションの再実行を繰り返す.
+
+    Args:
+        session_index (int): セッションの番号 (乱数のシードに使う).
+        num_reruns (int): 再実行の回数.
+        realtime_ratio (float): リアルタイム分析を再実行する割合.
+        think_time (float): 再実行の間隔 (秒).
+
+    Returns:
+        list[RerunResult]: 再実行の結果のリスト.
+    """
+    rng = random.Random(session_index)
+    results = []
+
+    for _ in range(num_reruns):
+        page = "realtime" if rng.random() < realtime_ratio else "history"
+        started_at = time.perf_counter()
+
+        try:
+            _rerun_realtime() if page == "realtime" else _rerun_history(rng)
+            succeeded = True
+        except Exception:
+            succeeded = False
+
+        results.append(RerunResult(page, time.perf_counter() - started_at, succeeded))
+
+        if think_time > 0:
+            time.sleep(think_time)
+
+    return results
+
+
+def _print_report(results: list[RerunResult], wall_seconds: float, provider: ReplayProvider) -> None:
+    """
+    負荷試験の結果を表示する.
+
+    Args:
+        results (list[RerunResult]): 全セッションの再実行の結果.
+        wall_seconds (float): 負荷試験の経過時間 (秒).
+        provider (ReplayProvider): 使用したプロバイダ.
+    """
+    header = f"{'page':<10} {'reruns':>7} {'failed':>7} {'p50 ms':>10} {'p99 ms':>10} {'max ms':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for page in ("realtime", "history", "all"):
+        page_results = [result for result in results if page in ("all", result.page)]
+
+        if not page_results:
+            continue
+
+        milliseconds = np.array([result.seconds for result in page_results]) * 1000
+        p50, p99 = np.percentile(milliseconds, [50, 99])
+        num_failed = sum(not result.succeeded for result in page_results)
+        print(
+            f"{page:<10} {len(page_results):>7} {num_failed:>7} {p50:>10.1f} {p99:>10.1f} {milliseconds.max():>10.1f}"
+        )
+
+    cache_stats = market_data.history_cache.stats()
+    call_counts = provider.call_counts()
+
+    print()
+    print(f"throughput      {len(results) / wall_seconds:.1f} reruns/s ({len(results)} reruns in {wall_seconds:.2f} s)")
+    print(f"provider calls  {sum(call_counts.values())} {call_counts} (errors: {provider.num_errors})")
+    print(f"history cache   hit rate {cache_stats.hit_rate:.0%} ({cache_stats.entries} entries)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=8, help="並行するセッションの数")
+    parser.add_argument("--reruns", type=int, default=20, help="セッションごとの再実行の回数")
+    parser.add_argument("--realtime-ratio", type=float, default=0.5, help="リアルタイム分析を再実行する割合")
+    parser.add_argument("--think-time", type=float, default=0.0, help="再実行の間隔 (秒)")
+    parser.add_argument("--latency", type=float, default=0.05, help="プロバイダの呼び出しごとの遅延 (秒)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="遅延に加える一様乱数の上限 (秒)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="プロバイダがエラーを送出する割合")
+    parser.add_argument("--recordings", type=Path, help="記録した価格データのディレクトリ (HistoryStore と同じ形式)")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    parser.add_argument("--warmup", action="store_true", help="開始前にウォームアップを実行する")
+    args = parser.parse_args()
+
+    provider = ReplayProvider(
+        directory=args.recordings,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    # replay の価格データはプロセスごとの一時ディレクトリのストアに保存するため, 保存済みのデータを使わずに開始する
+    set_provider(provider)
+
+    if args.warmup:
+        report = run_warmup()
+        phases = ", ".join(f"{phase} {seconds:.2f} s" for phase, seconds in report.phase_to_seconds.items())
+        print(f"warmup          {sum(report.phase_to_seconds.values()):.2f} s ({phases})\n")
+
+    started_at = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=args.sessions) as executor:
+        futures = [
+            executor.submit(_run_session, index, args.reruns, args.realtime_ratio, args.think_time)
+            for index in range(args.sessions)
+        ]
+        results = [result for future in futures for result in future.result()]
+
+    _print_report(results, time.perf_counter() - started_at, provider)
+
+
+if __name__ == "__main__":
+    main()
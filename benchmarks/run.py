@@ -0,0 +1,335 @@
+"""
+分析・チャート生成・表のスタイル適用のベンチマーク.
+
+合成した OHLCV データ (ネットワークは使わない) で各関数の実行時間とピークメモリを計測する.
+
+    uv run python benchmarks/run.py
+    uv run python benchmarks/run.py --save baseline.json
+    uv run python benchmarks/run.py --compare baseline.json
+
+--compare を指定した場合は保存した結果との比を表示し, 閾値を超えて遅くなったケースがあれば終了コード 1 で終了する.
+"""
+
+import argparse
+import datetime
+import json
+import statistics
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.io.formats.style import Styler
+
+from investment_analytics.components.charts import create_drawdown_chart_options
+from investment_analytics.components.charts import create_history_chart_html
+from investment_analytics.components.charts import create_history_chart_options
+from investment_analytics.components.charts import create_realtime_chart_options
+from investment_analytics.components.styles import style_daily_dataframe
+from investment_analytics.components.styles import style_weekly_dataframe
+from investment_analytics.services.analysis import compute_daily_metrics
+from investment_analytics.services.analysis import compute_weekly_metrics
+from investment_analytics.services.providers import generate_ohlcv
+from investment_analytics.services.risk_analysis import compute_drawdown_summary
+from investment_analytics.services.risk_analysis import compute_drawdowns
+from investment_analytics.services.risk_analysis import compute_return_distribution
+
+DEFAULT_YEARS_LIST = [1, 10, 30, 100]
+
+DEFAULT_REPEAT = 5
+
+DEFAULT_THRESHOLD = 1.2
+
+MA_PERIOD = 100
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """
+    1 ケースの計測結果を表すデータクラス.
+
+    Attributes:
+        case (str): 計測した処理の名前.
+        fixture (str): 入力データの名前.
+        rows (int): 入力データの行数.
+        min_seconds (float): 実行時間の最小値 (秒).
+        median_seconds (float): 実行時間の中央値 (秒).
+        peak_bytes (int): 実行中のピークメモリ (バイト).
+    """
+
+    case: str
+    fixture: str
+    rows: int
+    min_seconds: float
+    median_seconds: float
+    peak_bytes: int
+
+    @property
+    def key(self) -> str:
+        """
+        保存・比較に使うキーを返す.
+
+        Returns:
+            str: 処理の名前と入力データの名前を結合したキー.
+        """
+        return f"{self.case}/{self.fixture}"
+
+
+def _create_ohlcv_df(index: pd.DatetimeIndex, volatility: float, seed: int) -> pd.DataFrame:
+    """
+    合成した OHLCV の価格データを生成する.
+
+    Args:
+        index (pd.DatetimeIndex): 時刻.
+        volatility (float): 1 足あたりの対数収益率の標準偏差.
+        seed (int): 乱数のシード.
+
+    Returns:
+        pd.DataFrame: OHLCV の価格データ.
+    """
+    return generate_ohlcv(index, volatility, np.random.default_rng(seed))
+
+
+def _create_daily_df(years: int) -> pd.DataFrame:
+    """
+    合成した日次の価格データを生成する.
+
+    Args:
+        years (int): 期間 (年).
+
+    Returns:
+        pd.DataFrame: 日次の価格データ.
+    """
+    index = pd.bdate_range(end="2025-01-01", periods=years * 252, tz="America/New_York")
+    return _create_ohlcv_df(index, 0.012, seed=years)
+
+
+def _create_intraday_df() -> pd.DataFrame:
+    """
+    合成した 1 日分 (24 時間) の 1 分足の価格データを生成する.
+
+    Returns:
+        pd.DataFrame: 日中の価格データ.
+    """
+    index = pd.date_range("2025-01-02", periods=24 * 60, freq="min", tz="UTC")
+    return _create_ohlcv_df(index, 0.0005, seed=0)
+
+
+def _compute_styles(style: Callable[[pd.DataFrame, str], Styler], df: pd.DataFrame) -> None:
+    """
+    Styler を生成し, スタイルの算出まで実行する (Styler は描画時に遅延して適用されるため).
+
+    Args:
+        style (Callable[[pd.DataFrame, str], Styler]): Styler を生成する関数.
+        df (pd.DataFrame): 価格データ.
+    """
+    style(df, "USD")._compute()
+
+
+def _create_cases(years_list: list[int]) -> list[tuple[str, str, int, Callable[[], object]]]:
+    """
+    計測するケースを生成する.
+
+    Args:
+        years_list (list[int]): 日次データの期間 (年) のリスト.
+
+    Returns:
+        list[tuple[str, str, int, Callable[[], object]]]: 処理の名前, 入力データの名前, 行数, 計測する関数の組のリスト.
+    """
+    cases: list[tuple[str, str, int, Callable[[], object]]] = []
+
+    for years in years_list:
+        fixture = f"{years}y-daily"
+        raw_df = _create_daily_df(years)
+        start_date = raw_df.index[0].date() + datetime.timedelta(days=7)
+        daily_df = compute_daily_metrics(raw_df, MA_PERIOD, start_date)
+        weekly_df = compute_weekly_metrics(daily_df, start_date)
+        options = create_history_chart_options(daily_df, weekly_df, 5.0, "下落", "red")
+        closes = daily_df["Close"].to_numpy(dtype=np.float64)
+        drawdowns = compute_drawdowns(closes)
+
+        cases += [
+            (
+                "compute_daily_metrics",
+                fixture,
+                len(raw_df),
+                partial(compute_daily_metrics, raw_df, MA_PERIOD, start_date),
+            ),
+            ("compute_weekly_metrics", fixture, len(daily_df), partial(compute_weekly_metrics, daily_df, start_date)),
+            (
+                "create_history_chart_options",
+                fixture,
+                len(daily_df),
+                partial(create_history_chart_options, daily_df, weekly_df, 5.0, "下落", "red"),
+            ),
+            (
+                "create_history_chart_options[2000]",
+                fixture,
+                len(daily_df),
+                partial(create_history_chart_options, daily_df, weekly_df, 5.0, "下落", "red", max_points=2000),
+            ),
+            ("create_history_chart_html", fixture, len(daily_df), partial(create_history_chart_html, options)),
+            ("compute_drawdown_summary", fixture, len(daily_df), partial(compute_drawdown_summary, daily_df)),
+            (
+                "compute_return_distribution[20d]",
+                fixture,
+                len(daily_df),
+                partial(compute_return_distribution, closes, 20),
+            ),
+            (
+                "create_drawdown_chart_options[2000]",
+                fixture,
+                len(daily_df),
+                partial(create_drawdown_chart_options, daily_df, drawdowns, max_points=2000),
+            ),
+            (
+                "style_daily_dataframe",
+                fixture,
+                len(daily_df),
+                partial(_compute_styles, style_daily_dataframe, daily_df),
+            ),
+            (
+                "style_weekly_dataframe",
+                fixture,
+                len(weekly_df),
+                partial(_compute_styles, style_weekly_dataframe, weekly_df),
+            ),
+        ]
+
+    intraday_df = _create_intraday_df()
+    previous_price = float(intraday_df["Open"].iloc[0])
+    cases.append(
+        (
+            "create_realtime_chart_options",
+            "1d-1m",
+            len(intraday_df),
+            partial(create_realtime_chart_options, intraday_df, 24, previous_price, "green"),
+        )
+    )
+
+    return cases
+
+
+def _measure(case: str, fixture: str, rows: int, run: Callable[[], object], repeat: int) -> BenchmarkResult:
+    """
+    1 ケースの実行時間とピークメモリを計測する.
+
+    - 実行時間は tracemalloc を無効にした状態で計測する.
+    - ピークメモリは別に 1 回実行して計測する.
+
+    Args:
+        case (str): 計測する処理の名前.
+        fixture (str): 入力データの名前.
+        rows (int): 入力データの行数.
+        run (Callable[[], object]): 計測する関数.
+        repeat (int): 計測の回数.
+
+    Returns:
+        BenchmarkResult: 計測結果.
+    """
+    # 初回のみの処理 (テンプレートの読み込みなど) を計測から除く
+    run()
+    seconds_list = timeit.repeat(run, number=1, repeat=repeat)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        case=case,
+        fixture=fixture,
+        rows=rows,
+        min_seconds=min(seconds_list),
+        median_seconds=statistics.median(seconds_list),
+        peak_bytes=peak_bytes,
+    )
+
+
+def _print_results(results: list[BenchmarkResult], baseline: dict[str, dict] | None, threshold: float) -> list[str]:
+    """
+    計測結果を表形式で表示する.
+
+    Args:
+        results (list[BenchmarkResult]): 計測結果.
+        baseline (dict[str, dict] | None): 比較する保存済みの計測結果.
+        threshold (float): 遅くなったと判定する実行時間の比.
+
+    Returns:
+        list[str]: 遅くなったと判定したケースのキー.
+    """
+    header = f"{'case':<36} {'fixture':<10} {'rows':>7} {'min ms':>10} {'median ms':>10} {'peak KiB':>10}"
+    if baseline is not None:
+        header += f" {'time x':>8} {'mem x':>8}"
+    print(header)
+    print("-" * len(header))
+
+    regressions = []
+
+    for result in results:
+        line = (
+            f"{result.case:<36} {result.fixture:<10} {result.rows:>7} {result.min_seconds * 1000:>10.2f}"
+            f" {result.median_seconds * 1000:>10.2f} {result.peak_bytes / 1024:>10.1f}"
+        )
+
+        if baseline is not None:
+            base = baseline.get(result.key)
+
+            if base is None:
+                line += f" {'-':>8} {'-':>8}"
+            else:
+                time_ratio = result.min_seconds / base["min_seconds"]
+                memory_ratio = result.peak_bytes / base["peak_bytes"] if base["peak_bytes"] else 1.0
+                is_regression = time_ratio > threshold
+                line += f" {time_ratio:>8.2f} {memory_ratio:>8.2f}" + (" !" if is_regression else "")
+
+                if is_regression:
+                    regressions.append(result.key)
+
+        print(line)
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, nargs="+", default=DEFAULT_YEARS_LIST, help="日次データの期間 (年)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="各ケースの計測の回数")
+    parser.add_argument("--filter", default="", help="処理の名前に含まれる文字列で絞り込む")
+    parser.add_argument("--save", type=Path, help="計測結果を保存する JSON ファイル")
+    parser.add_argument("--compare", type=Path, help="比較する計測結果の JSON ファイル")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="遅くなったと判定する実行時間の比 (Default: 1.2)",
+    )
+    args = parser.parse_args()
+
+    baseline = json.loads(args.compare.read_text()) if args.compare is not None else None
+
+    results = [
+        _measure(case, fixture, rows, run, args.repeat)
+        for case, fixture, rows, run in _create_cases(args.years)
+        if args.filter in case
+    ]
+    regressions = _print_results(results, baseline, args.threshold)
+
+    if args.save is not None:
+        args.save.write_text(json.dumps({result.key: asdict(result) for result in results}, indent=2))
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than {args.threshold:.2f}x the baseline: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
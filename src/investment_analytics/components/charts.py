@@ -1,9 +1,27 @@
+import base64
+import functools
 import json
+import os
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from investment_analytics.components.colors import to_rgb_format
+from investment_analytics.components.downsampling import downsample_min_max
+from investment_analytics.services.metrics import count
+from investment_analytics.services.metrics import is_recording
+from investment_analytics.services.risk_analysis import ReturnDistribution
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+ECHARTS_CDN_URL = "https://cdn.jsdelivr.net/npm/echarts@5/dist/echarts.min.js"
+
+# float32 で小数点以下 2 桁まで区別できる価格の上限 (仮数部 24 ビット). これ以上の価格は float64 で送る
+MAX_FLOAT32_PRICE = 2**24 / 100
 
 
 def _create_area_gradient(color: str) -> dict:
@@ -29,59 +47,161 @@ def _create_area_gradient(color: str) -> dict:
     }
 
 
-def create_history_chart_options(
+def _encode_array(values: np.ndarray, dtype: str) -> str:
+    """
+    配列をバイナリに変換し, Base64 でエンコードする.
+
+    Args:
+        values (np.ndarray): 配列.
+        dtype (str): 変換先のデータ型 (リトルエンディアンで指定する).
+
+    Returns:
+        str: Base64 でエンコードした文字列.
+    """
+    return base64.b64encode(np.ascontiguousarray(values, dtype=dtype).tobytes()).decode("ascii")
+
+
+def _to_epoch_milliseconds(index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    時刻を UNIX エポックからのミリ秒に変換する.
+
+    Args:
+        index (pd.DatetimeIndex): 時刻.
+
+    Returns:
+        np.ndarray: UNIX エポックからのミリ秒.
+    """
+    return index.as_unit("ms").asi8
+
+
+def _encode_dates(index: pd.DatetimeIndex) -> dict:
+    """
+    日付を開始日と日数の差分の列に圧縮する.
+
+    - 日付は現地時間の日付とし, 開始日は UNIX エポックからの日数で表す.
+    - 差分は符号なし 16 ビット整数の配列を Base64 でエンコードする.
+
+    Args:
+        index (pd.DatetimeIndex): 昇順に並んだ日付.
+
+    Returns:
+        dict: 開始日 ("start") と差分 ("deltas").
+    """
+    if index.tz is not None:
+        index = index.tz_localize(None)
+
+    days = _to_epoch_milliseconds(index.normalize()) // (24 * 60 * 60 * 1000)
+    return {"start": int(days[0]), "deltas": _encode_array(np.diff(days), "<u2")}
+
+
+def _find_highlight_ranges(daily_index: pd.DatetimeIndex, week_starts: pd.DatetimeIndex) -> np.ndarray:
+    """
+    ハイライトする週の範囲を日次データの位置として算出する.
+
+    - 週の開始位置は週の開始日より前の最終取引日とする.
+    - 週の終了位置は週の終了日以前の最終取引日とする.
+    - 隣接する週の範囲は 1 つに結合する.
+
+    Args:
+        daily_index (pd.DatetimeIndex): 昇順に並んだ日次データのインデックス.
+        week_starts (pd.DatetimeIndex): ハイライトする週の開始日.
+
+    Returns:
+        np.ndarray: 開始位置と終了位置の組の配列 (形状は (範囲の数, 2)).
+    """
+    if len(week_starts) == 0:
+        return np.empty((0, 2), dtype=np.intp)
+
+    start_positions = daily_index.searchsorted(week_starts, side="left") - 1
+    end_positions = daily_index.searchsorted(week_starts + pd.Timedelta(days=6), side="right") - 1
+    start_positions = np.clip(start_positions, 0, None)
+    end_positions = np.clip(end_positions, 0, None)
+
+    # 直前の範囲の終了位置より後から始まる範囲のみを新しい範囲とする
+    is_new_range = np.ones(len(start_positions), dtype=bool)
+    is_new_range[1:] = start_positions[1:] > end_positions[:-1]
+    is_last_of_range = np.append(is_new_range[1:], True)
+
+    return np.column_stack([start_positions[is_new_range], end_positions[is_last_of_range]])
+
+
+def find_highlight_ranges(
     daily_df: pd.DataFrame,
     weekly_df: pd.DataFrame,
     highlight_threshold: float,
     highlight_condition: str,
-    color: str,
-) -> dict:
+) -> np.ndarray:
     """
-    時系列チャートの ECharts オプションを生成する.
-
-    - 週次の騰落率が閾値を超えた期間をハイライトする.
-    - 現在値を基準線として表示する.
+    週次の騰落率が閾値を超えた期間を日次データの位置として算出する.
 
     Args:
-        daily_df (pd.DataFrame): 日次の価格データ.
+        daily_df (pd.DataFrame): 時刻の昇順に並んだ, 終値に欠損値を含まない日次の価格データ.
         weekly_df (pd.DataFrame): 週次の価格データ.
         highlight_threshold (float): ハイライトする騰落率の閾値 (%).
         highlight_condition (str): ハイライトの条件 ("上昇" または "下落").
-        color (str): チャートの色.
 
     Returns:
-        dict: ECharts オプション.
+        np.ndarray: 開始位置と終了位置の組の配列 (形状は (範囲の数, 2)).
     """
     assert highlight_condition in ("上昇", "下落")
 
-    daily_df = daily_df.copy()
-    daily_df = daily_df.dropna(subset=["Close"])
-    daily_df.index = pd.to_datetime(daily_df.index)
+    multiplier = 1 if highlight_condition == "上昇" else -1
+    filtered_weekly_df = weekly_df[weekly_df["Change"] * multiplier >= highlight_threshold]
+    return _find_highlight_ranges(pd.DatetimeIndex(daily_df.index), pd.DatetimeIndex(filtered_weekly_df.index))
 
-    current_price = daily_df["Close"].iloc[-1]
-    min_visible_price = daily_df["Close"].min()
-    max_visible_price = daily_df["Close"].max()
-    y_axis_padding = (max_visible_price - min_visible_price) * 0.05
 
-    highlight_area_list: list[list[dict]] = []
+def create_history_base_options(
+    daily_df: pd.DataFrame,
+    color: str,
+    max_points: int | None = None,
+    highlight_ranges: np.ndarray | None = None,
+    moving_averages: dict[str, np.ndarray] | None = None,
+) -> dict:
+    """
+    ハイライトを除いた時系列チャートの ECharts オプションを生成する.
 
-    multiplier = 1 if highlight_condition == "上昇" else -1
-    highlight_color = to_rgb_format("green", 0.2) if highlight_condition == "上昇" else to_rgb_format("red", 0.2)
-    filtered_weekly_df = weekly_df[weekly_df["Change"] * multiplier >= highlight_threshold]
+    - 現在値を基準線として表示する.
+    - max_points を指定した場合は, 極値とハイライトの境界を残して系列を間引く.
+    - 移動平均線は終値と同じ位置で間引いて重ねて表示する.
+    - 日付・終値・移動平均は "payload" に圧縮して格納し, チャートの HTML 側で展開する.
+    - 価格は通常 float32 で送り, float32 で精度が落ちる価格 (MAX_FLOAT32_PRICE 以上) を含む場合は float64 で送る.
 
-    for date in filtered_weekly_df.index:
-        week_start = pd.Timestamp(date)
-        week_end = pd.Timestamp(date) + pd.Timedelta(days=6)
+    Args:
+        daily_df (pd.DataFrame): 時刻の昇順に並んだ, 終値に欠損値を含まない日次の価格データ.
+        color (str): チャートの色.
+        max_points (int | None, optional): 系列の点の数の上限の目安. None の場合は間引かない. (Default: None)
+        highlight_ranges (np.ndarray | None, optional): 間引く場合に残すハイライトの範囲. (Default: None)
+        moving_averages (dict[str, np.ndarray] | None, optional):
+            移動平均線の名前をキーとする, 日次の価格データの各行に対応する移動平均の辞書. (Default: None)
 
-        start_date = max(date for date in daily_df.index if date < week_start)
-        end_date = max(date for date in daily_df.index if date <= week_end)
+    Returns:
+        dict: ECharts オプション.
+    """
+    name_to_values = moving_averages or {}
 
-        highlight_area_list.append(
-            [
-                {"xAxis": start_date.strftime("%Y-%m-%d"), "itemStyle": {"color": highlight_color}},
-                {"xAxis": end_date.strftime("%Y-%m-%d")},
-            ]
-        )
+    current_price = daily_df["Close"].iloc[-1]
+    visible_prices = np.concatenate([daily_df["Close"].to_numpy(), *name_to_values.values()])
+    min_visible_price = np.nanmin(visible_prices)
+    max_visible_price = np.nanmax(visible_prices)
+    y_axis_padding = (max_visible_price - min_visible_price) * 0.05
+    price_dtype = "<f4" if np.nanmax(np.abs(visible_prices)) < MAX_FLOAT32_PRICE else "<f8"
+
+    if max_points is not None:
+        positions = downsample_min_max(daily_df["Close"].to_numpy(), max_points, keep=highlight_ranges)
+        daily_df = daily_df.iloc[positions]
+        name_to_values = {name: values[positions] for name, values in name_to_values.items()}
+
+    moving_average_series = [
+        {
+            "name": name,
+            "type": "line",
+            "smooth": False,
+            "showSymbol": False,
+            "lineStyle": {"width": 1},
+            "data": [],
+        }
+        for name in name_to_values
+    ]
 
     return {
         "animation": False,
@@ -89,10 +209,11 @@ def create_history_chart_options(
             "trigger": "axis",
             "axisPointer": {"type": "cross"},
         },
-        "grid": {"top": 10},
+        "legend": {"show": bool(name_to_values), "data": list(name_to_values), "top": 0},
+        "grid": {"top": 30 if name_to_values else 10},
         "xAxis": {
             "type": "category",
-            "data": daily_df.index.strftime("%Y-%m-%d").tolist(),
+            "data": [],
             "boundaryGap": False,
         },
         "yAxis": {
@@ -108,10 +229,10 @@ def create_history_chart_options(
                 "showSymbol": False,
                 "lineStyle": {"width": 2, "color": to_rgb_format(color)},
                 "areaStyle": {"color": _create_area_gradient(color)},
-                "data": daily_df["Close"].round(2).tolist(),
+                "data": [],
                 "markArea": {
                     "silent": True,
-                    "data": highlight_area_list,
+                    "data": [],
                 },
                 "markLine": {
                     "silent": True,
@@ -120,10 +241,87 @@ def create_history_chart_options(
                     "data": [{"yAxis": current_price}],
                 },
             },
+            *moving_average_series,
         ],
+        "payload": {
+            "dates": _encode_dates(pd.DatetimeIndex(daily_df.index)),
+            "priceDtype": price_dtype,
+            "close": _encode_array(daily_df["Close"].to_numpy(), price_dtype),
+            "lines": [_encode_array(values, price_dtype) for values in name_to_values.values()],
+        },
     }
 
 
+def add_history_highlight_areas(
+    options: dict,
+    daily_df: pd.DataFrame,
+    highlight_ranges: np.ndarray,
+    highlight_condition: str,
+) -> dict:
+    """
+    時系列チャートの ECharts オプションにハイライトを追加する.
+
+    - 元のオプションは変更せず, ハイライトを追加した新しいオプションを返す.
+
+    Args:
+        options (dict): create_history_base_options で生成した ECharts オプション.
+        daily_df (pd.DataFrame): 時刻の昇順に並んだ, 終値に欠損値を含まない日次の価格データ.
+        highlight_ranges (np.ndarray): find_highlight_ranges で算出した範囲.
+        highlight_condition (str): ハイライトの条件 ("上昇" または "下落").
+
+    Returns:
+        dict: ECharts オプション.
+    """
+    dates = pd.DatetimeIndex(daily_df.index)[highlight_ranges.ravel()].strftime("%Y-%m-%d").to_numpy().reshape(-1, 2)
+    highlight_color = to_rgb_format("green", 0.2) if highlight_condition == "上昇" else to_rgb_format("red", 0.2)
+
+    highlight_area_list = [
+        [
+            {"xAxis": start_date, "itemStyle": {"color": highlight_color}},
+            {"xAxis": end_date},
+        ]
+        for start_date, end_date in dates.tolist()
+    ]
+
+    series = options["series"][0]
+    highlighted_series = {**series, "markArea": {**series["markArea"], "data": highlight_area_list}}
+    return {**options, "series": [highlighted_series, *options["series"][1:]]}
+
+
+def create_history_chart_options(
+    daily_df: pd.DataFrame,
+    weekly_df: pd.DataFrame,
+    highlight_threshold: float,
+    highlight_condition: str,
+    color: str,
+    max_points: int | None = None,
+    moving_averages: dict[str, np.ndarray] | None = None,
+) -> dict:
+    """
+    時系列チャートの ECharts オプションを生成する.
+
+    - 週次の騰落率が閾値を超えた期間をハイライトする (連続する週は 1 つのエリアにまとめる).
+    - 現在値を基準線として表示する.
+    - max_points を指定した場合は, 極値とハイライトの境界を残して系列を間引く.
+
+    Args:
+        daily_df (pd.DataFrame): 時刻の昇順に並んだ, 終値に欠損値を含まない日次の価格データ.
+        weekly_df (pd.DataFrame): 週次の価格データ.
+        highlight_threshold (float): ハイライトする騰落率の閾値 (%).
+        highlight_condition (str): ハイライトの条件 ("上昇" または "下落").
+        color (str): チャートの色.
+        max_points (int | None, optional): 系列の点の数の上限の目安. None の場合は間引かない. (Default: None)
+        moving_averages (dict[str, np.ndarray] | None, optional):
+            移動平均線の名前をキーとする, 日次の価格データの各行に対応する移動平均の辞書. (Default: None)
+
+    Returns:
+        dict: ECharts オプション.
+    """
+    highlight_ranges = find_highlight_ranges(daily_df, weekly_df, highlight_threshold, highlight_condition)
+    options = create_history_base_options(daily_df, color, max_points, highlight_ranges, moving_averages)
+    return add_history_highlight_areas(options, daily_df, highlight_ranges, highlight_condition)
+
+
 def create_history_chart_html(options: dict) -> str:
     """
     時系列チャートを表示するための HTML を生成する.
@@ -134,9 +332,63 @@ def create_history_chart_html(options: dict) -> str:
     Returns:
         str: HTML.
     """
+    prefix, suffix = _load_history_chart_template()
+    options_json = _dumps_options(options)
+    if is_recording():
+        count("chart.json_bytes", len(options_json.encode()))
+    return prefix + options_json + suffix
+
+
+def _create_echarts_script_tag() -> str:
+    """
+    ECharts を読み込む script タグを生成する.
+
+    - 環境変数 INVESTMENT_ANALYTICS_ECHARTS_JS にファイルのパスを指定した場合はインラインで埋め込む.
+    - URL を指定した場合はその URL から読み込む (例: Streamlit の静的ファイル配信のパス).
+    - 指定しない場合は CDN から読み込む.
+
+    Returns:
+        str: script タグ.
+    """
+    source = os.environ.get("INVESTMENT_ANALYTICS_ECHARTS_JS", ECHARTS_CDN_URL)
+    path = Path(source)
+
+    if path.is_file():
+        return f"<script>{path.read_text()}</script>"
+
+    return f'<script src="{source}"></script>'
+
+
+@functools.cache
+def _load_history_chart_template() -> tuple[str, str]:
+    """
+    時系列チャートの HTML テンプレートを読み込み, オプションの埋め込み位置で分割する.
+
+    - 初回の呼び出し時のみファイルを読み込む.
+
+    Returns:
+        tuple[str, str]: オプションより前の部分, オプションより後の部分.
+    """
     path = Path(__file__).parent / "history_chart.html"
-    html = path.read_text()
-    return html.replace("__ECHARTS_OPTIONS__", json.dumps(options, ensure_ascii=False))
+    html = path.read_text().replace("__ECHARTS_SCRIPT__", _create_echarts_script_tag())
+    prefix, suffix = html.split("__ECHARTS_OPTIONS__")
+    return prefix, suffix
+
+
+def _dumps_options(options: dict) -> str:
+    """
+    ECharts オプションを JSON に変換する. orjson がインストールされている場合は orjson を使う.
+
+    Args:
+        options (dict): ECharts オプション.
+
+    Returns:
+        str: JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(options, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    return json.dumps(options, ensure_ascii=False)
 
 
 def create_realtime_chart_options(
@@ -150,9 +402,10 @@ def create_realtime_chart_options(
 
     - 前日終値を基準線として表示する.
     - 取引時間の範囲で X 軸を設定する.
+    - 時刻 (UNIX エポックからのミリ秒) と価格を列ごとの dataset として渡す.
 
     Args:
-        df (pd.DataFrame): 日中の価格データ.
+        df (pd.DataFrame): 時刻の昇順に並んだ, 終値に欠損値を含まない日中の価格データ.
         trading_hours (float): 取引時間.
         previous_price (float): 前日終値.
         color (str): チャートの色.
@@ -160,19 +413,14 @@ def create_realtime_chart_options(
     Returns:
         dict: ECharts オプション.
     """
-    df = df.copy()
-    df = df.dropna(subset=["Close"])
-    df.index = pd.to_datetime(df.index).tz_convert("Asia/Tokyo")
-
-    start_time = df.index[0]
-    end_time = start_time + pd.Timedelta(hours=trading_hours)
+    times = _to_epoch_milliseconds(pd.DatetimeIndex(df.index))
+    start_time = int(times[0])
+    end_time = start_time + int(trading_hours * 60 * 60 * 1000)
 
     min_visible_price = min(df["Close"].min(), previous_price)
     max_visible_price = max(df["Close"].max(), previous_price)
     y_axis_padding = (max_visible_price - min_visible_price) * 0.05
 
-    chart_data = [[index.isoformat(), round(price, 2)] for index, price in df["Close"].items()]
-
     return {
         "animation": False,
         "tooltip": {
@@ -182,8 +430,8 @@ def create_realtime_chart_options(
         "grid": {"left": 0, "right": 0, "top": 0, "bottom": 0},
         "xAxis": {
             "type": "time",
-            "min": start_time.isoformat(),
-            "max": end_time.isoformat(),
+            "min": start_time,
+            "max": end_time,
             "boundaryGap": False,
             "axisLabel": {"formatter": "{HH}:{mm}"},
             "axisPointer": {"label": {"show": False}},
@@ -195,6 +443,9 @@ def create_realtime_chart_options(
             "axisLabel": {"showMinLabel": False, "showMaxLabel": False},
             "axisPointer": {"label": {"show": False}},
         },
+        "dataset": {
+            "source": {"time": times.tolist(), "price": df["Close"].to_numpy().round(2).tolist()},
+        },
         "series": [
             {
                 "type": "line",
@@ -202,7 +453,7 @@ def create_realtime_chart_options(
                 "showSymbol": False,
                 "lineStyle": {"width": 2, "color": to_rgb_format(color)},
                 "areaStyle": {"color": _create_area_gradient(color)},
-                "data": chart_data,
+                "encode": {"x": "time", "y": "price"},
                 "markLine": {
                     "silent": True,
                     "symbol": "none",
@@ -213,3 +464,122 @@ def create_realtime_chart_options(
             }
         ],
     }
+
+
+def create_drawdown_chart_options(
+    daily_df: pd.DataFrame,
+    drawdowns: np.ndarray,
+    color: str = "red",
+    max_points: int | None = None,
+) -> dict:
+    """
+    ドローダウンチャートの ECharts オプションを生成する.
+
+    - 時刻 (UNIX エポックからのミリ秒) とドローダウンを列ごとの dataset として渡す.
+    - ツールチップは既定の表示 (日付と系列名・値) とし, 単位は系列名に含める (関数の formatter を使わない).
+    - max_points を指定した場合は, 最大ドローダウンの底を含む極値を残して系列を間引く.
+
+    Args:
+        daily_df (pd.DataFrame): 時刻の昇順に並んだ, 終値に欠損値を含まない日次の価格データ.
+        drawdowns (np.ndarray): 日次の価格データの各行に対応するドローダウン (%).
+        color (str, optional): チャートの色. (Default: "red")
+        max_points (int | None, optional): 系列の点の数の上限の目安. None の場合は間引かない. (Default: None)
+
+    Returns:
+        dict: ECharts オプション.
+    """
+    times = _to_epoch_milliseconds(pd.DatetimeIndex(daily_df.index))
+
+    if max_points is not None:
+        positions = downsample_min_max(drawdowns, max_points)
+        times = times[positions]
+        drawdowns = drawdowns[positions]
+
+    return {
+        "animation": False,
+        "tooltip": {
+            "trigger": "axis",
+            "axisPointer": {"type": "cross"},
+        },
+        "grid": {"top": 10, "right": 10, "bottom": 30, "left": 50},
+        "xAxis": {
+            "type": "time",
+            "boundaryGap": False,
+        },
+        "yAxis": {
+            "type": "value",
+            "max": 0,
+            "axisLabel": {"formatter": "{value}%"},
+        },
+        "dataset": {
+            "source": {"time": times.tolist(), "drawdown": drawdowns.round(2).tolist()},
+        },
+        "series": [
+            {
+                "type": "line",
+                "smooth": False,
+                "showSymbol": False,
+                "lineStyle": {"width": 1, "color": to_rgb_format(color)},
+                "areaStyle": {"color": to_rgb_format(color, 0.3)},
+                "name": "ドローダウン (%)",
+                "encode": {"x": "time", "y": "drawdown", "tooltip": "drawdown"},
+            }
+        ],
+    }
+
+
+def create_return_histogram_options(distribution: ReturnDistribution) -> dict:
+    """
+    騰落率の分布のヒストグラムの ECharts オプションを生成する.
+
+    - 各階級の中央値 (%) を X 軸のラベルとし, 0% 以上の階級を緑, 0% 未満の階級を赤で表示する.
+    - パーセンタイルを含む階級に縦の基準線を表示する.
+
+    Args:
+        distribution (ReturnDistribution): compute_return_distribution で算出した分布.
+
+    Returns:
+        dict: ECharts オプション.
+    """
+    bin_edges = distribution.bin_edges
+    bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+    colors = np.where(bin_centers >= 0, to_rgb_format("green", 0.6), to_rgb_format("red", 0.6))
+
+    # パーセンタイルを含む階級の位置 (最大値は最後の階級に含める)
+    percentile_values = np.array(list(distribution.percentiles.values()))
+    percentile_positions = np.clip(
+        np.searchsorted(bin_edges, percentile_values, side="right") - 1, 0, len(bin_centers) - 1
+    )
+
+    return {
+        "animation": False,
+        "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
+        "grid": {"top": 30, "right": 20, "bottom": 30, "left": 50},
+        "xAxis": {
+            "type": "category",
+            "data": [f"{center:.1f}%" for center in bin_centers.tolist()],
+        },
+        "yAxis": {"type": "value"},
+        "series": [
+            {
+                "type": "bar",
+                "barCategoryGap": "10%",
+                "data": [
+                    {"value": frequency, "itemStyle": {"color": color}}
+                    for frequency, color in zip(distribution.counts.tolist(), colors.tolist(), strict=True)
+                ],
+                "markLine": {
+                    "silent": True,
+                    "symbol": "none",
+                    "lineStyle": {"type": "dashed", "color": "#9ca3af", "width": 1},
+                    "label": {"formatter": "{b}", "position": "end"},
+                    "data": [
+                        {"name": f"{percentile}%", "xAxis": int(position)}
+                        for percentile, position in zip(
+                            distribution.percentiles, percentile_positions.tolist(), strict=True
+                        )
+                    ],
+                },
+            }
+        ],
+    }
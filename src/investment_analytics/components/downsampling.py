@@ -0,0 +1,38 @@
+import numpy as np
+
+
+def downsample_min_max(values: np.ndarray, max_points: int, keep: np.ndarray | None = None) -> np.ndarray:
+    """
+    系列を区間ごとの最小値・最大値で間引き, 残す点の位置を返す.
+
+    - 系列を max_points / 2 個の区間に分割し, 各区間の最小値と最大値の点を残す.
+    - 全体の最小値・最大値と最初・最後の点は必ず残る.
+    - keep で指定した位置の点も残す (ハイライトの境界など).
+
+    Args:
+        values (np.ndarray): 欠損値を含まない系列.
+        max_points (int): 残す点の数の目安 (keep で指定した点は含まない).
+        keep (np.ndarray | None, optional): 必ず残す点の位置. (Default: None)
+
+    Returns:
+        np.ndarray: 残す点の位置 (昇順).
+    """
+    num_values = len(values)
+
+    if num_values <= max_points:
+        return np.arange(num_values)
+
+    num_buckets = max(max_points // 2, 1)
+    buckets = np.arange(num_values) * num_buckets // num_values
+
+    # 区間の昇順・値の昇順に並べ, 各区間の先頭を最小値, 末尾を最大値とする
+    order = np.lexsort((values, buckets))
+    bucket_starts = np.searchsorted(buckets[order], np.arange(num_buckets))
+    bucket_ends = np.append(bucket_starts[1:], num_values) - 1
+
+    indices = [order[bucket_starts], order[bucket_ends], np.array([0, num_values - 1])]
+
+    if keep is not None:
+        indices.append(np.asarray(keep).ravel())
+
+    return np.unique(np.concatenate(indices))
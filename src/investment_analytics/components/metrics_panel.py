@@ -0,0 +1,74 @@
+import json
+
+import pandas as pd
+import streamlit as st
+
+from investment_analytics.services.cache import CacheStats
+from investment_analytics.services.metrics import MetricsRecorder
+from investment_analytics.services.warmup import WarmupReport
+
+
+def render_metrics_panel(
+    recorder: MetricsRecorder,
+    cache_stats: CacheStats,
+    stage_report: dict[str, bool],
+    warmup_report: WarmupReport | None = None,
+) -> None:
+    """
+    直近の再実行の計測結果をサイドバーに表示する.
+
+    Args:
+        recorder (MetricsRecorder): 直近の再実行の記録.
+        cache_stats (CacheStats): 価格データのキャッシュの統計情報 (プロセス全体).
+        stage_report (dict[str, bool]): 直近の再実行における各ステージのヒット・ミス.
+        warmup_report (WarmupReport | None, optional): ウォームアップの実行結果. 開始していない場合は表示しない.
+            (Default: None)
+    """
+    counters = recorder.counters
+    num_requests = counters.get("history_cache.requests", 0)
+    num_misses = counters.get("history_cache.misses", 0)
+
+    with st.sidebar.expander("パフォーマンス", expanded=True):
+        col_seconds, col_hit_rate = st.columns(2)
+        col_seconds.metric("再実行の時間", f"{(recorder.seconds or 0) * 1000:,.0f} ms")
+        col_hit_rate.metric(
+            "キャッシュのヒット率",
+            f"{(num_requests - num_misses) / num_requests:.0%}" if num_requests else "-",
+            help=f"プロセス全体: {cache_stats.hit_rate:.0%} ({cache_stats.entries} 件, {cache_stats.size_bytes:,} B)",
+        )
+
+        st.caption("区間")
+        span_df = pd.DataFrame(recorder.summarize_spans(), columns=["name", "count", "total_seconds", "max_seconds"])
+        span_df[["total_seconds", "max_seconds"]] *= 1000
+        st.dataframe(
+            span_df.rename(columns={"total_seconds": "total_ms", "max_seconds": "max_ms"}),
+            hide_index=True,
+            column_config={
+                "total_ms": st.column_config.NumberColumn(format="%.1f"),
+                "max_ms": st.column_config.NumberColumn(format="%.1f"),
+            },
+        )
+
+        st.caption("カウンタ")
+        st.dataframe(pd.Series(counters, name="value", dtype="float64").rename_axis("name"))
+
+        st.caption("ステージ")
+        st.dataframe(
+            pd.Series(stage_report, name="hit", dtype="bool").rename_axis("stage"),
+        )
+
+        if warmup_report is not None and warmup_report.started_at is not None:
+            st.caption("ウォームアップ" + ("" if warmup_report.finished else " (実行中)"))
+            st.dataframe(
+                (pd.Series(warmup_report.phase_to_seconds, name="ms", dtype="float64") * 1000).rename_axis("phase"),
+                column_config={"ms": st.column_config.NumberColumn(format="%.1f")},
+            )
+            for error in warmup_report.errors:
+                st.caption(f":red[{error}]")
+
+        st.download_button(
+            "JSON をダウンロード",
+            json.dumps(recorder.to_dict(), ensure_ascii=False, indent=2),
+            file_name="metrics.json",
+            mime="application/json",
+        )
@@ -1,45 +1,119 @@
+import numpy as np
 import pandas as pd
+import streamlit as st
 from pandas.io.formats.style import Styler
 
+from investment_analytics.services.metrics import count
 
-def style_daily_dataframe(df: pd.DataFrame, unit: str) -> Styler:
+DATE_COLUMN = "日付"
+
+CHANGE_COLUMN = "騰落率 (%)"
+
+MAD_COLUMN = "移動平均乖離率 (%)"
+
+
+def _close_column(unit: str) -> str:
     """
-    日次データの DataFrame をスタイル付きで整形する.
+    終値の列名を返す.
+
+    Args:
+        unit (str): 価格の通貨単位.
+
+    Returns:
+        str: 終値の列名.
+    """
+    return f"終値 ({unit})"
+
+
+def _color_by_sign(values: pd.Series) -> np.ndarray:
+    """
+    値の正負に応じた色の CSS を配列で返す.
+
+    Args:
+        values (pd.Series): 値.
+
+    Returns:
+        np.ndarray: 0 以上の場合は緑, それ以外 (欠損値を含む) は赤の CSS の配列.
+    """
+    return np.where(values.to_numpy() >= 0, "color: green", "color: red")
+
+
+def format_daily_dataframe(df: pd.DataFrame, unit: str) -> pd.DataFrame:
+    """
+    日次データの DataFrame を表示用に整形する.
 
     - 列を日本語名に変換する.
-    - 値の正負に応じて色分けする.
+    - 日付の降順に並べ替える.
 
     Args:
         df (pd.DataFrame): 日次の価格データ.
         unit (str): 価格の通貨単位.
 
     Returns:
-        Styler: スタイル・フォーマットが適用された Styler オブジェクト.
+        pd.DataFrame: 整形後の DataFrame.
     """
     formatted_df = df[["Close", "Change", "MAD"]]
     formatted_df = formatted_df.sort_index(ascending=False)
 
-    close_column = f"終値 ({unit})"
-    change_column = "騰落率 (%)"
-    mad_column = "移動平均乖離率 (%)"
+    renamer = {"Close": _close_column(unit), "Change": CHANGE_COLUMN, "MAD": MAD_COLUMN}
+    formatted_df = formatted_df.rename(columns=renamer).round(2)
+
+    formatted_df.index = formatted_df.index.date
+    formatted_df.index.name = DATE_COLUMN
+    return formatted_df
+
+
+def format_weekly_dataframe(df: pd.DataFrame, unit: str) -> pd.DataFrame:
+    """
+    週次データの DataFrame を表示用に整形する.
+
+    - 列を日本語名に変換する.
+    - 日付の降順に並べ替える.
 
-    renamer = {"Close": close_column, "Change": change_column, "MAD": mad_column}
+    Args:
+        df (pd.DataFrame): 週次の価格データ.
+        unit (str): 価格の通貨単位.
+
+    Returns:
+        pd.DataFrame: 整形後の DataFrame.
+    """
+    formatted_df = df.sort_index(ascending=False)
+
+    renamer = {"Close": _close_column(unit), "Change": CHANGE_COLUMN}
     formatted_df = formatted_df.rename(columns=renamer).round(2)
 
     formatted_df.index = formatted_df.index.date
-    formatted_df.index.name = "日付"
+    formatted_df.index.name = DATE_COLUMN
+    return formatted_df
+
+
+def style_daily_dataframe(df: pd.DataFrame, unit: str) -> Styler:
+    """
+    日次データの DataFrame をスタイル付きで整形する.
+
+    - 列を日本語名に変換する.
+    - 値の正負に応じて色分けする (列ごとにまとめて算出する).
+
+    Args:
+        df (pd.DataFrame): 日次の価格データ.
+        unit (str): 価格の通貨単位.
+
+    Returns:
+        Styler: スタイル・フォーマットが適用された Styler オブジェクト.
+    """
+    formatted_df = format_daily_dataframe(df, unit)
+    count("table.rows_styled", len(formatted_df))
+    close_column = _close_column(unit)
 
-    def apply_color(row: pd.Series) -> pd.Series:
-        color_return = "color: green" if row[change_column] >= 0 else "color: red"
-        color_deviation = "color: green" if row[mad_column] >= 0 else "color: red"
-        styles = pd.Series("", index=row.index)
-        styles[close_column] = color_return
-        styles[change_column] = color_return
-        styles[mad_column] = color_deviation
-        return styles
+    color_return = _color_by_sign(formatted_df[CHANGE_COLUMN])
+    color_deviation = _color_by_sign(formatted_df[MAD_COLUMN])
+    styles = pd.DataFrame(
+        {close_column: color_return, CHANGE_COLUMN: color_return, MAD_COLUMN: color_deviation},
+        index=formatted_df.index,
+    )
 
-    formatter = {close_column: "{:,.2f}", change_column: "{:+.2f}%", mad_column: "{:+.2f}%"}
-    return formatted_df.style.apply(apply_color, axis=1).format(formatter)
+    formatter = {close_column: "{:,.2f}", CHANGE_COLUMN: "{:+.2f}%", MAD_COLUMN: "{:+.2f}%"}
+    return formatted_df.style.apply(lambda _: styles, axis=None).format(formatter)
 
 
 def style_weekly_dataframe(df: pd.DataFrame, unit: str) -> Styler:
@@ -47,7 +121,7 @@ def style_weekly_dataframe(df: pd.DataFrame, unit: str) -> Styler:
     週次データの DataFrame をスタイル付きで整形する.
 
     - 列を日本語名に変換する.
-    - 値の正負に応じて色分けする.
+    - 値の正負に応じて色分けする (列ごとにまとめて算出する).
 
     Args:
         df (pd.DataFrame): 週次の価格データ.
@@ -56,23 +130,34 @@ def style_weekly_dataframe(df: pd.DataFrame, unit: str) -> Styler:
     Returns:
         Styler: スタイル・フォーマットが適用された Styler オブジェクト.
     """
-    formatted_df = df.sort_index(ascending=False)
+    formatted_df = format_weekly_dataframe(df, unit)
+    count("table.rows_styled", len(formatted_df))
+    close_column = _close_column(unit)
 
-    close_column = f"終値 ({unit})"
-    change_column = "騰落率 (%)"
+    color_return = _color_by_sign(formatted_df[CHANGE_COLUMN])
+    styles = pd.DataFrame(
+        {close_column: color_return, CHANGE_COLUMN: color_return},
+        index=formatted_df.index,
+    )
 
-    renamer = {"Close": close_column, "Change": change_column}
-    formatted_df = formatted_df.rename(columns=renamer).round(2)
+    formatter = {close_column: "{:,.2f}", CHANGE_COLUMN: "{:+.2f}%"}
+    return formatted_df.style.apply(lambda _: styles, axis=None).format(formatter)
 
-    formatted_df.index = formatted_df.index.date
-    formatted_df.index.name = "日付"
 
-    def apply_color(row: pd.Series) -> pd.Series:
-        color_return = "color: green" if row[change_column] >= 0 else "color: red"
-        styles = pd.Series("", index=row.index)
-        styles[close_column] = color_return
-        styles[change_column] = color_return
-        return styles
+def create_column_config(unit: str) -> dict:
+    """
+    Styler を使わずに表示する場合の列の設定を生成する.
+
+    - 色分けは行わず, 数値のフォーマットのみを設定する.
+
+    Args:
+        unit (str): 価格の通貨単位.
 
-    formatter = {close_column: "{:,.2f}", change_column: "{:+.2f}%"}
-    return formatted_df.style.apply(apply_color, axis=1).format(formatter)
+    Returns:
+        dict: st.dataframe の column_config.
+    """
+    return {
+        _close_column(unit): st.column_config.NumberColumn(format="localized"),
+        CHANGE_COLUMN: st.column_config.NumberColumn(format="%+.2f%%"),
+        MAD_COLUMN: st.column_config.NumberColumn(format="%+.2f%%"),
+    }
@@ -0,0 +1,57 @@
+import datetime
+import math
+
+import pandas as pd
+
+PAGE_SIZES = (50, 100, 250, 500)
+
+
+def count_pages(num_rows: int, page_size: int) -> int:
+    """
+    ページ数を算出する.
+
+    Args:
+        num_rows (int): 行数.
+        page_size (int): 1 ページあたりの行数.
+
+    Returns:
+        int: ページ数 (行がない場合も 1 とする).
+    """
+    return max(math.ceil(num_rows / page_size), 1)
+
+
+def slice_page(df: pd.DataFrame, page: int, page_size: int) -> pd.DataFrame:
+    """
+    日付の昇順に並んだ DataFrame から, 新しい順に数えたページの行を切り出す.
+
+    Args:
+        df (pd.DataFrame): 日付の昇順に並んだ DataFrame.
+        page (int): ページ番号 (1 始まり, 1 ページ目が最新).
+        page_size (int): 1 ページあたりの行数.
+
+    Returns:
+        pd.DataFrame: 切り出した DataFrame (日付の昇順).
+    """
+    end_position = len(df) - (page - 1) * page_size
+    start_position = max(end_position - page_size, 0)
+    return df.iloc[start_position : max(end_position, 0)]
+
+
+def find_page(df: pd.DataFrame, date: datetime.date, page_size: int) -> int:
+    """
+    指定された日付の行を含むページ番号を算出する.
+
+    - 指定された日付の行がない場合は, その日付以前の直近の行を含むページとする.
+
+    Args:
+        df (pd.DataFrame): 日付の昇順に並んだ DataFrame.
+        date (datetime.date): 日付.
+        page_size (int): 1 ページあたりの行数.
+
+    Returns:
+        int: ページ番号 (1 始まり).
+    """
+    index = pd.DatetimeIndex(df.index)
+    timestamp = pd.Timestamp(date).tz_localize(index.tz)
+    position = max(int(index.searchsorted(timestamp, side="right")) - 1, 0)
+    return (len(df) - 1 - position) // page_size + 1
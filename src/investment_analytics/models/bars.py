@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from typing import Self
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Bars:
+    """
+    正規化した価格データを表すデータクラス.
+
+    - 時刻は昇順で重複がなく, タイムゾーン付き (タイムゾーンがない場合は UTC とみなす) とする.
+    - 終値は欠損値を含まない float64 の読み取り専用の配列とする.
+    - 変更できないため, キャッシュしたデータをコピーせずに複数のセッションで共有できる.
+
+    Attributes:
+        index (pd.DatetimeIndex): 時刻.
+        close (np.ndarray): 終値.
+    """
+
+    index: pd.DatetimeIndex
+    close: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> Self:
+        """
+        価格データの DataFrame を正規化して作成する.
+
+        - 時刻の昇順に並べ替え, 同じ時刻の足は最後の足を残す.
+        - 終値が欠損値の足を取り除く.
+
+        Args:
+            df (pd.DataFrame): 価格データ.
+
+        Returns:
+            Bars: 正規化した価格データ.
+        """
+        index = pd.DatetimeIndex(df.index)
+        close = df["Close"].to_numpy(dtype=np.float64)
+
+        if index.tz is None:
+            index = index.tz_localize("UTC")
+
+        if not index.is_monotonic_increasing:
+            order = np.argsort(index.asi8, kind="stable")
+            index = index[order]
+            close = close[order]
+
+        is_valid = ~np.isnan(close) & ~index.duplicated(keep="last")
+
+        if not is_valid.all():
+            index = index[is_valid]
+            close = close[is_valid]
+
+        close = np.array(close, dtype=np.float64)
+        close.setflags(write=False)
+        return cls(index=index, close=close)
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        保持しているデータのサイズを返す.
+
+        Returns:
+            int: サイズ (バイト).
+        """
+        return self.index.nbytes + self.close.nbytes
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        終値の DataFrame として返す.
+
+        - データはコピーせずに参照する.
+        - 呼び出しごとに新しい DataFrame を返すため, 列を追加しても共有したデータは変わらない.
+
+        Returns:
+            pd.DataFrame: 時刻をインデックスとする終値の DataFrame.
+        """
+        return pd.DataFrame({"Close": self.close}, index=self.index, copy=False)
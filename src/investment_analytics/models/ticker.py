@@ -1,9 +1,46 @@
+import bisect
+import csv
+import difflib
+import functools
 import json
+import os
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Self
 
+TICKERS_ENV = "INVESTMENT_ANALYTICS_TICKERS"
 
-@dataclass(frozen=True)
+DEFAULT_TICKERS_PATH = Path(__file__).parent / "tickers.json"
+
+# セレクトボックスに表示する選択肢の上限 (超える銘柄は入力して検索する)
+MAX_SELECT_OPTIONS = 1000
+
+# 先頭の選択肢に含まれない銘柄を選択した場合の選択肢を保持する数
+MAX_CACHED_SELECT_OPTIONS = 256
+
+# 曖昧検索で類似度を算出するキーの上限 (共通する 3 文字組の多い順に絞り込む)
+MAX_FUZZY_CANDIDATES = 200
+
+
+def _to_trigrams(key: str) -> set[str]:
+    """
+    前後に空白を加えた文字列の 3 文字組を返す (2 文字以下の文字列も 3 文字組を持つ).
+
+    Args:
+        key (str): 文字列.
+
+    Returns:
+        set[str]: 3 文字組.
+    """
+    padded = f" {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True, slots=True)
 class Ticker:
     """
     銘柄を表すデータクラス.
@@ -23,19 +60,307 @@ class Ticker:
     trading_hours: float
 
 
-def _load_tickers() -> dict[str, Ticker]:
+class TickerRegistry:
     """
-    銘柄情報を読み込む.
+    銘柄の一覧を索引付きで保持するクラス.
 
-    Returns:
-        dict[str, Ticker]: 銘柄のシンボルをキーとする Ticker の辞書.
+    - 表示順の銘柄名・シンボルのタプルと, シンボル・銘柄名から位置への索引を作成時に 1 回だけ作成する.
+    - 銘柄名が重複する場合は表示名にシンボルを付けて区別する (例: "Alphabet (GOOG)").
+    - 前方一致検索は小文字にしたシンボル・銘柄名のソート済みの配列を二分探索する.
+    - 曖昧検索は 3 文字組の転置索引で候補を絞り込んでから類似度を算出する (索引は初回の曖昧検索時に作成する).
+
+    Attributes:
+        tickers (tuple[Ticker, ...]): 表示順の銘柄.
+        names (tuple[str, ...]): 表示順の銘柄の表示名.
+        symbols (tuple[str, ...]): 表示順の銘柄のシンボル.
+        head_names (tuple[str, ...]): 選択肢に表示する先頭の銘柄の表示名 (上限までの数).
     """
-    path = Path(__file__).parent / "tickers.json"
-    with path.open() as f:
-        symbol_to_ticker = json.load(f)
-    return {symbol: Ticker(symbol=symbol, **ticker) for symbol, ticker in symbol_to_ticker.items()}
 
+    def __init__(self, tickers: Iterable[Ticker]) -> None:
+        self.tickers = tuple(tickers)
+        self.symbols = tuple(ticker.symbol for ticker in self.tickers)
+
+        name_counts = Counter(ticker.name for ticker in self.tickers)
+        self.names = tuple(
+            ticker.name if name_counts[ticker.name] == 1 else f"{ticker.name} ({ticker.symbol})"
+            for ticker in self.tickers
+        )
+
+        self._symbol_to_position = {symbol: position for position, symbol in enumerate(self.symbols)}
+        self._name_to_position = {name: position for position, name in enumerate(self.names)}
+
+        if len(self._symbol_to_position) != len(self.tickers):
+            raise ValueError("Ticker symbols must be unique.")
+
+        # 小文字のシンボル・銘柄名と位置をキーの昇順に並べる (前方一致検索と曖昧検索に使う)
+        keys = sorted(
+            {
+                (key.lower(), position)
+                for position, ticker in enumerate(self.tickers)
+                for key in (ticker.symbol, ticker.name)
+            }
+        )
+        self._search_keys = [key for key, _ in keys]
+        self._search_positions = array("i", (position for _, position in keys))
+
+        self.head_names = self.names[:MAX_SELECT_OPTIONS]
+
+        # 先頭の選択肢に含まれない銘柄の選択肢は銘柄ごとに保持し, 再実行ごとに作成し直さない
+        self._prepend_to_head_names = functools.lru_cache(maxsize=MAX_CACHED_SELECT_OPTIONS)(
+            self._create_prepended_names
+        )
+
+    @classmethod
+    def from_file(cls, path: Path) -> Self:
+        """
+        銘柄の一覧をファイルから読み込む.
+
+        - JSON の場合はシンボルをキーとし, 銘柄名 ("name"), 通貨単位 ("unit"), 開始年 ("start_year"),
+          取引時間 ("trading_hours") を値とするオブジェクトとする.
+        - CSV の場合は "symbol", "name", "unit", "start_year", "trading_hours" の列を持つヘッダ付きの表とする.
+
+        Args:
+            path (Path): ファイルのパス (拡張子は ".json" または ".csv").
+
+        Returns:
+            TickerRegistry: 読み込んだ銘柄の一覧.
+        """
+        with path.open(newline="") as f:
+            if path.suffix == ".csv":
+                return cls(
+                    Ticker(
+                        symbol=row["symbol"],
+                        name=row["name"],
+                        unit=row["unit"],
+                        start_year=int(row["start_year"]),
+                        trading_hours=float(row["trading_hours"]),
+                    )
+                    for row in csv.DictReader(f)
+                )
+
+            symbol_to_ticker = json.load(f)
+            return cls(Ticker(symbol=symbol, **ticker) for symbol, ticker in symbol_to_ticker.items())
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def __iter__(self) -> Iterator[Ticker]:
+        return iter(self.tickers)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._symbol_to_position
+
+    def get(self, symbol: str) -> Ticker:
+        """
+        シンボルで銘柄を返す.
+
+        Args:
+            symbol (str): 銘柄のシンボル.
+
+        Returns:
+            Ticker: 銘柄.
+        """
+        return self.tickers[self._symbol_to_position[symbol]]
+
+    def get_by_name(self, name: str) -> Ticker:
+        """
+        表示名で銘柄を返す.
+
+        Args:
+            name (str): 銘柄の表示名.
+
+        Returns:
+            Ticker: 銘柄.
+        """
+        return self.tickers[self._name_to_position[name]]
+
+    def position(self, symbol: str) -> int:
+        """
+        銘柄の表示順の位置を返す.
+
+        Args:
+            symbol (str): 銘柄のシンボル.
+
+        Returns:
+            int: 表示順の位置.
+        """
+        return self._symbol_to_position[symbol]
+
+    def name(self, symbol: str) -> str:
+        """
+        銘柄の表示名を返す.
+
+        Args:
+            symbol (str): 銘柄のシンボル.
+
+        Returns:
+            str: 銘柄の表示名.
+        """
+        return self.names[self._symbol_to_position[symbol]]
+
+    def select_options(self, symbol: str) -> tuple[tuple[str, ...], int]:
+        """
+        セレクトボックスの選択肢と選択中の銘柄の位置を返す.
+
+        - 銘柄数が上限以下の場合は全ての表示名を返す (作成済みのタプルをそのまま返す).
+        - 上限を超える場合は先頭から上限までの表示名を返し, 含まれない銘柄は先頭に加える
+          (銘柄ごとに作成済みのタプルを返す).
 
-SYMBOL_TO_TICKER: dict[str, Ticker] = _load_tickers()
+        Args:
+            symbol (str): 選択中の銘柄のシンボル.
 
-NAME_TO_TICKER: dict[str, Ticker] = {ticker.name: ticker for ticker in SYMBOL_TO_TICKER.values()}
+        Returns:
+            tuple[tuple[str, ...], int]: 選択肢の表示名, 選択中の銘柄の位置.
+        """
+        position = self._symbol_to_position[symbol]
+
+        if position < len(self.head_names):
+            return self.head_names, position
+
+        return self._prepend_to_head_names(position), 0
+
+    def _create_prepended_names(self, position: int) -> tuple[str, ...]:
+        """
+        先頭の選択肢の前に指定した位置の銘柄を加えた表示名を作成する.
+
+        Args:
+            position (int): 銘柄の表示順の位置.
+
+        Returns:
+            tuple[str, ...]: 表示名 (上限の数に収まるように末尾の 1 件を除く).
+        """
+        return (self.names[position], *self.head_names[:-1])
+
+    def search_prefix(self, query: str, limit: int = 10) -> list[Ticker]:
+        """
+        シンボルまたは銘柄名が前方一致する銘柄を返す (大文字と小文字は区別しない).
+
+        Args:
+            query (str): 検索する文字列.
+            limit (int, optional): 返す銘柄の上限. (Default: 10)
+
+        Returns:
+            list[Ticker]: 一致した銘柄 (一致したキーの昇順).
+        """
+        query = query.strip().lower()
+        positions: dict[int, None] = {}
+
+        if not query:
+            return []
+
+        index = bisect.bisect_left(self._search_keys, query)
+
+        while index < len(self._search_keys) and len(positions) < limit:
+            if not self._search_keys[index].startswith(query):
+                break
+            positions[self._search_positions[index]] = None
+            index += 1
+
+        return [self.tickers[position] for position in positions]
+
+    @functools.cached_property
+    def _fuzzy_index(self) -> tuple[list[str], dict[str, list[int]], dict[str, array[int]]]:
+        """
+        曖昧検索の索引を作成する.
+
+        Returns:
+            tuple[list[str], dict[str, list[int]], dict[str, array[int]]]:
+                小文字のキーのリスト, キーごとの全ての位置, 3 文字組からキーの番号への転置索引.
+        """
+        key_to_positions: dict[str, list[int]] = {}
+        for key, position in zip(self._search_keys, self._search_positions, strict=True):
+            key_to_positions.setdefault(key, []).append(position)
+
+        keys = list(key_to_positions)
+        trigram_to_key_indices: dict[str, array[int]] = {}
+        for key_index, key in enumerate(keys):
+            for trigram in _to_trigrams(key):
+                trigram_to_key_indices.setdefault(trigram, array("i")).append(key_index)
+
+        return keys, key_to_positions, trigram_to_key_indices
+
+    def search_fuzzy(self, query: str, limit: int = 10, cutoff: float = 0.6) -> list[Ticker]:
+        """
+        シンボルまたは銘柄名が類似する銘柄を返す (大文字と小文字は区別しない).
+
+        - 共通する 3 文字組の多いキーを上限まで候補とし, 候補のみで difflib の類似度を算出する.
+        - 同じキーを持つ銘柄 (同名の銘柄など) は全て返す.
+
+        Args:
+            query (str): 検索する文字列.
+            limit (int, optional): 返す銘柄の上限. (Default: 10)
+            cutoff (float, optional): 類似度の下限 (0.0 - 1.0). (Default: 0.6)
+
+        Returns:
+            list[Ticker]: 類似した銘柄 (類似度の降順).
+        """
+        query = query.strip().lower()
+
+        if not query:
+            return []
+
+        keys, key_to_positions, trigram_to_key_indices = self._fuzzy_index
+        shared_counts: Counter[int] = Counter()
+        for trigram in _to_trigrams(query):
+            shared_counts.update(trigram_to_key_indices.get(trigram, ()))
+
+        candidates = [keys[key_index] for key_index, _ in shared_counts.most_common(MAX_FUZZY_CANDIDATES)]
+        matches = difflib.get_close_matches(query, candidates, n=limit * 2, cutoff=cutoff)
+        positions: dict[int, None] = {}
+
+        for match in matches:
+            positions.update(dict.fromkeys(key_to_positions[match]))
+
+        return [self.tickers[position] for position in list(positions)[:limit]]
+
+    def search(self, query: str, limit: int = 10) -> list[Ticker]:
+        """
+        前方一致する銘柄を優先し, 上限に満たない場合は類似する銘柄を加えて返す.
+
+        Args:
+            query (str): 検索する文字列.
+            limit (int, optional): 返す銘柄の上限. (Default: 10)
+
+        Returns:
+            list[Ticker]: 検索結果の銘柄.
+        """
+        tickers = self.search_prefix(query, limit)
+
+        if len(tickers) < limit:
+            tickers += [ticker for ticker in self.search_fuzzy(query, limit) if ticker not in tickers]
+
+        return tickers[:limit]
+
+    def resolve(self, query: str) -> Ticker | None:
+        """
+        入力された文字列に最も合う銘柄を返す.
+
+        - 表示名またはシンボルが一致する銘柄, 検索結果の先頭の銘柄の順に探す.
+
+        Args:
+            query (str): 入力された文字列 (表示名, シンボル, またはその一部).
+
+        Returns:
+            Ticker | None: 銘柄. 見つからない場合は None.
+        """
+        if query in self._name_to_position:
+            return self.get_by_name(query)
+
+        if query in self._symbol_to_position:
+            return self.get(query)
+
+        tickers = self.search(query, limit=1)
+        return tickers[0] if tickers else None
+
+
+@functools.cache
+def get_ticker_registry() -> TickerRegistry:
+    """
+    銘柄の一覧を返す. 初回の呼び出し時に読み込み, プロセス全体で共有する.
+
+    - 環境変数 INVESTMENT_ANALYTICS_TICKERS にファイルのパスを指定した場合はその一覧を読み込む.
+
+    Returns:
+        TickerRegistry: 銘柄の一覧.
+    """
+    return TickerRegistry.from_file(Path(os.environ.get(TICKERS_ENV, DEFAULT_TICKERS_PATH)))
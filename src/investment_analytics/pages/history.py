@@ -1,30 +1,114 @@
 import datetime
+from functools import partial
 
+import numpy as np
+import pandas as pd
 import streamlit as st
 from dateutil.relativedelta import relativedelta
+from streamlit_echarts import st_echarts
 
+from investment_analytics.components.charts import add_history_highlight_areas
+from investment_analytics.components.charts import create_drawdown_chart_options
+from investment_analytics.components.charts import create_history_base_options
 from investment_analytics.components.charts import create_history_chart_html
-from investment_analytics.components.charts import create_history_chart_options
+from investment_analytics.components.charts import create_return_histogram_options
+from investment_analytics.components.charts import find_highlight_ranges
+from investment_analytics.components.styles import create_column_config
+from investment_analytics.components.styles import format_daily_dataframe
+from investment_analytics.components.styles import format_weekly_dataframe
 from investment_analytics.components.styles import style_daily_dataframe
 from investment_analytics.components.styles import style_weekly_dataframe
-from investment_analytics.models.ticker import NAME_TO_TICKER
-from investment_analytics.models.ticker import SYMBOL_TO_TICKER
-from investment_analytics.services.analysis import compute_daily_metrics
+from investment_analytics.components.tables import PAGE_SIZES
+from investment_analytics.components.tables import count_pages
+from investment_analytics.components.tables import find_page
+from investment_analytics.components.tables import slice_page
+from investment_analytics.models.ticker import get_ticker_registry
 from investment_analytics.services.analysis import compute_period_change
-from investment_analytics.services.analysis import compute_weekly_metrics
+from investment_analytics.services.incremental_metrics import IncrementalMetrics
+from investment_analytics.services.market_data import HISTORY_LOOKBACK
+from investment_analytics.services.market_data import INTERVAL_TO_TTL
 from investment_analytics.services.market_data import fetch_history
+from investment_analytics.services.risk_analysis import compute_drawdown_summary
+from investment_analytics.services.risk_analysis import compute_drawdowns
+from investment_analytics.services.risk_analysis import compute_return_distribution
+from investment_analytics.services.rolling import MOVING_AVERAGE_KINDS
+from investment_analytics.services.rolling import RollingWindows
+from investment_analytics.services.stage_cache import reset_stage_report
+from investment_analytics.services.stage_cache import run_stage
+
+
+def jump_to_date(name: str, df: pd.DataFrame, page_size: int) -> None:
+    """
+    選択した日付を含むページに切り替える.
+
+    Args:
+        name (str): 表の名前.
+        df (pd.DataFrame): 表示するデータ.
+        page_size (int): 1 ページあたりの行数.
+    """
+    date = st.session_state[f"history_{name}_jump"]
+    if date is not None:
+        st.session_state[f"history_{name}_page"] = find_page(df, date, page_size)
+
+
+def select_ticker() -> None:
+    """
+    選択・入力した銘柄をクエリパラメータに反映する. 入力した文字列に合う銘柄がない場合は元の銘柄に戻す.
+    """
+    registry = get_ticker_registry()
+    ticker_name = st.session_state["history_ticker"]
+    ticker = registry.resolve(ticker_name)
+
+    if ticker is not None:
+        st.query_params["ticker"] = ticker.symbol
+
+    # 入力した文字列は破棄し, 次の再実行でクエリパラメータの銘柄を選択した状態で表示する
+    if ticker is None or registry.name(ticker.symbol) != ticker_name:
+        del st.session_state["history_ticker"]
+
+
+def compute_moving_averages(rolling: RollingWindows, names: list[str], num_rows: int) -> dict[str, np.ndarray]:
+    """
+    選択した移動平均線を末尾の行数分だけ算出する.
+
+    Args:
+        rolling (RollingWindows): 終値から作成した RollingWindows.
+        names (list[str]): 移動平均線の名前 (例: "SMA 25").
+        num_rows (int): 表示する末尾の行数.
+
+    Returns:
+        dict[str, np.ndarray]: 移動平均線の名前をキーとする移動平均の辞書.
+    """
+    name_to_values = {}
+
+    for name in names:
+        kind, window = name.split()
+        name_to_values[name] = rolling.moving_average(kind, int(window))[len(rolling) - num_rows :]
+
+    return name_to_values
+
 
 st.title("時系列分析")
 
-# 入力: 銘柄
+reset_stage_report()
+
+registry = get_ticker_registry()
+
+# 入力: 銘柄 (選択肢にない銘柄は入力して検索できる)
+options, option_index = registry.select_options(st.query_params.get("ticker", "^GSPC"))
 ticker_name = st.selectbox(
     "銘柄",
-    list(NAME_TO_TICKER),
-    index=list(SYMBOL_TO_TICKER).index(st.query_params.get("ticker", "^GSPC")),
+    options,
+    index=option_index,
     key="history_ticker",
-    on_change=lambda: st.query_params.update({"ticker": NAME_TO_TICKER[st.session_state["history_ticker"]].symbol}),
+    on_change=select_ticker,
+    accept_new_options=len(options) < len(registry),
 )
-ticker = NAME_TO_TICKER[ticker_name]
+
+if ticker_name is None:
+    raise ValueError("A ticker must be selected.")
+
+ticker = registry.get_by_name(ticker_name)
 
 # 入力: 期間の指定方法
 period_mode = st.radio("期間の指定方法", ("期間", "開始年・終了年"), horizontal=True)
@@ -65,10 +149,29 @@ settings_expander = st.expander("設定")
 # 入力: 移動平均の期間
 ma_period = settings_expander.number_input("移動平均の期間 (日)", min_value=1, max_value=200, value=100, step=1)
 
-# データの取得と加工
-raw_df = fetch_history(ticker.symbol, start=(start_date - datetime.timedelta(days=200)), end=end_date)
-daily_df = compute_daily_metrics(raw_df, ma_period, start_date)
-weekly_df = compute_weekly_metrics(daily_df, start_date)
+# 入力: 表の色分け (無効にすると Styler を使わずに表示する)
+colorize_tables = settings_expander.toggle("表の値を正負で色分けする", value=True)
+
+# データの取得と加工 (各ステージは入力が変わった場合のみ再計算する)
+raw_bars = run_stage(
+    "raw",
+    (ticker.symbol, start_date, end_date),
+    partial(fetch_history, ticker.symbol, start=(start_date - HISTORY_LOOKBACK), end=end_date),
+    ttl=INTERVAL_TO_TTL["1d"],
+)
+
+# 価格データの末尾が更新された場合に後続のステージを再計算するためのキー
+data_key = (ticker.symbol, start_date, end_date, len(raw_bars), raw_bars.index[-1], raw_bars.close[-1])
+
+# 指標の状態はセッション中に保持し, 価格データが更新された場合は変更された足の分だけ算出し直す
+# (移動平均の期間を変更した場合は保持している終値の累積和から算出する)
+metrics = run_stage("metrics_state", (ticker.symbol, start_date, end_date), partial(IncrementalMetrics, start_date))
+daily_df, weekly_df = run_stage(
+    "metrics", (*data_key, ma_period), partial(metrics.update, raw_bars.to_frame(), ma_period)
+)
+
+# 移動平均線は指標と同じ終値の累積和を共有する
+rolling = metrics.rolling
 
 st.subheader("チャート")
 
@@ -80,6 +183,23 @@ col_threshold, col_condition = chart_settings_expander.columns(2)
 highlight_threshold = col_threshold.number_input("ハイライトの閾値 (%)", min_value=0.0, value=5.0, step=0.1)
 highlight_condition = col_condition.selectbox("ハイライトの条件", ("上昇", "下落"), index=1)
 
+# 入力: チャートの表示点数の上限 (超える場合は極値とハイライトの境界を残して間引く)
+max_points_name_to_max_points = {"2,000 点": 2000, "5,000 点": 5000, "間引かない": None}
+max_points_name = chart_settings_expander.selectbox(
+    "チャートの表示点数の上限",
+    list(max_points_name_to_max_points),
+    index=0,
+    help="期間を短くすると間引かれずに全ての点が表示されます。",
+)
+max_points = max_points_name_to_max_points[max_points_name]
+
+# 入力: 重ねて表示する移動平均線
+moving_average_names = chart_settings_expander.multiselect(
+    "移動平均線",
+    [f"{kind} {window}" for kind in MOVING_AVERAGE_KINDS for window in (25, 75, 200)],
+    default=[],
+)
+
 # 現在値と騰落率の表示
 current_price, change = compute_period_change(daily_df)
 color = "green" if change >= 0 else "red"
@@ -88,15 +208,176 @@ st.markdown(f"#### {current_price:,.2f} :{color}[({change:+.2f}%)]")
 st.caption(f"赤色のエリアは 1 週間で {highlight_threshold:.2f}% 以上の{highlight_condition}があった週を示します。")
 
 # チャートの表示
-options = create_history_chart_options(daily_df, weekly_df, highlight_threshold, highlight_condition, color)
-st.iframe(create_history_chart_html(options), height=400)
+highlight_key = (*data_key, highlight_threshold, highlight_condition)
+highlight_ranges = run_stage(
+    "chart_highlight",
+    highlight_key,
+    partial(find_highlight_ranges, daily_df, weekly_df, highlight_threshold, highlight_condition),
+)
+
+moving_average_key = tuple(moving_average_names)
+moving_averages = run_stage(
+    "chart_moving_averages",
+    (*data_key, moving_average_key),
+    partial(compute_moving_averages, rolling, moving_average_names, len(daily_df)),
+)
+
+# 間引く場合はハイライトの境界を残すため, ハイライトの条件にも依存する
+base_options = run_stage(
+    "chart_base",
+    (*data_key, color, max_points, highlight_key if max_points is not None else None, moving_average_key),
+    partial(create_history_base_options, daily_df, color, max_points, highlight_ranges, moving_averages),
+)
+chart_html = run_stage(
+    "chart_html",
+    (*highlight_key, color, max_points, moving_average_key),
+    lambda: create_history_chart_html(
+        add_history_highlight_areas(base_options, daily_df, highlight_ranges, highlight_condition)
+    ),
+)
+st.iframe(chart_html, height=400)
+
+st.subheader("ドローダウン")
+
+# ドローダウンは表示期間の開始以降の最高値を基準とする
+drawdowns = run_stage("drawdowns", data_key, partial(compute_drawdowns, daily_df["Close"].to_numpy(dtype=np.float64)))
+drawdown_summary = run_stage("drawdown_summary", data_key, partial(compute_drawdown_summary, daily_df, drawdowns))
+
+# 期間中に最高値を下回っていない場合は日付と期間を表示しない
+has_drawdown = drawdown_summary.max_drawdown < 0
+is_underwater = drawdown_summary.current_drawdown < 0
+
+if not has_drawdown:
+    st.caption("期間中に最高値を下回ったことはありません。")
+
+recovery_text = (
+    f"{drawdown_summary.recovery_date:%Y-%m-%d} に回復" if drawdown_summary.recovery_date is not None else "未回復"
+)
+col_max_drawdown, col_current_drawdown, col_underwater, col_longest_underwater = st.columns(4)
+col_max_drawdown.metric(
+    "最大ドローダウン",
+    f"{drawdown_summary.max_drawdown:.2f}%" if has_drawdown else "—",
+    help=(
+        f"{drawdown_summary.peak_date:%Y-%m-%d} の最高値から {drawdown_summary.trough_date:%Y-%m-%d} の底まで"
+        f" ({recovery_text})"
+        if has_drawdown
+        else None
+    ),
+)
+col_current_drawdown.metric(
+    "現在のドローダウン",
+    f"{drawdown_summary.current_drawdown:.2f}%",
+    help=f"{drawdown_summary.current_peak_date:%Y-%m-%d} の最高値からの下落率",
+)
+col_underwater.metric(
+    "水面下の期間",
+    f"{drawdown_summary.current_underwater_days:,} 日" if is_underwater else "—",
+    help=None if is_underwater else "現在は最高値を更新しています。",
+)
+col_longest_underwater.metric(
+    "最長の水面下の期間",
+    f"{drawdown_summary.longest_underwater_days:,} 日" if has_drawdown else "—",
+    help=(
+        f"{drawdown_summary.longest_underwater_start:%Y-%m-%d} から"
+        f" {drawdown_summary.longest_underwater_end:%Y-%m-%d} まで"
+        if has_drawdown
+        else None
+    ),
+)
+
+drawdown_options = run_stage(
+    "drawdown_chart",
+    (*data_key, max_points),
+    partial(create_drawdown_chart_options, daily_df, drawdowns, "red", max_points),
+)
+st_echarts(drawdown_options, key="history_drawdown_chart", height="250px")
+
+st.subheader("騰落率の分布")
+
+col_frequency, col_window = st.columns(2)
+
+# 入力: 騰落率を算出する足と期間 (期間をずらしながら重複して算出する)
+frequency = col_frequency.radio("足", ("日次", "週次"), horizontal=True, key="history_return_frequency")
+window_unit = "日" if frequency == "日次" else "週"
+window = col_window.number_input(
+    f"期間 ({window_unit})",
+    min_value=1,
+    max_value=2520 if frequency == "日次" else 520,
+    value=20 if frequency == "日次" else 4,
+    step=1,
+    key=f"history_return_window_{frequency}",
+)
+
+frequency_df = daily_df if frequency == "日次" else weekly_df
+distribution = run_stage(
+    "return_distribution",
+    (*data_key, ma_period, frequency, window),
+    partial(compute_return_distribution, frequency_df["Close"].to_numpy(dtype=np.float64), window),
+)
+
+if distribution is None:
+    st.info(f"表示期間が {window} {window_unit}より短いため、騰落率の分布を算出できません。")
+else:
+    col_mean, col_positive_ratio, col_count = st.columns(3)
+    col_mean.metric("平均", f"{distribution.mean:+.2f}%")
+    col_positive_ratio.metric("上昇した割合", f"{distribution.positive_ratio:.1%}")
+    col_count.metric("標本数", f"{distribution.count:,}")
+
+    st_echarts(
+        create_return_histogram_options(distribution),
+        key=f"history_return_histogram_{frequency}_{window}",
+        height="300px",
+    )
+
+    st.dataframe(
+        pd.DataFrame(
+            {f"{percentile}%": [f"{value:+.2f}%"] for percentile, value in distribution.percentiles.items()},
+            index=["パーセンタイル"],
+        )
+    )
 
 col_daily, col_weekly = st.columns(2)
 
-with col_daily:
-    st.subheader("日次データ")
-    st.dataframe(style_daily_dataframe(daily_df, ticker.unit))
 
-with col_weekly:
-    st.subheader("週次データ")
-    st.dataframe(style_weekly_dataframe(weekly_df, ticker.unit))
+column_config = None if colorize_tables else create_column_config(ticker.unit)
+
+table_specs = [
+    ("daily", col_daily, "日次データ", daily_df, style_daily_dataframe, format_daily_dataframe, ma_period),
+    ("weekly", col_weekly, "週次データ", weekly_df, style_weekly_dataframe, format_weekly_dataframe, None),
+]
+
+# 表示中のページのみを切り出して整形する
+for name, column, title, df, styler, formatter, extra_key in table_specs:
+    with column:
+        st.subheader(title)
+
+        col_page_size, col_page, col_jump = st.columns(3)
+
+        # 入力: 1 ページあたりの表示件数
+        page_size = col_page_size.selectbox("表示件数", PAGE_SIZES, index=1, key=f"history_{name}_page_size")
+        num_pages = count_pages(len(df), page_size)
+
+        # 入力: 日付へ移動
+        col_jump.date_input(
+            "日付へ移動",
+            value=None,
+            min_value=df.index[0].date(),
+            max_value=df.index[-1].date(),
+            key=f"history_{name}_jump",
+            on_change=jump_to_date,
+            args=(name, df, page_size),
+        )
+
+        # 入力: ページ番号 (1 ページ目が最新)
+        page_key = f"history_{name}_page"
+        st.session_state[page_key] = min(st.session_state.get(page_key, 1), num_pages)
+        page = col_page.number_input(f"ページ (全 {num_pages})", min_value=1, max_value=num_pages, key=page_key)
+
+        st.dataframe(
+            run_stage(
+                f"{name}_table",
+                (*data_key, extra_key, colorize_tables, page, page_size),
+                partial(styler if colorize_tables else formatter, slice_page(df, page, page_size), ticker.unit),
+            ),
+            column_config=column_config,
+        )
@@ -5,11 +5,11 @@ from streamlit.delta_generator import DeltaGenerator
 from streamlit_echarts import st_echarts
 
 from investment_analytics.components.charts import create_realtime_chart_options
-from investment_analytics.models.ticker import NAME_TO_TICKER
-from investment_analytics.models.ticker import SYMBOL_TO_TICKER
-from investment_analytics.services.analysis import compute_realtime_change
-from investment_analytics.services.market_data import fetch_history
+from investment_analytics.models.ticker import get_ticker_registry
+from investment_analytics.services.poller import get_poller
+from investment_analytics.services.realtime_snapshot import fetch_realtime_snapshots
 from investment_analytics.services.realtime_state import append_ticker_data
+from investment_analytics.services.realtime_state import get_session_id
 from investment_analytics.services.realtime_state import init_ticker_data
 from investment_analytics.services.realtime_state import move_ticker_data
 from investment_analytics.services.realtime_state import remove_ticker_data
@@ -17,10 +17,67 @@ from investment_analytics.services.realtime_state import update_ticker_data
 
 NUM_COLUMNS = 4
 
+
+def render_realtime_card(id: str) -> None:
+    """
+    カードの現在値と前日比, チャートを表示する.
+
+    - 自動更新が有効な場合はフラグメントとして一定間隔で再実行される.
+    - 価格データはポーラーが取得した最新のリアルタイム情報を使う.
+    - ポーラーが未取得で, 直接の取得にも失敗した場合はエラーを表示する.
+
+    Args:
+        id (str): カード ID.
+    """
+    ticker_symbol = st.session_state["realtime_ticker_data"].get(id)
+
+    if ticker_symbol is None:
+        return
+
+    ticker = get_ticker_registry().get(ticker_symbol)
+    poller = get_poller()
+
+    # 再実行のたびに購読を更新し, 表示中の銘柄の購読が期限切れにならないようにする
+    poller.subscribe(get_session_id(), st.session_state["realtime_ticker_data"].values())
+    snapshot = poller.get_snapshot(ticker_symbol) or fetch_realtime_snapshots([ticker_symbol]).get(ticker_symbol)
+
+    if snapshot is None:
+        st.error("リアルタイム情報を取得できませんでした。")
+        return
+
+    # 現在値と前日比の表示
+    color = "green" if snapshot.change >= 0 else "red"
+    st.markdown(f"#### {snapshot.current_price:,.2f} :{color}[({snapshot.change:+.2f}%)]")
+
+    # チャートの表示
+    if snapshot.intraday_df.empty:
+        return
+
+    options = create_realtime_chart_options(snapshot.intraday_df, ticker.trading_hours, snapshot.previous_price, color)
+    st_echarts(options, key=f"realtime_chart_{id}", height="200px")
+
+
 st.title("リアルタイム分析")
 
 init_ticker_data()
 
+settings_expander = st.expander("設定")
+col_auto_refresh, col_refresh_interval = settings_expander.columns(2)
+
+# 入力: 自動更新 (有効な場合は各カードの現在値とチャートのみを一定間隔で更新する)
+auto_refresh = col_auto_refresh.toggle("自動更新", value=False, key="realtime_auto_refresh")
+refresh_interval = col_refresh_interval.number_input(
+    "更新間隔 (秒)",
+    min_value=5,
+    max_value=600,
+    value=30,
+    step=5,
+    key="realtime_refresh_interval",
+    disabled=not auto_refresh,
+)
+
+registry = get_ticker_registry()
+
 id_to_container: dict[str, DeltaGenerator] = {}
 id_to_ticker_symbol: dict[str, str] = st.session_state["realtime_ticker_data"]
 
@@ -32,15 +89,17 @@ for index, (id, ticker_symbol) in enumerate(id_to_ticker_symbol.items()):
     global_column = global_columns[index % NUM_COLUMNS]
     container = global_column.container(border=True)
 
-    # 銘柄のセレクトボックス
+    # 銘柄のセレクトボックス (選択肢にない銘柄は入力して検索できる)
+    options, option_index = registry.select_options(ticker_symbol)
     container.selectbox(
         "銘柄",
-        list(NAME_TO_TICKER),
-        index=list(SYMBOL_TO_TICKER).index(ticker_symbol),
+        options,
+        index=option_index,
         key=f"realtime_ticker_{id}",
         on_change=update_ticker_data,
         args=(id, f"realtime_ticker_{id}"),
         label_visibility="collapsed",
+        accept_new_options=len(options) < len(registry),
     )
 
     # リアルタイム情報を表示するコンテナ
@@ -86,25 +145,20 @@ for index, (id, ticker_symbol) in enumerate(id_to_ticker_symbol.items()):
 
 st.button(":material/add_2:", on_click=append_ticker_data)
 
-# 各カードにリアルタイム情報を表示
-
-for id, container in id_to_container.items():
-    ticker_symbol = st.session_state["realtime_ticker_data"][id]
-    ticker = SYMBOL_TO_TICKER[ticker_symbol]
+# ポーラーが未取得の銘柄をまとめて取得する (初回表示時や銘柄の追加時)
 
-    # 現在値と前日比の表示
-    recent_df = fetch_history(ticker.symbol, period="3d")
-    current_price, previous_price, change = compute_realtime_change(recent_df)
-    color = "green" if change >= 0 else "red"
-    container.markdown(f"#### {current_price:,.2f} :{color}[({change:+.2f}%)]")
+poller = get_poller()
+ticker_symbols = [st.session_state["realtime_ticker_data"][id] for id in id_to_container]
+poller.subscribe(get_session_id(), ticker_symbols)
+missing_symbols = [symbol for symbol in ticker_symbols if poller.get_snapshot(symbol) is None]
 
-    # チャートの表示
-    df = fetch_history(ticker.symbol, period="1d", interval="1m")
+for symbol, snapshot in fetch_realtime_snapshots(missing_symbols).items():
+    poller.put_snapshot(symbol, snapshot)
 
-    if df.empty:
-        continue
+# 各カードにリアルタイム情報を表示
 
-    options = create_realtime_chart_options(df, ticker.trading_hours, previous_price, color)
+render_card = st.fragment(render_realtime_card, run_every=refresh_interval if auto_refresh else None)
 
+for id, container in id_to_container.items():
     with container:
-        st_echarts(options, key=f"realtime_chart_{id}", height="200px")
+        render_card(id)
@@ -0,0 +1,195 @@
+import datetime
+from functools import partial
+
+import pandas as pd
+import streamlit as st
+from dateutil.relativedelta import relativedelta
+
+from investment_analytics.models.ticker import get_ticker_registry
+from investment_analytics.services.market_data import HISTORY_LOOKBACK
+from investment_analytics.services.market_data import INTERVAL_TO_TTL
+from investment_analytics.services.market_data import HistoryRequest
+from investment_analytics.services.market_data import fetch_history_batch
+from investment_analytics.services.panel_analysis import build_close_matrix
+from investment_analytics.services.panel_analysis import compute_panel_daily_metrics
+from investment_analytics.services.panel_analysis import compute_panel_summary
+from investment_analytics.services.panel_analysis import compute_panel_weekly_metrics
+from investment_analytics.services.stage_cache import reset_stage_report
+from investment_analytics.services.stage_cache import run_stage
+
+# スクリーニングする銘柄数の上限 (選択した銘柄のみを取得する)
+MAX_SCREENER_SYMBOLS = 100
+
+SUMMARY_COLUMN_TO_NAME = {
+    "Change": "期間の騰落率 (%)",
+    "MAD": "移動平均乖離率 (%)",
+    "DownStreak": "連続下落 (週)",
+    "MaxDownStreak": "最大連続下落 (週)",
+    "ThresholdWeeks": "閾値を超えた週 (回)",
+}
+
+
+def fetch_close_matrix(symbols: tuple[str, ...], start_date: datetime.date, end_date: datetime.date) -> pd.DataFrame:
+    """
+    銘柄の価格データを並列に取得して終値の行列を作成する.
+
+    Args:
+        symbols (tuple[str, ...]): 銘柄のシンボル.
+        start_date (datetime.date): 取得する開始日.
+        end_date (datetime.date): 取得する終了日.
+
+    Returns:
+        pd.DataFrame: 日付をインデックス, 銘柄のシンボルを列とする終値の DataFrame.
+    """
+    requests = [HistoryRequest(symbol, start=start_date, end=end_date) for symbol in symbols]
+    request_to_bars = fetch_history_batch(requests)
+    return build_close_matrix({request.ticker_symbol: bars for request, bars in request_to_bars.items()})
+
+
+def resolve_symbols(ticker_names: list[str]) -> tuple[tuple[str, ...], list[str]]:
+    """
+    選択・入力した銘柄の表示名をシンボルに変換する.
+
+    Args:
+        ticker_names (list[str]): 銘柄の表示名 (入力した場合はシンボル, またはその一部).
+
+    Returns:
+        tuple[tuple[str, ...], list[str]]: 銘柄のシンボル (重複を除く), 合う銘柄がなかった文字列.
+    """
+    registry = get_ticker_registry()
+    symbols: dict[str, None] = {}
+    unmatched = []
+
+    for ticker_name in ticker_names:
+        ticker = registry.resolve(ticker_name)
+        if ticker is None:
+            unmatched.append(ticker_name)
+        else:
+            symbols[ticker.symbol] = None
+
+    return tuple(symbols), unmatched
+
+
+def format_summary_dataframe(summary_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    銘柄ごとの集計結果を表示用に整形する.
+
+    Args:
+        summary_df (pd.DataFrame): compute_panel_summary で集計した DataFrame.
+
+    Returns:
+        pd.DataFrame: 整形後の DataFrame.
+    """
+    tickers = [get_ticker_registry().get(symbol) for symbol in summary_df.index]
+    formatted_df = pd.DataFrame(
+        {
+            "銘柄": [ticker.name for ticker in tickers],
+            "現在値": summary_df["Close"],
+            "通貨": [ticker.unit for ticker in tickers],
+        },
+        index=summary_df.index,
+    )
+
+    for column, name in SUMMARY_COLUMN_TO_NAME.items():
+        formatted_df[name] = summary_df[column]
+
+    return formatted_df.set_index("銘柄")
+
+
+st.title("スクリーニング")
+
+st.markdown("選択した銘柄の騰落率・移動平均乖離率・週次の下落の連続などを一覧で比較できます。")
+
+reset_stage_report()
+
+registry = get_ticker_registry()
+
+# 入力: 対象の銘柄 (選択肢にない銘柄は入力して検索できる)
+ticker_names = st.multiselect(
+    "対象の銘柄",
+    registry.head_names,
+    default=registry.head_names[:MAX_SCREENER_SYMBOLS],
+    max_selections=MAX_SCREENER_SYMBOLS,
+    accept_new_options=len(registry.head_names) < len(registry),
+    key="screener_tickers",
+    help=f"一度に比較できるのは {MAX_SCREENER_SYMBOLS} 銘柄までです。",
+)
+symbols, unmatched_names = resolve_symbols(ticker_names)
+
+if unmatched_names:
+    st.warning(f"該当する銘柄が見つかりませんでした: {', '.join(unmatched_names)}")
+
+if not symbols:
+    st.info("比較する銘柄を選択してください。")
+    st.stop()
+
+# 入力: 期間
+period_name_to_period = {f"{i + 1} 年": i + 1 for i in range(30)}
+period_name = st.selectbox("期間", list(period_name_to_period), index=0, key="screener_period")
+period = period_name_to_period[period_name]
+end_date = datetime.date.today() + datetime.timedelta(days=1)
+start_date = datetime.date.today() - relativedelta(years=period)
+
+settings_expander = st.expander("設定")
+
+# 入力: 移動平均の期間
+ma_period = settings_expander.number_input("移動平均の期間 (日)", min_value=1, max_value=200, value=100, step=1)
+
+col_threshold, col_condition = settings_expander.columns(2)
+
+# 入力: 週次の騰落率の閾値と条件
+threshold = col_threshold.number_input("週次の騰落率の閾値 (%)", min_value=0.0, value=5.0, step=0.1)
+condition = col_condition.selectbox("閾値の条件", ("上昇", "下落"), index=1)
+
+# データの取得と加工 (選択した銘柄をまとめて取得し, 行列のまま計算する)
+close_df = run_stage(
+    "screener_raw",
+    (symbols, start_date, end_date),
+    partial(fetch_close_matrix, symbols, start_date - HISTORY_LOOKBACK, end_date),
+    ttl=INTERVAL_TO_TTL["1d"],
+)
+
+if close_df.empty:
+    st.error("価格データを取得できませんでした。時間をおいて再度お試しください。")
+    st.stop()
+
+# 取得に失敗した銘柄は除いて表示する
+missing_symbols = [symbol for symbol in symbols if symbol not in close_df.columns]
+if missing_symbols:
+    st.warning(
+        f"{len(missing_symbols)} 銘柄の価格データを取得できなかったため除いています: {', '.join(missing_symbols[:10])}"
+    )
+
+# 価格データの末尾が更新された場合に後続のステージを再計算するためのキー
+data_key = (symbols, start_date, end_date, close_df.shape, close_df.index[-1], tuple(close_df.iloc[-1].fillna(0)))
+
+panel_daily_df = run_stage(
+    "screener_daily",
+    (*data_key, ma_period),
+    partial(compute_panel_daily_metrics, close_df, ma_period, start_date),
+)
+panel_weekly_df = run_stage(
+    "screener_weekly", data_key, partial(compute_panel_weekly_metrics, panel_daily_df, start_date)
+)
+summary_df = run_stage(
+    "screener_summary",
+    (*data_key, ma_period, threshold, condition),
+    partial(compute_panel_summary, panel_daily_df, panel_weekly_df, threshold, condition),
+)
+
+# 入力: 並び替え
+sort_name = st.selectbox("並び替え", list(SUMMARY_COLUMN_TO_NAME.values()), index=0, key="screener_sort")
+ascending = st.toggle("昇順", value=False, key="screener_ascending")
+
+st.caption(f"閾値を超えた週は 1 週間で {threshold:.2f}% 以上の{condition}があった週の数を示します。")
+
+st.dataframe(
+    format_summary_dataframe(summary_df).sort_values(sort_name, ascending=ascending),
+    column_config={
+        "現在値": st.column_config.NumberColumn(format="localized"),
+        SUMMARY_COLUMN_TO_NAME["Change"]: st.column_config.NumberColumn(format="%+.2f%%"),
+        SUMMARY_COLUMN_TO_NAME["MAD"]: st.column_config.NumberColumn(format="%+.2f%%"),
+        SUMMARY_COLUMN_TO_NAME["DownStreak"]: st.column_config.NumberColumn(format="%d"),
+        SUMMARY_COLUMN_TO_NAME["MaxDownStreak"]: st.column_config.NumberColumn(format="%d"),
+    },
+)
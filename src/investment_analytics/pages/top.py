@@ -8,3 +8,4 @@ st.subheader("メニュー")
 
 st.page_link("investment_analytics/pages/realtime.py", label="リアルタイム分析", icon=":material/show_chart:")
 st.page_link("investment_analytics/pages/history.py", label="時系列分析", icon=":material/finance:")
+st.page_link("investment_analytics/pages/screener.py", label="スクリーニング", icon=":material/leaderboard:")
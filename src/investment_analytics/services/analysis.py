@@ -2,23 +2,38 @@ import datetime
 
 import pandas as pd
 
+from investment_analytics.services.rolling import RollingWindows
 
-def compute_daily_metrics(df: pd.DataFrame, ma_period: int, start_date: datetime.date) -> pd.DataFrame:
+
+def compute_daily_metrics(
+    df: pd.DataFrame,
+    ma_period: int,
+    start_date: datetime.date,
+    rolling: RollingWindows | None = None,
+) -> pd.DataFrame:
     """
     日次データに騰落率・移動平均・移動平均乖離率を追加する.
 
+    - 元の DataFrame は変更せず, 列を追加した新しい DataFrame を返す.
+    - 移動平均は終値の累積和から算出する. rolling を渡した場合は算出済みの累積和を再利用する.
+
     Args:
         df (pd.DataFrame): 日次の価格データ.
         ma_period (int): 移動平均の期間 (日数).
         start_date (datetime.date): フィルタリングする開始日.
+        rolling (RollingWindows | None, optional): 終値から作成した RollingWindows. (Default: None)
 
     Returns:
         pd.DataFrame: 追加後の日次の価格データ.
     """
-    df["Change"] = df["Close"].pct_change() * 100
-    df["MA"] = df["Close"].rolling(window=ma_period).mean()
-    df["MAD"] = ((df["Close"] - df["MA"]) / df["MA"]) * 100
-    return df[df.index.date >= start_date]
+    if rolling is None:
+        rolling = RollingWindows(df["Close"].to_numpy())
+
+    assert len(rolling) == len(df)
+
+    ma = rolling.sma(ma_period)
+    daily_df = df.assign(Change=df["Close"].pct_change() * 100, MA=ma, MAD=((df["Close"] - ma) / ma) * 100)
+    return daily_df[daily_df.index.date >= start_date]
 
 
 def compute_weekly_metrics(daily_df: pd.DataFrame, start_date: datetime.date) -> pd.DataFrame:
@@ -59,13 +74,28 @@ def compute_realtime_change(df: pd.DataFrame) -> tuple[float, float, float]:
     直近の価格データから現在値・前日終値・騰落率を算出する.
 
     Args:
-        df (pd.DataFrame): 日次の価格データ.
+        df (pd.DataFrame): 時刻の昇順に並んだ日次の価格データ.
 
     Returns:
         tuple[float, float, float]: 現在値, 前日終値, 騰落率.
     """
-    df = df.sort_index()
     current_price = df["Close"].iloc[-1]
     previous_price = df["Close"].iloc[-2]
     change = (current_price - previous_price) / previous_price * 100
     return current_price, previous_price, change
+
+
+def compute_intraday_change(df: pd.DataFrame, previous_price: float) -> tuple[float, float]:
+    """
+    日中の価格データと前日終値から現在値・騰落率を算出する.
+
+    Args:
+        df (pd.DataFrame): 日中の価格データ.
+        previous_price (float): 前日終値.
+
+    Returns:
+        tuple[float, float]: 現在値, 騰落率.
+    """
+    current_price = df["Close"].iloc[-1]
+    change = (current_price - previous_price) / previous_price * 100
+    return current_price, change
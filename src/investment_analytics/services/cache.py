@@ -0,0 +1,182 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Hashable
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    キャッシュの統計情報を表すデータクラス.
+
+    Attributes:
+        hits (int): キャッシュから返した回数.
+        misses (int): 読み込みを実行した回数.
+        coalesced (int): 実行中の読み込みの結果を共有した回数.
+        evictions (int): 容量超過により破棄した回数.
+        entries (int): 保持しているエントリ数.
+        size_bytes (int): 保持しているエントリの合計サイズ (バイト).
+    """
+
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        ヒット率を返す. 共有した読み込みもヒットとして数える.
+
+        Returns:
+            float: ヒット率 (0.0 - 1.0).
+        """
+        total = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+
+@dataclass
+class _Entry[T]:
+    value: T
+    size_bytes: int
+    expires_at: float | None
+
+
+class TTLCache[T]:
+    """
+    プロセス全体で共有する TTL 付きのキャッシュ.
+
+    - エントリごとに有効期限を設定できる (None の場合は無期限).
+    - 合計サイズが上限を超えた場合は最も古く使われたエントリから破棄する.
+    - 同じキーの読み込みが同時に発生した場合は 1 回だけ実行して結果を共有する.
+
+    Attributes:
+        max_bytes (int): 合計サイズの上限 (バイト).
+        sizeof (Callable[[T], int]): 値のサイズを算出する関数.
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[T], int]) -> None:
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, _Entry[T]] = OrderedDict()
+        self._key_to_future: dict[Hashable, Future[T]] = {}
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    def get_or_load(self, key: Hashable, ttl: float | None, loader: Callable[[], T]) -> T:
+        """
+        キャッシュから値を返す. 存在しない場合は読み込んで保存する.
+
+        Args:
+            key (Hashable): キー.
+            ttl (float | None): 有効期間 (秒). None の場合は無期限.
+            loader (Callable[[], T]): 値を読み込む関数.
+
+        Returns:
+            T: 値.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and (entry.expires_at is None or entry.expires_at > time.monotonic()):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry.value
+
+            if entry is not None:
+                self._remove(key)
+
+            future = self._key_to_future.get(key)
+            is_owner = future is None
+
+            if future is None:
+                future = Future()
+                self._key_to_future[key] = future
+                self._misses += 1
+            else:
+                self._coalesced += 1
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as error:
+            with self._lock:
+                del self._key_to_future[key]
+            future.set_exception(error)
+            raise
+
+        with self._lock:
+            del self._key_to_future[key]
+            self._store(key, value, ttl)
+
+        future.set_result(value)
+        return value
+
+    def stats(self) -> CacheStats:
+        """
+        統計情報を返す.
+
+        Returns:
+            CacheStats: 統計情報.
+        """
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                coalesced=self._coalesced,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+            )
+
+    def clear(self) -> None:
+        """
+        全てのエントリを破棄する.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def _store(self, key: Hashable, value: T, ttl: float | None) -> None:
+        """
+        エントリを保存し, 上限を超えた分を破棄する. ロックを取得した状態で呼び出す.
+
+        Args:
+            key (Hashable): キー.
+            value (T): 値.
+            ttl (float | None): 有効期間 (秒).
+        """
+        size_bytes = self.sizeof(value)
+
+        if size_bytes > self.max_bytes:
+            return
+
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = _Entry(value, size_bytes, expires_at)
+        self._size_bytes += size_bytes
+
+        while self._size_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self._evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        """
+        エントリを破棄する. ロックを取得した状態で呼び出す.
+
+        Args:
+            key (Hashable): キー.
+        """
+        entry = self._entries.pop(key)
+        self._size_bytes -= entry.size_bytes
@@ -0,0 +1,213 @@
+import datetime
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+HistoryProvider = Callable[..., pd.DataFrame]
+
+STORABLE_INTERVALS = ("1d", "5d", "1wk", "1mo", "3mo")
+
+DEFAULT_STORE_DIRECTORY = Path.home() / ".cache" / "investment-analytics" / "history"
+
+# 過去の価格を調整する (値が 0 以外の場合に全期間を取得し直す) イベントの列
+ADJUSTMENT_COLUMNS = ("Stock Splits", "Dividends")
+
+
+class HistoryStore:
+    """
+    価格データをローカルの Parquet ファイルに永続化するストア.
+
+    - 銘柄・データの間隔ごとに 1 ファイルとして保存する.
+    - 初回は全期間を取得し, 以降は保存済みの最終日以降のみをプロバイダから取得する.
+    - 分割・配当で過去の価格が調整された場合は全期間を取得し直して上書きする.
+    - 期間の指定はディスク上のデータから切り出して返す.
+
+    Attributes:
+        directory (Path): 保存先のディレクトリ.
+        provider (HistoryProvider): 価格データを取得する関数.
+        refresh_interval (datetime.timedelta): 末尾を再取得するまでの間隔.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        provider: HistoryProvider,
+        refresh_interval: datetime.timedelta = datetime.timedelta(minutes=15),
+    ) -> None:
+        self.directory = directory
+        self.provider = provider
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._path_to_lock: dict[Path, threading.Lock] = {}
+
+    def path(self, ticker_symbol: str, interval: str) -> Path:
+        """
+        銘柄・データの間隔に対応する保存先のパスを返す.
+
+        Args:
+            ticker_symbol (str): 銘柄のシンボル.
+            interval (str): データの間隔.
+
+        Returns:
+            Path: 保存先のパス.
+        """
+        return self.directory / f"{quote(ticker_symbol, safe='')}_{interval}.parquet"
+
+    def load(
+        self,
+        ticker_symbol: str,
+        interval: str = "1d",
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> pd.DataFrame:
+        """
+        保存済みのデータを必要に応じて更新し, 指定された期間のデータを返す.
+
+        Args:
+            ticker_symbol (str): 銘柄のシンボル.
+            interval (str, optional): データの間隔. (Default: "1d")
+            start (datetime.date | None, optional): 取得開始日. (Default: None)
+            end (datetime.date | None, optional): 取得終了日 (この日を含まない). (Default: None)
+
+        Returns:
+            pd.DataFrame: 価格データ.
+        """
+        if interval not in STORABLE_INTERVALS:
+            raise ValueError(f"Interval {interval!r} cannot be stored.")
+
+        path = self.path(ticker_symbol, interval)
+
+        with self._lock:
+            path_lock = self._path_to_lock.setdefault(path, threading.Lock())
+
+        with path_lock:
+            df = self._refresh(path, ticker_symbol, interval, end)
+
+        return _slice_by_date(df, start, end)
+
+    def _refresh(self, path: Path, ticker_symbol: str, interval: str, end: datetime.date | None) -> pd.DataFrame:
+        """
+        保存済みのデータを読み込み, 不足している末尾のデータを取得して保存する.
+
+        Args:
+            path (Path): 保存先のパス.
+            ticker_symbol (str): 銘柄のシンボル.
+            interval (str): データの間隔.
+            end (datetime.date | None): 要求されている取得終了日.
+
+        Returns:
+            pd.DataFrame: 保存済みの全期間の価格データ.
+        """
+        if not path.exists():
+            df = self.provider(ticker_symbol, period="max", interval=interval)
+            if not df.empty:
+                self._save(path, df)
+            return df
+
+        df = pd.read_parquet(path)
+
+        if df.empty:
+            return df
+
+        # 要求された期間が保存済みの範囲に収まる場合は取得しない
+        last_date = df.index[-1].date()
+        if end is not None and end <= last_date:
+            return df
+
+        # 直近に更新済みの場合は取得しない
+        if time.time() - path.stat().st_mtime < self.refresh_interval.total_seconds():
+            return df
+
+        # 最終日の値は確定していない可能性があるため, 確定済みの前日の足から取得して上書きする
+        overlap_date = df.index[-2].date() if len(df) >= 2 else last_date
+        tail_df = self.provider(ticker_symbol, interval=interval, start=overlap_date)
+
+        # 過去の価格が調整された場合は保存済みのデータと基準が異なるため, 全期間を取得し直す
+        if _is_adjusted(df, tail_df):
+            full_df = self.provider(ticker_symbol, period="max", interval=interval)
+            if not full_df.empty:
+                self._save(path, full_df)
+                return full_df
+
+        if not tail_df.empty:
+            df = pd.concat([df[df.index < tail_df.index[0]], tail_df])
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+
+        self._save(path, df)
+        return df
+
+    def _save(self, path: Path, df: pd.DataFrame) -> None:
+        """
+        価格データをアトミックに保存する.
+
+        Args:
+            path (Path): 保存先のパス.
+            df (pd.DataFrame): 価格データ.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            df.to_parquet(temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+
+def _is_adjusted(stored_df: pd.DataFrame, tail_df: pd.DataFrame) -> bool:
+    """
+    末尾の取得結果から, 保存済みの価格が分割・配当で調整されたかを判定する.
+
+    - 保存済みの最終日より後の足に分割・配当がある場合は調整されたとみなす.
+    - 確定済みの足 (保存済みの最終日の前日) の終値が保存済みの値と異なる場合も調整されたとみなす.
+
+    Args:
+        stored_df (pd.DataFrame): 保存済みの価格データ (空でないこと).
+        tail_df (pd.DataFrame): 末尾の取得結果.
+
+    Returns:
+        bool: 調整された場合は True.
+    """
+    if tail_df.empty:
+        return False
+
+    new_df = tail_df[tail_df.index > stored_df.index[-1]]
+    for column in ADJUSTMENT_COLUMNS:
+        if column in new_df.columns and (new_df[column].fillna(0) != 0).any():
+            return True
+
+    if len(stored_df) < 2 or stored_df.index[-2] not in tail_df.index:
+        return False
+
+    stored_close = stored_df["Close"].loc[stored_df.index[-2]]
+    fetched_close = tail_df["Close"].loc[stored_df.index[-2]]
+    return not np.isclose(stored_close, fetched_close, rtol=1e-6)
+
+
+def _slice_by_date(df: pd.DataFrame, start: datetime.date | None, end: datetime.date | None) -> pd.DataFrame:
+    """
+    日付の範囲で価格データを切り出す.
+
+    Args:
+        df (pd.DataFrame): 日付順に並んだ価格データ.
+        start (datetime.date | None): 開始日.
+        end (datetime.date | None): 終了日 (この日を含まない).
+
+    Returns:
+        pd.DataFrame: 切り出した価格データ.
+    """
+    if df.empty:
+        return df
+
+    tz = getattr(df.index, "tz", None)
+    start_position = 0 if start is None else df.index.searchsorted(pd.Timestamp(start).tz_localize(tz))
+    end_position = len(df) if end is None else df.index.searchsorted(pd.Timestamp(end).tz_localize(tz))
+    return df.iloc[start_position:end_position]
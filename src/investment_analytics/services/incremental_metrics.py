@@ -0,0 +1,192 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from investment_analytics.services.rolling import RollingWindows
+
+
+def _create_empty_weekly_frame(tz: datetime.tzinfo | None) -> pd.DataFrame:
+    """
+    週次の指標の空のデータフレームを作成する.
+
+    Args:
+        tz (datetime.tzinfo | None): インデックスのタイムゾーン (日次の価格データと揃える).
+
+    Returns:
+        pd.DataFrame: 終値と騰落率の列を持つ空のデータフレーム.
+    """
+    return pd.DataFrame({"Close": [], "Change": []}, index=pd.DatetimeIndex([], tz=tz), dtype=np.float64)
+
+
+class IncrementalMetrics:
+    """
+    日次・週次の指標を変更された足の分だけ算出し直すクラス.
+
+    - compute_daily_metrics と compute_weekly_metrics で全体を再計算した結果と一致する.
+    - 前回の価格データと最初に異なる足 (末尾の未確定の足の修正を含む) 以降のみを算出し直す.
+    - 移動平均は終値の RollingWindows から算出し, 累積和は前回の値から続けて足し合わせる.
+    - 移動平均の期間は取得時に指定するため, 期間を変更しても累積和を差し引くだけで算出できる.
+    - 週次の指標は変更された足を含む週以降のみを集計し直す (取引のない週は欠損値とする).
+
+    Attributes:
+        start_date (datetime.date): フィルタリングする開始日.
+        rolling (RollingWindows): 最新の終値から作成した RollingWindows (他の移動平均線の算出にも共有する).
+        num_updated_rows (int): 直前の更新で算出し直した日次の足の数.
+    """
+
+    def __init__(self, start_date: datetime.date) -> None:
+        self.start_date = start_date
+        self.rolling = RollingWindows(np.empty(0))
+        self.num_updated_rows = 0
+        self._index = pd.DatetimeIndex([])
+        self._changes = np.empty(0)
+        self._weekly_df = _create_empty_weekly_frame(None)
+
+    def update(self, df: pd.DataFrame, ma_period: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        最新の価格データで指標を更新する.
+
+        Args:
+            df (pd.DataFrame): 日付の昇順に並んだ日次の価格データ.
+            ma_period (int): 移動平均の期間 (日数).
+
+        Returns:
+            tuple[pd.DataFrame, pd.DataFrame]: 日次の価格データ, 週次の価格データ (compute_daily_metrics,
+                compute_weekly_metrics の結果と同じ形式).
+        """
+        index = pd.DatetimeIndex(df.index)
+        closes = df["Close"].to_numpy(dtype=np.float64)
+
+        position = self._find_first_difference(index, closes)
+        self.num_updated_rows = len(closes) - position
+
+        if position < max(len(self.rolling), len(closes)):
+            self._update_daily(index, closes, position)
+            self._update_weekly(position)
+
+        return self._create_daily_frame(df, ma_period), self._create_weekly_frame()
+
+    def _find_first_difference(self, index: pd.DatetimeIndex, closes: np.ndarray) -> int:
+        """
+        前回の価格データと最初に異なる足の位置を返す.
+
+        Args:
+            index (pd.DatetimeIndex): 最新の日付.
+            closes (np.ndarray): 最新の終値.
+
+        Returns:
+            int: 最初に異なる足の位置. 前回の価格データを全て含む場合は前回の足の数.
+        """
+        if index.tz != self._index.tz:
+            return 0
+
+        previous_closes = self.rolling.values
+        num_common = min(len(previous_closes), len(closes))
+        is_same_time = self._index.asi8[:num_common] == index.asi8[:num_common]
+        is_same_close = (previous_closes[:num_common] == closes[:num_common]) | (
+            np.isnan(previous_closes[:num_common]) & np.isnan(closes[:num_common])
+        )
+        is_different = ~(is_same_time & is_same_close)
+
+        return int(is_different.argmax()) if is_different.any() else num_common
+
+    def _update_daily(self, index: pd.DatetimeIndex, closes: np.ndarray, position: int) -> None:
+        """
+        指定した位置以降の日次の指標を算出し直す.
+
+        Args:
+            index (pd.DatetimeIndex): 最新の日付.
+            closes (np.ndarray): 最新の終値.
+            position (int): 算出し直す開始位置.
+        """
+        new_closes = closes[position:]
+
+        # 前日の終値との騰落率 (先頭の足は欠損値)
+        previous_closes = np.append(np.nan, closes)[position:-1]
+        new_changes = (new_closes / previous_closes - 1) * 100
+
+        self._index = index
+        self.rolling = self.rolling.updated(closes, position)
+        self._changes = np.concatenate([self._changes[:position], new_changes])
+
+    def _find_start_position(self) -> int:
+        """
+        開始日以降の最初の足の位置を返す.
+
+        Returns:
+            int: 開始日以降の最初の足の位置.
+        """
+        start = pd.Timestamp(self.start_date)
+        if self._index.tz is not None:
+            start = start.tz_localize(self._index.tz, ambiguous=False, nonexistent="shift_forward")
+        return int(self._index.searchsorted(start, side="left"))
+
+    def _update_weekly(self, position: int) -> None:
+        """
+        指定した位置の足を含む週以降の週次の指標を集計し直す.
+
+        Args:
+            position (int): 算出し直した日次の足の開始位置.
+        """
+        start_position = self._find_start_position()
+
+        if start_position >= len(self._index):
+            self._weekly_df = _create_empty_weekly_frame(self._index.tz)
+            return
+
+        # 変更された足より前に終わる週はそのまま残す
+        kept_df = _create_empty_weekly_frame(self._index.tz)
+        if position > 0:
+            first_position = min(max(position, start_position), len(self._index) - 1)
+            kept_df = self._weekly_df[self._weekly_df.index < self._index[first_position]]
+
+        # 残す週の最後の足から集計し直し, 間の取引のない週も含める
+        tail_position = start_position
+        if not kept_df.empty:
+            tail_position = max(int(self._index.searchsorted(kept_df.index[-1], side="right")) - 1, start_position)
+
+        tail_closes = (
+            pd.Series(self.rolling.values[tail_position:], index=self._index[tail_position:]).resample("W").last()
+        )
+        if not kept_df.empty:
+            tail_closes = tail_closes[tail_closes.index > kept_df.index[-1]]
+
+        # 残す週の最後の終値との騰落率を算出する
+        previous_closes = kept_df["Close"].iloc[-1:]
+        tail_changes = pd.concat([previous_closes, tail_closes]).pct_change().iloc[len(previous_closes) :] * 100
+        tail_df = pd.DataFrame({"Close": tail_closes, "Change": tail_changes})
+
+        self._weekly_df = pd.concat([kept_df, tail_df]) if not kept_df.empty else tail_df
+
+    def _create_daily_frame(self, df: pd.DataFrame, ma_period: int) -> pd.DataFrame:
+        """
+        日次の価格データに指標を追加し, 開始日以降に絞り込む.
+
+        Args:
+            df (pd.DataFrame): 日次の価格データ.
+            ma_period (int): 移動平均の期間 (日数).
+
+        Returns:
+            pd.DataFrame: 追加後の日次の価格データ.
+        """
+        start_position = self._find_start_position()
+        closes = self.rolling.values[start_position:]
+        mas = self.rolling.sma(ma_period)[start_position:]
+
+        daily_df = df.iloc[start_position:].copy(deep=False)
+        daily_df["Change"] = self._changes[start_position:]
+        daily_df["MA"] = mas
+        daily_df["MAD"] = ((closes - mas) / mas) * 100
+        return daily_df
+
+    def _create_weekly_frame(self) -> pd.DataFrame:
+        """
+        週次の指標を週の開始日のインデックスに変換し, 開始日以降に絞り込む.
+
+        Returns:
+            pd.DataFrame: 週次の価格データ.
+        """
+        weekly_df = self._weekly_df.copy(deep=False)
+        weekly_df.index = weekly_df.index - pd.Timedelta(days=6)
+        return weekly_df[weekly_df.index.date >= self.start_date]
@@ -0,0 +1,110 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CAPACITY = 24 * 60
+
+
+class IntradayBuffer:
+    """
+    1 銘柄の当日の 1 分足を保持するリングバッファ.
+
+    - 取得済みの最終時刻以降のデータのみを追加する.
+    - 最終時刻の足は確定していない可能性があるため, 同じ時刻のデータで上書きする.
+    - 取引日が変わった場合は保持しているデータを破棄する.
+    - 容量を超えた場合は古いデータから破棄する.
+
+    Attributes:
+        capacity (int): 保持する足の数の上限.
+        lock (threading.Lock): 取得と追加を排他するためのロック.
+        fetched_at (float | None): 最後に取得した時刻 (time.monotonic の値).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.fetched_at: float | None = None
+        self._times = np.empty(capacity, dtype=np.int64)
+        self._closes = np.empty(capacity, dtype=np.float64)
+        self._start = 0
+        self._size = 0
+        self._tz: str | None = None
+        self._frame: pd.DataFrame | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def last_timestamp(self) -> pd.Timestamp | None:
+        """
+        保持している最終時刻を返す.
+
+        Returns:
+            pd.Timestamp | None: 最終時刻. データがない場合は None.
+        """
+        if self._size == 0:
+            return None
+
+        return pd.Timestamp(self._times[(self._start + self._size - 1) % self.capacity], unit="ns", tz=self._tz)
+
+    def extend(self, df: pd.DataFrame) -> None:
+        """
+        新しいデータを追加する.
+
+        Args:
+            df (pd.DataFrame): 時刻の昇順に並んだ日中の価格データ.
+        """
+        df = df.dropna(subset=["Close"])
+
+        if df.empty:
+            return
+
+        index = pd.DatetimeIndex(df.index)
+
+        # 最新の取引日のデータのみを対象とする
+        dates = index.normalize()
+        is_latest_session = dates == dates[-1]
+        index = index[is_latest_session]
+        closes = df["Close"].to_numpy(dtype=np.float64)[is_latest_session]
+        times = index.as_unit("ns").asi8
+
+        last_timestamp = self.last_timestamp()
+
+        if last_timestamp is None or last_timestamp.normalize() != index[0].normalize():
+            self._start = 0
+            self._size = 0
+            self._tz = None if index.tz is None else str(index.tz)
+
+        # 新しいデータと重複する末尾の足を取り除く
+        while self._size > 0 and self._times[(self._start + self._size - 1) % self.capacity] >= times[0]:
+            self._size -= 1
+
+        times = times[-self.capacity :]
+        closes = closes[-self.capacity :]
+        num_new = len(times)
+
+        positions = (self._start + self._size + np.arange(num_new)) % self.capacity
+        self._times[positions] = times
+        self._closes[positions] = closes
+
+        overflow = max(self._size + num_new - self.capacity, 0)
+        self._start = (self._start + overflow) % self.capacity
+        self._size = min(self._size + num_new, self.capacity)
+        self._frame = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        保持しているデータを DataFrame として返す.
+
+        - 次に追加されるまでは同じ DataFrame を返す.
+
+        Returns:
+            pd.DataFrame: 時刻の昇順に並んだ日中の価格データ (終値のみ).
+        """
+        if self._frame is None:
+            positions = (self._start + np.arange(self._size)) % self.capacity
+            index = pd.DatetimeIndex(pd.to_datetime(self._times[positions], unit="ns", utc=True))
+            index = index.tz_convert(self._tz) if self._tz is not None else index.tz_localize(None)
+            self._frame = pd.DataFrame({"Close": self._closes[positions]}, index=index)
+
+        return self._frame
@@ -1,10 +1,77 @@
+import atexit
 import datetime
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 
 import pandas as pd
-import yfinance as yf
 
+from investment_analytics.models.bars import Bars
+from investment_analytics.services.cache import TTLCache
+from investment_analytics.services.history_store import DEFAULT_STORE_DIRECTORY
+from investment_analytics.services.history_store import STORABLE_INTERVALS
+from investment_analytics.services.history_store import HistoryStore
+from investment_analytics.services.intraday_buffer import IntradayBuffer
+from investment_analytics.services.metrics import count
+from investment_analytics.services.metrics import map_in_threads
+from investment_analytics.services.metrics import span
+from investment_analytics.services.providers import get_provider
 
-def fetch_history(
+logger = logging.getLogger(__name__)
+
+STORE_DIR_ENV = "INVESTMENT_ANALYTICS_STORE_DIR"
+
+MAX_FETCH_WORKERS = 8
+
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# 移動平均 (最大 200 日) を開始日から算出するため, 開始日より前に追加で取得する期間
+HISTORY_LOOKBACK = datetime.timedelta(days=200)
+
+INTERVAL_TO_TTL = {
+    "1m": 30,
+    "2m": 60,
+    "5m": 2 * 60,
+    "15m": 5 * 60,
+    "30m": 10 * 60,
+    "60m": 15 * 60,
+    "90m": 15 * 60,
+    "1h": 15 * 60,
+    "1d": 60 * 60,
+    "5d": 60 * 60,
+    "1wk": 6 * 60 * 60,
+    "1mo": 6 * 60 * 60,
+    "3mo": 6 * 60 * 60,
+}
+
+
+@dataclass(frozen=True)
+class HistoryRequest:
+    """
+    価格データの取得条件を表すデータクラス.
+
+    Attributes:
+        ticker_symbol (str): 銘柄のシンボル.
+        period (str | None): 取得期間.
+        interval (str): データの間隔.
+        start (datetime.date | None): 取得開始日.
+        end (datetime.date | None): 取得終了日.
+    """
+
+    ticker_symbol: str
+    period: str | None = None
+    interval: str = "1d"
+    start: datetime.date | None = None
+    end: datetime.date | None = None
+
+
+def _fetch_from_provider(
     ticker_symbol: str,
     period: str | None = None,
     interval: str = "1d",
@@ -12,7 +79,7 @@ def fetch_history(
     end: datetime.date | None = None,
 ) -> pd.DataFrame:
     """
-    価格データを取得する.
+    価格データをプロバイダから取得する.
 
     Args:
         ticker_symbol (str): 銘柄のシンボル.
@@ -24,4 +91,212 @@ def fetch_history(
     Returns:
         pd.DataFrame: 価格データ.
     """
-    return yf.Ticker(ticker_symbol).history(period=period, interval=interval, start=start, end=end)
+    with span("provider"):
+        return get_provider().history(ticker_symbol, period=period, interval=interval, start=start, end=end)
+
+
+def _create_store_directory(provider_name: str) -> Path:
+    """
+    プロバイダの価格データを保存するディレクトリを作成する.
+
+    - 環境変数 INVESTMENT_ANALYTICS_STORE_DIR のディレクトリの下に, プロバイダの名前のディレクトリを作成する.
+    - 生成したデータを返す "replay" は実際の価格データと混ざらないように, プロセスごとの一時ディレクトリとする
+      (プロセスの終了時に削除する).
+
+    Args:
+        provider_name (str): プロバイダの名前.
+
+    Returns:
+        Path: 保存先のディレクトリ.
+    """
+    if provider_name == "replay":
+        directory = tempfile.mkdtemp(prefix="investment-analytics-replay-")
+        atexit.register(shutil.rmtree, directory, ignore_errors=True)
+        return Path(directory)
+
+    return Path(os.environ.get(STORE_DIR_ENV, DEFAULT_STORE_DIRECTORY)) / provider_name
+
+
+_history_stores_lock = threading.Lock()
+
+_provider_name_to_history_store: dict[str, HistoryStore] = {}
+
+
+def get_history_store() -> HistoryStore:
+    """
+    使用中のプロバイダの価格データを保存するストアを返す. プロバイダごとに 1 つ作成し, プロセス全体で共有する.
+
+    Returns:
+        HistoryStore: ストア.
+    """
+    provider_name = get_provider().name
+
+    with _history_stores_lock:
+        if provider_name not in _provider_name_to_history_store:
+            _provider_name_to_history_store[provider_name] = HistoryStore(
+                directory=_create_store_directory(provider_name),
+                provider=_fetch_from_provider,
+            )
+        return _provider_name_to_history_store[provider_name]
+
+
+history_cache: TTLCache[Bars] = TTLCache(max_bytes=MAX_CACHE_BYTES, sizeof=lambda bars: bars.nbytes)
+
+
+def _compute_ttl(request: HistoryRequest) -> float | None:
+    """
+    取得条件に応じたキャッシュの有効期間を算出する.
+
+    - 終了日が過去の期間は値が変わらないため無期限とする.
+    - それ以外はデータの間隔に応じて短く設定する.
+
+    Args:
+        request (HistoryRequest): 取得条件.
+
+    Returns:
+        float | None: 有効期間 (秒). 無期限の場合は None.
+    """
+    if request.period is None and request.end is not None and request.end < datetime.date.today():
+        return None
+
+    return INTERVAL_TO_TTL.get(request.interval, INTERVAL_TO_TTL["1m"])
+
+
+def _load_history(request: HistoryRequest) -> Bars:
+    """
+    キャッシュを介さずに価格データを取得し, 正規化する.
+
+    Args:
+        request (HistoryRequest): 取得条件.
+
+    Returns:
+        Bars: 正規化した価格データ.
+    """
+    count("history_cache.misses")
+
+    if request.period is None and request.start is not None and request.interval in STORABLE_INTERVALS:
+        df = get_history_store().load(
+            request.ticker_symbol,
+            interval=request.interval,
+            start=request.start,
+            end=request.end,
+        )
+    else:
+        df = _fetch_from_provider(
+            request.ticker_symbol,
+            period=request.period,
+            interval=request.interval,
+            start=request.start,
+            end=request.end,
+        )
+
+    return Bars.from_frame(df)
+
+
+def fetch_history(
+    ticker_symbol: str,
+    period: str | None = None,
+    interval: str = "1d",
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+) -> Bars:
+    """
+    価格データを取得する.
+
+    - プロセス全体で共有するキャッシュを介して取得する (キャッシュはプロバイダごとに区別する).
+    - 開始日を指定した日次以上の間隔のデータはローカルのストアから取得する.
+    - 取得時に 1 回だけ正規化し, 変更できない Bars としてコピーせずに返す.
+
+    Args:
+        ticker_symbol (str): 銘柄のシンボル.
+        period (str | None, optional): 取得期間. (Default: None)
+        interval (str, optional): データの間隔. (Default: "1d")
+        start (datetime.date | None, optional): 取得開始日. (Default: None)
+        end (datetime.date | None, optional): 取得終了日. (Default: None)
+
+    Returns:
+        Bars: 正規化した価格データ.
+    """
+    request = HistoryRequest(ticker_symbol, period=period, interval=interval, start=start, end=end)
+    count("history_cache.requests")
+
+    with span("fetch_history"):
+        key = (get_provider().name, request)
+        return history_cache.get_or_load(key, _compute_ttl(request), lambda: _load_history(request))
+
+
+_intraday_buffers_lock = threading.Lock()
+
+# (プロバイダの名前, シンボル) をキーとするバッファ
+_key_to_intraday_buffer: dict[tuple[str, str], IntradayBuffer] = {}
+
+
+def fetch_intraday(ticker_symbol: str) -> pd.DataFrame:
+    """
+    当日の 1 分足を取得する.
+
+    - 銘柄ごとのバッファに保持し, プロセス全体で共有する (バッファはプロバイダごとに区別する).
+    - 取得済みの最終時刻以降の足のみをプロバイダから取得して追加する.
+    - 1 分足のキャッシュの有効期間内は取得せずにバッファの内容を返す.
+
+    Args:
+        ticker_symbol (str): 銘柄のシンボル.
+
+    Returns:
+        pd.DataFrame: 時刻の昇順に並んだ日中の価格データ (終値のみ).
+    """
+    with _intraday_buffers_lock:
+        buffer = _key_to_intraday_buffer.setdefault((get_provider().name, ticker_symbol), IntradayBuffer())
+
+    with buffer.lock:
+        if buffer.fetched_at is not None and time.monotonic() - buffer.fetched_at < INTERVAL_TO_TTL["1m"]:
+            return buffer.to_frame()
+
+        last_timestamp = buffer.last_timestamp()
+
+        if last_timestamp is None:
+            df = _fetch_from_provider(ticker_symbol, period="1d", interval="1m")
+        else:
+            df = _fetch_from_provider(ticker_symbol, interval="1m", start=last_timestamp.to_pydatetime())
+
+        buffer.extend(df)
+        buffer.fetched_at = time.monotonic()
+        return buffer.to_frame()
+
+
+def fetch_history_batch(requests: list[HistoryRequest]) -> dict[HistoryRequest, Bars]:
+    """
+    複数の価格データを並列に取得する.
+
+    - 同一の取得条件は 1 回だけ取得する.
+    - 上限付きのスレッドプールで取得する.
+    - 取得に失敗した条件はログに記録して結果から除き, 他の条件の結果は返す.
+
+    Args:
+        requests (list[HistoryRequest]): 取得条件のリスト.
+
+    Returns:
+        dict[HistoryRequest, Bars]: 取得に成功した取得条件をキーとする正規化した価格データの辞書.
+    """
+    unique_requests = list(dict.fromkeys(requests))
+
+    if not unique_requests:
+        return {}
+
+    def fetch(request: HistoryRequest) -> Bars | None:
+        try:
+            return fetch_history(
+                request.ticker_symbol,
+                period=request.period,
+                interval=request.interval,
+                start=request.start,
+                end=request.end,
+            )
+        except Exception:
+            logger.warning("Failed to fetch %s", request, exc_info=True)
+            count("history_batch.errors")
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(unique_requests))) as executor:
+        results = map_in_threads(executor, fetch, unique_requests)
+        return {request: bars for request, bars in zip(unique_requests, results, strict=True) if bars is not None}
@@ -0,0 +1,265 @@
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+
+logger = logging.getLogger(__name__)
+
+ENABLED_ENV = "INVESTMENT_ANALYTICS_METRICS"
+
+_enabled = os.environ.get(ENABLED_ENV, "") not in ("", "0", "false")
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    """
+    計測した区間を表すデータクラス.
+
+    Attributes:
+        name (str): 区間の名前.
+        start (float): 記録の開始からの経過時間 (秒).
+        seconds (float): 区間の実行時間 (秒).
+        thread (str): 実行したスレッドの名前.
+    """
+
+    name: str
+    start: float
+    seconds: float
+    thread: str
+
+
+@dataclass
+class MetricsRecorder:
+    """
+    1 回の再実行で計測した区間とカウンタを保持するクラス.
+
+    - 複数のスレッドから記録できる.
+
+    Attributes:
+        label (str): 記録の名前 (例: ページ名).
+        started_at (float): 記録の開始時刻 (time.perf_counter の値).
+        seconds (float | None): 記録の開始から終了までの時間 (秒). 終了前は None.
+        spans (list[SpanRecord]): 計測した区間.
+        counters (dict[str, float]): カウンタ.
+    """
+
+    label: str
+    started_at: float = field(default_factory=time.perf_counter)
+    seconds: float | None = None
+    spans: list[SpanRecord] = field(default_factory=list)
+    counters: dict[str, float] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add_span(self, name: str, started_at: float, seconds: float) -> None:
+        """
+        区間を記録する.
+
+        Args:
+            name (str): 区間の名前.
+            started_at (float): 区間の開始時刻 (time.perf_counter の値).
+            seconds (float): 区間の実行時間 (秒).
+        """
+        record = SpanRecord(name, started_at - self.started_at, seconds, threading.current_thread().name)
+        with self._lock:
+            self.spans.append(record)
+
+    def add(self, name: str, value: float = 1) -> None:
+        """
+        カウンタに加算する.
+
+        Args:
+            name (str): カウンタの名前.
+            value (float, optional): 加算する値. (Default: 1)
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summarize_spans(self) -> list[dict]:
+        """
+        区間を名前ごとに集計する.
+
+        Returns:
+            list[dict]: 名前 ("name"), 回数 ("count"), 合計時間 ("total_seconds"), 最大時間 ("max_seconds") の辞書の
+                リスト (合計時間の降順).
+        """
+        name_to_summary: dict[str, dict] = {}
+
+        with self._lock:
+            spans = list(self.spans)
+
+        for span in spans:
+            summary = name_to_summary.setdefault(
+                span.name, {"name": span.name, "count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            summary["count"] += 1
+            summary["total_seconds"] += span.seconds
+            summary["max_seconds"] = max(summary["max_seconds"], span.seconds)
+
+        return sorted(name_to_summary.values(), key=lambda summary: summary["total_seconds"], reverse=True)
+
+    def to_dict(self) -> dict:
+        """
+        構造化ログとして出力するための辞書に変換する.
+
+        Returns:
+            dict: 記録の内容.
+        """
+        with self._lock:
+            return {
+                "label": self.label,
+                "seconds": self.seconds,
+                "spans": [asdict(span) for span in self.spans],
+                "counters": dict(self.counters),
+            }
+
+
+class _Span:
+    """
+    区間の実行時間を記録するコンテキストマネージャ.
+    """
+
+    __slots__ = ("_recorder", "_name", "_started_at")
+
+    def __init__(self, recorder: MetricsRecorder, name: str) -> None:
+        self._recorder = recorder
+        self._name = name
+        self._started_at = 0.0
+
+    def __enter__(self) -> None:
+        self._started_at = time.perf_counter()
+
+    def __exit__(self, *_: object) -> None:
+        self._recorder.add_span(self._name, self._started_at, time.perf_counter() - self._started_at)
+
+
+_NULL_SPAN = contextlib.nullcontext()
+
+_current_recorder: contextvars.ContextVar[MetricsRecorder | None] = contextvars.ContextVar(
+    "metrics_recorder", default=None
+)
+
+
+def is_enabled() -> bool:
+    """
+    計測が有効かどうかを返す.
+
+    Returns:
+        bool: 計測が有効な場合は True.
+    """
+    return _enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    """
+    計測の有効・無効を切り替える. 次に記録を開始した時点から反映する.
+
+    Args:
+        enabled (bool): 計測を有効にする場合は True.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_recording() -> bool:
+    """
+    現在のコンテキストで記録中かどうかを返す. 記録のための追加の処理を省略する判定に使う.
+
+    Returns:
+        bool: 記録中の場合は True.
+    """
+    return _current_recorder.get() is not None
+
+
+def span(name: str) -> contextlib.AbstractContextManager:
+    """
+    区間の実行時間を計測するコンテキストマネージャを返す.
+
+    - 記録中でない場合は何もしないコンテキストマネージャを返す.
+
+    Args:
+        name (str): 区間の名前.
+
+    Returns:
+        contextlib.AbstractContextManager: コンテキストマネージャ.
+    """
+    recorder = _current_recorder.get()
+
+    if recorder is None:
+        return _NULL_SPAN
+
+    return _Span(recorder, name)
+
+
+def count(name: str, value: float = 1) -> None:
+    """
+    カウンタに加算する. 記録中でない場合は何もしない.
+
+    Args:
+        name (str): カウンタの名前.
+        value (float, optional): 加算する値. (Default: 1)
+    """
+    recorder = _current_recorder.get()
+
+    if recorder is not None:
+        recorder.add(name, value)
+
+
+@contextlib.contextmanager
+def record(label: str) -> Iterator[MetricsRecorder | None]:
+    """
+    ブロック内の区間とカウンタを記録する.
+
+    - 計測が無効な場合は記録せずに None を返す.
+    - 終了時に記録の内容を JSON の構造化ログとして出力する (INFO レベル).
+
+    Args:
+        label (str): 記録の名前.
+
+    Yields:
+        MetricsRecorder | None: 記録. 計測が無効な場合は None.
+    """
+    if not _enabled:
+        yield None
+        return
+
+    recorder = MetricsRecorder(label)
+    token = _current_recorder.set(recorder)
+
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+        recorder.seconds = time.perf_counter() - recorder.started_at
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(recorder.to_dict(), ensure_ascii=False))
+
+
+def map_in_threads[T, R](
+    executor: ThreadPoolExecutor,
+    function: Callable[[T], R],
+    items: Iterable[T],
+) -> Iterator[R]:
+    """
+    呼び出し元の記録を引き継いでスレッドプールで実行する.
+
+    Args:
+        executor (ThreadPoolExecutor): スレッドプール.
+        function (Callable[[T], R]): 実行する関数.
+        items (Iterable[T]): 関数に渡す値.
+
+    Returns:
+        Iterator[R]: 関数の結果 (items の順).
+    """
+    items = list(items)
+    contexts = [contextvars.copy_context() for _ in items]
+    return executor.map(lambda context, item: context.run(function, item), contexts, items)
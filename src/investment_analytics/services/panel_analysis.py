@@ -0,0 +1,200 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from investment_analytics.models.bars import Bars
+from investment_analytics.services.rolling import RollingWindows
+
+
+def build_close_matrix(symbol_to_bars: dict[str, Bars]) -> pd.DataFrame:
+    """
+    銘柄ごとの価格データから (日付 × 銘柄) の終値の行列を作成する.
+
+    - 日付は各銘柄の現地時間の日付とし, 全銘柄の日付の和集合に揃える.
+    - 取引のない日は欠損値とする.
+
+    Args:
+        symbol_to_bars (dict[str, Bars]): 銘柄のシンボルをキーとする日次の価格データの辞書.
+
+    Returns:
+        pd.DataFrame: 日付をインデックス, 銘柄のシンボルを列とする終値の DataFrame.
+    """
+    symbol_to_close = {}
+
+    for symbol, bars in symbol_to_bars.items():
+        close = pd.Series(bars.close, index=bars.index.tz_localize(None).normalize())
+        symbol_to_close[symbol] = close[~close.index.duplicated(keep="last")]
+
+    return pd.DataFrame(symbol_to_close).sort_index()
+
+
+def _compact(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    各列の欠損でない値を先頭に詰める.
+
+    - 各列の値の並び順は保つため, 列ごとの系列をそのまま縦に計算できる.
+
+    Args:
+        values (np.ndarray): (日付 × 銘柄) の配列.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: 詰めた配列, 元の行の位置 (np.put_along_axis で戻すために使う).
+    """
+    order = np.argsort(np.isnan(values), axis=0, kind="stable")
+    return np.take_along_axis(values, order, axis=0), order
+
+
+def _expand(compacted: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """
+    _compact で詰めた配列を元の行の位置に戻す.
+
+    Args:
+        compacted (np.ndarray): 詰めた配列.
+        order (np.ndarray): 元の行の位置.
+
+    Returns:
+        np.ndarray: 元の行の位置に戻した配列.
+    """
+    expanded = np.empty_like(compacted)
+    np.put_along_axis(expanded, order, compacted, axis=0)
+    return expanded
+
+
+def compute_panel_daily_metrics(close_df: pd.DataFrame, ma_period: int, start_date: datetime.date) -> pd.DataFrame:
+    """
+    複数銘柄の日次の騰落率・移動平均・移動平均乖離率をまとめて算出する.
+
+    - 各銘柄の取引日のみで計算するため, compute_daily_metrics を銘柄ごとに適用した結果と一致する.
+
+    Args:
+        close_df (pd.DataFrame): build_close_matrix で作成した終値の行列.
+        ma_period (int): 移動平均の期間 (日数).
+        start_date (datetime.date): フィルタリングする開始日.
+
+    Returns:
+        pd.DataFrame: 列が (指標, 銘柄) の MultiIndex の DataFrame. 指標は "Close", "Change", "MA", "MAD".
+    """
+    values = close_df.to_numpy(dtype=np.float64)
+    compacted, order = _compact(values)
+
+    change = np.full_like(compacted, np.nan)
+    change[1:] = (compacted[1:] / compacted[:-1] - 1) * 100
+    ma = RollingWindows(compacted).sma(ma_period)
+    mad = ((compacted - ma) / ma) * 100
+
+    metric_to_df = {"Close": close_df}
+    is_missing = np.isnan(values)
+
+    for metric, compacted_values in (("Change", change), ("MA", ma), ("MAD", mad)):
+        metric_values = _expand(compacted_values, order)
+        # 取引のない日は欠損値とする
+        metric_values[is_missing] = np.nan
+        metric_to_df[metric] = pd.DataFrame(metric_values, index=close_df.index, columns=close_df.columns)
+
+    panel_df = pd.concat(metric_to_df, axis=1)
+    return panel_df[panel_df.index >= pd.Timestamp(start_date)]
+
+
+def compute_panel_weekly_metrics(panel_daily_df: pd.DataFrame, start_date: datetime.date) -> pd.DataFrame:
+    """
+    複数銘柄の週次の終値と騰落率をまとめて算出する.
+
+    - compute_weekly_metrics を銘柄ごとに適用した結果と一致する.
+
+    Args:
+        panel_daily_df (pd.DataFrame): compute_panel_daily_metrics で算出した日次の指標.
+        start_date (datetime.date): フィルタリングする開始日.
+
+    Returns:
+        pd.DataFrame: 列が (指標, 銘柄) の MultiIndex の DataFrame. 指標は "Close", "Change".
+    """
+    weekly_close_df = panel_daily_df["Close"].resample("W").last()
+    weekly_change_df = weekly_close_df.pct_change() * 100
+
+    panel_df = pd.concat({"Close": weekly_close_df, "Change": weekly_change_df}, axis=1)
+    panel_df.index = panel_df.index - pd.Timedelta(days=6)
+    return panel_df[panel_df.index >= pd.Timestamp(start_date)]
+
+
+def _last_valid(values: np.ndarray) -> np.ndarray:
+    """
+    各列の最後の欠損でない値を返す.
+
+    Args:
+        values (np.ndarray): (日付 × 銘柄) の配列.
+
+    Returns:
+        np.ndarray: 各列の最後の欠損でない値 (全て欠損の列は欠損値).
+    """
+    if len(values) == 0:
+        return np.full(values.shape[1], np.nan)
+
+    positions = np.where(np.isnan(values), -1, np.arange(len(values))[:, None]).max(axis=0)
+    last_values = np.take_along_axis(values, np.clip(positions, 0, None)[None, :], axis=0)[0]
+    return np.where(positions >= 0, last_values, np.nan)
+
+
+def _compute_streaks(flags: np.ndarray) -> np.ndarray:
+    """
+    各列で条件を満たす行が連続している数を算出する.
+
+    Args:
+        flags (np.ndarray): (日付 × 銘柄) の真偽値の配列.
+
+    Returns:
+        np.ndarray: 各行の時点での連続数の配列.
+    """
+    counts = np.cumsum(flags, axis=0)
+    reset_counts = np.maximum.accumulate(np.where(flags, 0, counts), axis=0)
+    return counts - reset_counts
+
+
+def compute_panel_summary(
+    panel_daily_df: pd.DataFrame,
+    panel_weekly_df: pd.DataFrame,
+    threshold: float,
+    condition: str,
+) -> pd.DataFrame:
+    """
+    複数銘柄の指標を銘柄ごとに集計する.
+
+    Args:
+        panel_daily_df (pd.DataFrame): compute_panel_daily_metrics で算出した日次の指標.
+        panel_weekly_df (pd.DataFrame): compute_panel_weekly_metrics で算出した週次の指標.
+        threshold (float): 週次の騰落率の閾値 (%).
+        condition (str): 閾値の条件 ("上昇" または "下落").
+
+    Returns:
+        pd.DataFrame: 銘柄のシンボルをインデックスとする DataFrame. 列は以下の通り.
+            - "Close": 現在値.
+            - "Change": 期間の騰落率 (%).
+            - "MAD": 現在の移動平均乖離率 (%).
+            - "DownStreak": 現在まで連続して下落した週の数.
+            - "MaxDownStreak": 期間中に連続して下落した週の数の最大値.
+            - "ThresholdWeeks": 週次の騰落率が閾値を超えた週の数.
+    """
+    assert condition in ("上昇", "下落")
+
+    close_df = panel_daily_df["Close"]
+    close_values = close_df.to_numpy(dtype=np.float64)
+    current_prices = _last_valid(close_values)
+    base_prices = _last_valid(close_values[::-1])
+
+    weekly_changes = panel_weekly_df["Change"].reindex(columns=close_df.columns).to_numpy(dtype=np.float64)
+    down_streaks = _compute_streaks(weekly_changes < 0).astype(np.float64)
+    down_streaks[np.isnan(weekly_changes)] = np.nan
+
+    multiplier = 1 if condition == "上昇" else -1
+
+    return pd.DataFrame(
+        {
+            "Close": current_prices,
+            "Change": (current_prices - base_prices) / base_prices * 100,
+            "MAD": _last_valid(panel_daily_df["MAD"].to_numpy(dtype=np.float64)),
+            "DownStreak": _last_valid(down_streaks),
+            "MaxDownStreak": np.nanmax(down_streaks, axis=0, initial=0),
+            "ThresholdWeeks": (weekly_changes * multiplier >= threshold).sum(axis=0),
+        },
+        index=close_df.columns,
+    )
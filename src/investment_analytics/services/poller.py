@@ -0,0 +1,257 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from investment_analytics.services.market_data import INTERVAL_TO_TTL
+from investment_analytics.services.providers import get_provider
+from investment_analytics.services.realtime_snapshot import RealtimeSnapshot
+from investment_analytics.services.realtime_snapshot import fetch_realtime_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _SymbolState:
+    poll_interval: float
+    next_poll_at: float = 0.0
+    failures: int = 0
+
+
+class MarketDataPoller:
+    """
+    購読中の銘柄のリアルタイム情報をバックグラウンドで定期的に取得するポーラー.
+
+    - プロセスごとに 1 つのデーモンスレッドで動作する.
+    - セッションごとに購読する銘柄を登録し, 期限内に更新されない購読は解除する.
+    - リアルタイム情報はプロバイダごとに区別して保持し, 使用中のプロバイダのもののみを返す.
+    - 銘柄ごとの取得間隔は, 直近のリアルタイム情報の価格データの間隔に応じて決める
+      (日中の 1 分足がある銘柄は 1 分足, 日次のデータのみの銘柄は日次のキャッシュの有効期間).
+    - プロバイダへのリクエストの間隔を制限し, 失敗した銘柄は間隔を指数的に延ばす.
+
+    Attributes:
+        fetch (Callable[[str], RealtimeSnapshot]): リアルタイム情報を取得する関数.
+        interval_to_poll_interval (Mapping[str, float]):
+            価格データの間隔をキーとする取得間隔 (秒) の表. 未取得の銘柄は "1m" の取得間隔とする.
+        lease_duration (float): 購読の有効期間 (秒).
+        min_request_interval (float): プロバイダへのリクエストの最小間隔 (秒).
+        max_backoff (float): 失敗時の取得間隔の上限 (秒).
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], RealtimeSnapshot],
+        interval_to_poll_interval: Mapping[str, float] = INTERVAL_TO_TTL,
+        lease_duration: float = 120.0,
+        min_request_interval: float = 0.2,
+        max_backoff: float = 600.0,
+    ) -> None:
+        self.fetch = fetch
+        self.interval_to_poll_interval = interval_to_poll_interval
+        self.lease_duration = lease_duration
+        self.min_request_interval = min_request_interval
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._session_to_lease: dict[str, tuple[frozenset[str], float]] = {}
+        self._symbol_to_state: dict[str, _SymbolState] = {}
+        # (プロバイダの名前, シンボル) をキーとするリアルタイム情報
+        self._key_to_snapshot: dict[tuple[str, str], RealtimeSnapshot] = {}
+        self._last_request_at = 0.0
+
+    def start(self) -> None:
+        """
+        ポーリングのスレッドを開始する. 開始済みの場合は何もしない.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="market-data-poller", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        ポーリングのスレッドを停止する.
+        """
+        self._stopped.set()
+        self._wakeup.set()
+
+        if self._thread is not None:
+            self._thread.join()
+
+    def subscribe(self, session_id: str, ticker_symbols: Iterable[str]) -> None:
+        """
+        セッションが表示している銘柄を購読する. 同じセッションの以前の購読は置き換える.
+
+        Args:
+            session_id (str): セッションの ID.
+            ticker_symbols (Iterable[str]): 銘柄のシンボル.
+        """
+        with self._lock:
+            symbols = frozenset(ticker_symbols)
+            self._session_to_lease[session_id] = (symbols, time.monotonic() + self.lease_duration)
+            new_symbols = symbols - self._symbol_to_state.keys()
+            for symbol in new_symbols:
+                self._symbol_to_state[symbol] = _SymbolState(self.interval_to_poll_interval["1m"])
+
+        if new_symbols:
+            self._wakeup.set()
+
+    def unsubscribe(self, session_id: str) -> None:
+        """
+        セッションの購読を解除する.
+
+        Args:
+            session_id (str): セッションの ID.
+        """
+        with self._lock:
+            self._session_to_lease.pop(session_id, None)
+            self._prune()
+
+    def get_snapshot(self, ticker_symbol: str) -> RealtimeSnapshot | None:
+        """
+        最新のリアルタイム情報を返す. ブロックしない.
+
+        Args:
+            ticker_symbol (str): 銘柄のシンボル.
+
+        Returns:
+            RealtimeSnapshot | None: リアルタイム情報. まだ取得していない場合は None.
+        """
+        with self._lock:
+            return self._key_to_snapshot.get((get_provider().name, ticker_symbol))
+
+    def put_snapshot(self, ticker_symbol: str, snapshot: RealtimeSnapshot) -> None:
+        """
+        ポーリング以外で取得したリアルタイム情報を登録する.
+
+        Args:
+            ticker_symbol (str): 銘柄のシンボル.
+            snapshot (RealtimeSnapshot): リアルタイム情報.
+        """
+        with self._lock:
+            state = self._symbol_to_state.get(ticker_symbol)
+
+            if state is not None:
+                self._key_to_snapshot[get_provider().name, ticker_symbol] = snapshot
+                self._schedule(state, snapshot)
+
+    def _schedule(self, state: _SymbolState, snapshot: RealtimeSnapshot) -> None:
+        """
+        リアルタイム情報の価格データの間隔から次の取得時刻を決める. ロックを取得した状態で呼び出す.
+
+        Args:
+            state (_SymbolState): 銘柄の取得の状態.
+            snapshot (RealtimeSnapshot): 取得したリアルタイム情報.
+        """
+        state.poll_interval = self.interval_to_poll_interval.get(snapshot.interval, state.poll_interval)
+        state.next_poll_at = time.monotonic() + state.poll_interval
+
+    def _prune(self) -> None:
+        """
+        期限切れの購読と, どのセッションからも購読されていない銘柄, 使用中でないプロバイダのリアルタイム情報を破棄する.
+        ロックを取得した状態で呼び出す.
+        """
+        now = time.monotonic()
+        self._session_to_lease = {
+            session_id: lease for session_id, lease in self._session_to_lease.items() if lease[1] > now
+        }
+        watched_symbols = set().union(*(symbols for symbols, _ in self._session_to_lease.values()))
+
+        for symbol in list(self._symbol_to_state):
+            if symbol not in watched_symbols:
+                del self._symbol_to_state[symbol]
+
+        provider_name = get_provider().name
+        self._key_to_snapshot = {
+            key: snapshot
+            for key, snapshot in self._key_to_snapshot.items()
+            if key[0] == provider_name and key[1] in self._symbol_to_state
+        }
+
+    def _run(self) -> None:
+        """
+        ポーリングのループ.
+        """
+        while not self._stopped.is_set():
+            with self._lock:
+                self._prune()
+                now = time.monotonic()
+                due_symbols = [symbol for symbol, state in self._symbol_to_state.items() if state.next_poll_at <= now]
+                next_poll_at = min((state.next_poll_at for state in self._symbol_to_state.values()), default=None)
+
+            for symbol in due_symbols:
+                if self._stopped.is_set():
+                    return
+                self._poll(symbol)
+
+            if due_symbols:
+                continue
+
+            timeout = self.lease_duration if next_poll_at is None else max(next_poll_at - time.monotonic(), 0.0)
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+    def _poll(self, ticker_symbol: str) -> None:
+        """
+        1 銘柄のリアルタイム情報を取得して保存する.
+
+        Args:
+            ticker_symbol (str): 銘柄のシンボル.
+        """
+        # プロバイダへのリクエストの間隔を制限する
+        wait = self._last_request_at + self.min_request_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_request_at = time.monotonic()
+        provider_name = get_provider().name
+
+        try:
+            snapshot = self.fetch(ticker_symbol)
+        except Exception:
+            logger.warning("Failed to poll %s", ticker_symbol, exc_info=True)
+            snapshot = None
+
+        with self._lock:
+            state = self._symbol_to_state.get(ticker_symbol)
+
+            if state is None:
+                return
+
+            if snapshot is None:
+                state.failures += 1
+                backoff = min(state.poll_interval * 2**state.failures, self.max_backoff)
+                state.next_poll_at = time.monotonic() + backoff
+                return
+
+            state.failures = 0
+            self._schedule(state, snapshot)
+            self._key_to_snapshot[provider_name, ticker_symbol] = snapshot
+
+
+_poller_lock = threading.Lock()
+
+_poller: MarketDataPoller | None = None
+
+
+def get_poller() -> MarketDataPoller:
+    """
+    プロセス全体で共有するポーラーを返す. 初回の呼び出し時に開始する.
+
+    Returns:
+        MarketDataPoller: ポーラー.
+    """
+    global _poller
+
+    with _poller_lock:
+        if _poller is None:
+            _poller = MarketDataPoller(fetch_realtime_snapshot)
+            _poller.start()
+
+    return _poller
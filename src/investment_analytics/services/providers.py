@@ -0,0 +1,327 @@
+import datetime
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Protocol
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+PROVIDER_ENV = "INVESTMENT_ANALYTICS_PROVIDER"
+
+# 生成する日次の価格データの開始日
+SYNTHETIC_START_DATE = datetime.date(2000, 1, 1)
+
+
+class MarketDataProvider(Protocol):
+    """
+    価格データを取得するプロバイダのインターフェース.
+
+    Attributes:
+        name (str): プロバイダの名前 (保存先のディレクトリやキャッシュのキーに使う).
+    """
+
+    name: str
+
+    def history(
+        self,
+        ticker_symbol: str,
+        period: str | None = None,
+        interval: str = "1d",
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> pd.DataFrame:
+        """
+        価格データを取得する.
+
+        Args:
+            ticker_symbol (str): 銘柄のシンボル.
+            period (str | None, optional): 取得期間 (例: "max", "5d"). (Default: None)
+            interval (str, optional): データの間隔. (Default: "1d")
+            start (datetime.date | None, optional): 取得開始日 (1 分足の場合は日時も指定できる). (Default: None)
+            end (datetime.date | None, optional): 取得終了日 (この日を含まない). (Default: None)
+
+        Returns:
+            pd.DataFrame: 時刻をインデックスとする OHLCV の価格データ.
+        """
+        ...
+
+
+class YFinanceProvider:
+    """
+    yfinance から価格データを取得するプロバイダ.
+    """
+
+    name = "yfinance"
+
+    def history(
+        self,
+        ticker_symbol: str,
+        period: str | None = None,
+        interval: str = "1d",
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> pd.DataFrame:
+        """
+        yfinance の Ticker.history で価格データを取得する (引数は MarketDataProvider.history と同じ).
+        """
+        return yf.Ticker(ticker_symbol).history(period=period, interval=interval, start=start, end=end)
+
+
+def generate_ohlcv(index: pd.DatetimeIndex, volatility: float, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    幾何ブラウン運動で OHLCV の価格データを生成する.
+
+    Args:
+        index (pd.DatetimeIndex): 時刻.
+        volatility (float): 1 足あたりの対数収益率の標準偏差.
+        rng (np.random.Generator): 乱数生成器.
+
+    Returns:
+        pd.DataFrame: OHLCV の価格データ (始値の基準は 100).
+    """
+    close = 100 * np.exp(np.cumsum(rng.normal(0, volatility, len(index))))
+    open_ = np.append(100, close[:-1]) * np.exp(rng.normal(0, volatility / 4, len(index)))
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, volatility / 2, len(index))))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, volatility / 2, len(index))))
+    volume = rng.integers(1_000_000, 10_000_000, len(index))
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+
+
+class ReplayProvider:
+    """
+    記録済みまたは生成した価格データを返すプロバイダ. ネットワークに接続せずに負荷試験を実行するために使う.
+
+    - 記録のディレクトリに HistoryStore と同じ形式のファイル ("{シンボル}_{間隔}.parquet") がある場合はその内容を返す.
+    - 記録がない場合は銘柄とシードから決まる価格データを生成する (日次は 2000 年以降の営業日, 1 分足は当日の 0 時以降).
+    - 呼び出しごとに指定した遅延を入れ, 指定した割合で ConnectionError を送出する.
+    - 複数のスレッドから呼び出せる.
+
+    Attributes:
+        directory (Path | None): 記録のディレクトリ. None の場合は常に生成する.
+        latency (float): 呼び出しごとの遅延 (秒).
+        jitter (float): 遅延に加える一様乱数の上限 (秒).
+        error_rate (float): エラーを送出する割合 (0.0 - 1.0).
+        seed (int): 乱数のシード.
+    """
+
+    name = "replay"
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._interval_to_calls: Counter[str] = Counter()
+        self._num_errors = 0
+
+    def history(
+        self,
+        ticker_symbol: str,
+        period: str | None = None,
+        interval: str = "1d",
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> pd.DataFrame:
+        """
+        記録済みまたは生成した価格データを取得条件で切り出して返す (引数は MarketDataProvider.history と同じ).
+        """
+        with self._lock:
+            self._interval_to_calls[interval] += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            is_error = self._random.random() < self.error_rate
+            self._num_errors += is_error
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if is_error:
+            raise ConnectionError(f"Simulated provider error for {ticker_symbol} ({interval}).")
+
+        df = self._load(ticker_symbol, interval)
+        return _slice_by_request(df, period, start, end)
+
+    def call_counts(self) -> dict[str, int]:
+        """
+        データの間隔ごとの呼び出し回数を返す.
+
+        Returns:
+            dict[str, int]: データの間隔をキーとする呼び出し回数の辞書 (エラーを送出した呼び出しを含む).
+        """
+        with self._lock:
+            return dict(self._interval_to_calls)
+
+    @property
+    def num_errors(self) -> int:
+        """
+        エラーを送出した回数を返す.
+
+        Returns:
+            int: エラーを送出した回数.
+        """
+        with self._lock:
+            return self._num_errors
+
+    def _load(self, ticker_symbol: str, interval: str) -> pd.DataFrame:
+        """
+        記録済みの価格データを読み込む. 記録がない場合は生成する.
+
+        Args:
+            ticker_symbol (str): 銘柄のシンボル.
+            interval (str): データの間隔 ("1d" または "1m").
+
+        Returns:
+            pd.DataFrame: 全期間の価格データ.
+        """
+        if self.directory is not None:
+            path = self.directory / f"{quote(ticker_symbol, safe='')}_{interval}.parquet"
+            if path.exists():
+                return pd.read_parquet(path)
+
+        if interval == "1d":
+            return self._generate_daily(ticker_symbol)
+        if interval == "1m":
+            return self._generate_intraday(ticker_symbol)
+
+        raise ValueError(f"Interval {interval!r} is not supported by the replay provider.")
+
+    def _create_rng(self, ticker_symbol: str, *keys: int) -> np.random.Generator:
+        """
+        銘柄とシードから決まる乱数生成器を作成する.
+
+        Args:
+            ticker_symbol (str): 銘柄のシンボル.
+            *keys (int): 追加のキー.
+
+        Returns:
+            np.random.Generator: 乱数生成器.
+        """
+        return np.random.default_rng([self.seed, zlib.crc32(ticker_symbol.encode()), *keys])
+
+    def _generate_daily(self, ticker_symbol: str) -> pd.DataFrame:
+        """
+        日次の価格データを生成する.
+
+        Args:
+            ticker_symbol (str): 銘柄のシンボル.
+
+        Returns:
+            pd.DataFrame: 本日までの営業日の価格データ.
+        """
+        index = pd.bdate_range(SYNTHETIC_START_DATE, datetime.date.today(), tz="America/New_York")
+        return generate_ohlcv(index, 0.012, self._create_rng(ticker_symbol))
+
+    def _generate_intraday(self, ticker_symbol: str) -> pd.DataFrame:
+        """
+        当日の 1 分足を生成する.
+
+        Args:
+            ticker_symbol (str): 銘柄のシンボル.
+
+        Returns:
+            pd.DataFrame: 当日の 0 時 (UTC) から現在時刻までの 1 分足.
+        """
+        # 1 日分を生成してから現在時刻までを切り出し, 同じ日の足が呼び出しによらず同じ値になるようにする
+        now = pd.Timestamp.now(tz="UTC")
+        index = pd.date_range(now.floor("D"), periods=24 * 60, freq="min")
+        df = generate_ohlcv(index, 0.0005, self._create_rng(ticker_symbol, now.toordinal()))
+        df = df[df.index <= now]
+
+        # 前日までの日次の終値から続くように価格を調整する
+        daily_df = self._generate_daily(ticker_symbol)
+        previous_closes = daily_df["Close"][daily_df.index.date < now.date()]
+        scale = previous_closes.iloc[-1] / 100 if not previous_closes.empty else 1.0
+        df[["Open", "High", "Low", "Close"]] *= scale
+        return df
+
+
+def _slice_by_request(
+    df: pd.DataFrame,
+    period: str | None,
+    start: datetime.date | None,
+    end: datetime.date | None,
+) -> pd.DataFrame:
+    """
+    取得条件で価格データを切り出す.
+
+    - 期間は "max" または "{N}d" (末尾の N 日分の取引日) のみに対応する.
+
+    Args:
+        df (pd.DataFrame): 時刻順に並んだ価格データ.
+        period (str | None): 取得期間.
+        start (datetime.date | None): 取得開始日 (日時も指定できる).
+        end (datetime.date | None): 取得終了日 (この日を含まない).
+
+    Returns:
+        pd.DataFrame: 切り出した価格データ.
+    """
+    if df.empty:
+        return df
+
+    if period is not None and period != "max":
+        if not period.endswith("d"):
+            raise ValueError(f"Period {period!r} is not supported by the replay provider.")
+        dates = df.index.normalize().unique()
+        return df[df.index >= dates[-int(period[:-1]) :][0]]
+
+    tz = df.index.tz
+    if start is not None:
+        start_timestamp = pd.Timestamp(start)
+        start_timestamp = start_timestamp.tz_convert(tz) if start_timestamp.tz else start_timestamp.tz_localize(tz)
+        df = df[df.index >= start_timestamp]
+    if end is not None:
+        df = df[df.index < pd.Timestamp(end).tz_localize(tz)]
+
+    return df
+
+
+def _create_default_provider() -> MarketDataProvider:
+    """
+    環境変数で指定されたプロバイダを作成する.
+
+    Returns:
+        MarketDataProvider: "replay" の場合は ReplayProvider, それ以外は YFinanceProvider.
+    """
+    if os.environ.get(PROVIDER_ENV, "") == "replay":
+        return ReplayProvider()
+    return YFinanceProvider()
+
+
+_provider: MarketDataProvider = _create_default_provider()
+
+
+def get_provider() -> MarketDataProvider:
+    """
+    プロセス全体で使うプロバイダを返す.
+
+    Returns:
+        MarketDataProvider: プロバイダ.
+    """
+    return _provider
+
+
+def set_provider(provider: MarketDataProvider) -> None:
+    """
+    プロセス全体で使うプロバイダを切り替える. 取得済みのキャッシュは破棄しない.
+
+    Args:
+        provider (MarketDataProvider): プロバイダ.
+    """
+    global _provider
+    _provider = provider
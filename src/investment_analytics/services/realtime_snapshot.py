@@ -0,0 +1,123 @@
+import datetime
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pandas as pd
+
+from investment_analytics.services.analysis import compute_intraday_change
+from investment_analytics.services.analysis import compute_realtime_change
+from investment_analytics.services.market_data import MAX_FETCH_WORKERS
+from investment_analytics.services.market_data import fetch_history
+from investment_analytics.services.market_data import fetch_intraday
+from investment_analytics.services.metrics import count
+from investment_analytics.services.metrics import map_in_threads
+from investment_analytics.services.providers import get_provider
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RealtimeSnapshot:
+    """
+    銘柄のリアルタイム情報を表すデータクラス.
+
+    Attributes:
+        current_price (float): 現在値.
+        previous_price (float): 前日終値.
+        change (float): 前日比 (%).
+        intraday_df (pd.DataFrame): 日中の価格データ.
+        interval (str): 現在値の算出に使った価格データの間隔 ("1m" または "1d").
+    """
+
+    current_price: float
+    previous_price: float
+    change: float
+    intraday_df: pd.DataFrame
+    interval: str
+
+
+@functools.lru_cache(maxsize=256)
+def _fetch_previous_close(provider_name: str, ticker_symbol: str, session_date: datetime.date) -> float:
+    """
+    取引日の前日終値を取得する.
+
+    - 前日終値は取引日の間は変わらないため, プロバイダ・取引日ごとに 1 回だけ取得する.
+
+    Args:
+        provider_name (str): 使用中のプロバイダの名前 (キャッシュをプロバイダごとに区別するために使う).
+        ticker_symbol (str): 銘柄のシンボル.
+        session_date (datetime.date): 取引日.
+
+    Returns:
+        float: 前日終値.
+
+    Raises:
+        ValueError: 取引日より前の日次の価格データがない場合.
+    """
+    bars = fetch_history(ticker_symbol, period="5d")
+    previous_closes = bars.close[bars.index.date < session_date]
+
+    if len(previous_closes) == 0:
+        raise ValueError(f"No daily bar before {session_date} for {ticker_symbol}.")
+
+    return float(previous_closes[-1])
+
+
+def fetch_realtime_snapshot(ticker_symbol: str) -> RealtimeSnapshot:
+    """
+    銘柄のリアルタイム情報を取得する.
+
+    - 日中の価格データは銘柄ごとのバッファから取得し, 新しい足のみを追加で取得する.
+    - 日中の価格データから現在値を算出し, 前日終値は取引日ごとのキャッシュから取得する.
+    - 日中の価格データがない場合は日次の価格データから算出する.
+
+    Args:
+        ticker_symbol (str): 銘柄のシンボル.
+
+    Returns:
+        RealtimeSnapshot: リアルタイム情報.
+    """
+    intraday_df = fetch_intraday(ticker_symbol)
+
+    if intraday_df.empty:
+        daily_df = fetch_history(ticker_symbol, period="3d").to_frame()
+        current_price, previous_price, change = compute_realtime_change(daily_df)
+        return RealtimeSnapshot(current_price, previous_price, change, intraday_df, "1d")
+
+    previous_price = _fetch_previous_close(get_provider().name, ticker_symbol, intraday_df.index[-1].date())
+    current_price, change = compute_intraday_change(intraday_df, previous_price)
+    return RealtimeSnapshot(current_price, previous_price, change, intraday_df, "1m")
+
+
+def fetch_realtime_snapshots(ticker_symbols: list[str]) -> dict[str, RealtimeSnapshot]:
+    """
+    複数銘柄のリアルタイム情報を並列に取得する.
+
+    - 取得に失敗した銘柄はログに記録して結果から除き, 他の銘柄の結果は返す.
+
+    Args:
+        ticker_symbols (list[str]): 銘柄のシンボルのリスト.
+
+    Returns:
+        dict[str, RealtimeSnapshot]: 取得に成功した銘柄のシンボルをキーとするリアルタイム情報の辞書.
+    """
+    unique_symbols = list(dict.fromkeys(ticker_symbols))
+
+    if not unique_symbols:
+        return {}
+
+    def fetch(ticker_symbol: str) -> RealtimeSnapshot | None:
+        try:
+            return fetch_realtime_snapshot(ticker_symbol)
+        except Exception:
+            logger.warning("Failed to fetch realtime snapshot for %s", ticker_symbol, exc_info=True)
+            count("realtime_snapshot.errors")
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(unique_symbols))) as executor:
+        snapshots = map_in_threads(executor, fetch, unique_symbols)
+        return {
+            symbol: snapshot for symbol, snapshot in zip(unique_symbols, snapshots, strict=True) if snapshot is not None
+        }
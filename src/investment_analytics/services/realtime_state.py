@@ -2,7 +2,7 @@ import uuid
 
 import streamlit as st
 
-from investment_analytics.models.ticker import NAME_TO_TICKER
+from investment_analytics.models.ticker import get_ticker_registry
 
 DEFAULT_TICKER_SYMBOLS = [
     "^GSPC",
@@ -38,9 +38,17 @@ def update_ticker_data(id: str, key: str) -> None:
         id (str): 変更対象のカード ID.
         key (str): 銘柄名が保存されているセッションステートのキー.
     """
+    registry = get_ticker_registry()
     ticker_name = st.session_state[key]
-    ticker_symbol = NAME_TO_TICKER[ticker_name].symbol
-    st.session_state["realtime_ticker_data"][id] = ticker_symbol
+    ticker = registry.resolve(ticker_name)
+
+    # 入力した文字列に合う銘柄がない場合は変更しない
+    if ticker is not None:
+        st.session_state["realtime_ticker_data"][id] = ticker.symbol
+
+    # 入力した文字列は破棄し, 次の再実行でカードの銘柄を選択した状態で表示する
+    if ticker is None or registry.name(ticker.symbol) != ticker_name:
+        del st.session_state[key]
 
 
 def move_ticker_data(id: str, direction: str) -> None:
@@ -81,3 +89,15 @@ def init_ticker_data() -> None:
         st.session_state["realtime_ticker_data"] = {}
         for ticker_symbol in DEFAULT_TICKER_SYMBOLS:
             append_ticker_data(ticker_symbol)
+
+
+def get_session_id() -> str:
+    """
+    リアルタイム情報の購読に使うセッションの ID を返す. 初回の呼び出し時に生成する.
+
+    Returns:
+        str: セッションの ID.
+    """
+    if "realtime_session_id" not in st.session_state:
+        st.session_state["realtime_session_id"] = str(uuid.uuid4())
+    return st.session_state["realtime_session_id"]
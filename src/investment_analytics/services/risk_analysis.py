@@ -0,0 +1,182 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+RETURN_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass(frozen=True)
+class DrawdownSummary:
+    """
+    期間中のドローダウンの集計結果を表すデータクラス.
+
+    - ドローダウンは期間の開始以降の最高値からの下落率 (%) とし, 0 以下の値をとる.
+    - 水面下の期間は最高値を付けた日から最高値を更新した日 (更新していない場合は期間の最終日) までの日数とする.
+
+    Attributes:
+        max_drawdown (float): 最大ドローダウン (%).
+        peak_date (pd.Timestamp): 最大ドローダウンの起点となった最高値の日付.
+        trough_date (pd.Timestamp): 最大ドローダウンの底の日付.
+        recovery_date (pd.Timestamp | None): 最高値を回復した日付. 回復していない場合は None.
+        current_drawdown (float): 現在のドローダウン (%).
+        current_peak_date (pd.Timestamp): 現在のドローダウンの起点となった最高値の日付.
+        current_underwater_days (int): 現在の水面下の期間 (日数). 最高値を更新中の場合は 0.
+        longest_underwater_days (int): 最長の水面下の期間 (日数).
+        longest_underwater_start (pd.Timestamp): 最長の水面下の期間の開始日.
+        longest_underwater_end (pd.Timestamp): 最長の水面下の期間の終了日 (回復していない場合は期間の最終日).
+    """
+
+    max_drawdown: float
+    peak_date: pd.Timestamp
+    trough_date: pd.Timestamp
+    recovery_date: pd.Timestamp | None
+    current_drawdown: float
+    current_peak_date: pd.Timestamp
+    current_underwater_days: int
+    longest_underwater_days: int
+    longest_underwater_start: pd.Timestamp
+    longest_underwater_end: pd.Timestamp
+
+
+@dataclass(frozen=True)
+class ReturnDistribution:
+    """
+    一定期間ごとの騰落率の分布を表すデータクラス.
+
+    Attributes:
+        window (int): 騰落率を算出する期間 (足の数).
+        count (int): 騰落率の標本数.
+        mean (float): 平均 (%).
+        positive_ratio (float): 騰落率が正の割合 (0.0 - 1.0).
+        percentiles (dict[int, float]): パーセンタイルをキーとする騰落率 (%) の辞書.
+        bin_edges (np.ndarray): ヒストグラムの階級の境界 (%).
+        counts (np.ndarray): ヒストグラムの各階級の度数.
+    """
+
+    window: int
+    count: int
+    mean: float
+    positive_ratio: float
+    percentiles: dict[int, float]
+    bin_edges: np.ndarray
+    counts: np.ndarray
+
+
+def compute_drawdowns(closes: np.ndarray) -> np.ndarray:
+    """
+    各時点のドローダウン (それまでの最高値からの下落率) を算出する.
+
+    Args:
+        closes (np.ndarray): 時系列の昇順に並んだ, 欠損値を含まない終値.
+
+    Returns:
+        np.ndarray: ドローダウン (%).
+    """
+    return (closes / np.maximum.accumulate(closes) - 1) * 100
+
+
+def compute_drawdown_summary(daily_df: pd.DataFrame, drawdowns: np.ndarray | None = None) -> DrawdownSummary:
+    """
+    日次の価格データから最大ドローダウン・現在のドローダウン・水面下の期間を算出する.
+
+    - 最高値を付けた位置を累積最大で求め, ループを使わずに算出する.
+
+    Args:
+        daily_df (pd.DataFrame): 時刻の昇順に並んだ, 終値に欠損値を含まない日次の価格データ.
+        drawdowns (np.ndarray | None, optional): compute_drawdowns で算出したドローダウン. (Default: None)
+
+    Returns:
+        DrawdownSummary: 集計結果.
+    """
+    index = pd.DatetimeIndex(daily_df.index)
+    closes = daily_df["Close"].to_numpy(dtype=np.float64)
+
+    if drawdowns is None:
+        drawdowns = compute_drawdowns(closes)
+
+    # 最高値を更新した (または並んだ) 位置と, 各時点で直近に最高値を付けた位置
+    positions = np.arange(len(closes))
+    is_peak = drawdowns >= 0
+    peak_positions = np.maximum.accumulate(np.where(is_peak, positions, 0))
+
+    trough_position = int(np.argmin(drawdowns))
+    peak_position = int(peak_positions[trough_position])
+    recovery_positions = np.flatnonzero(is_peak[trough_position:])
+    recovery_date = index[trough_position + recovery_positions[0]] if len(recovery_positions) else None
+
+    # 水面下の期間は最高値の位置から次の最高値の位置 (最後は期間の最終日) まで
+    peaks = np.flatnonzero(is_peak)
+    next_peaks = np.append(peaks[1:], len(closes))
+    ends = np.minimum(next_peaks, len(closes) - 1)
+    days = np.asarray((index[ends] - index[peaks]).days, dtype=np.int64)
+    days[next_peaks - peaks <= 1] = 0
+    longest = int(np.argmax(days))
+
+    current_peak_position = int(peak_positions[-1])
+
+    return DrawdownSummary(
+        max_drawdown=float(drawdowns[trough_position]),
+        peak_date=index[peak_position],
+        trough_date=index[trough_position],
+        recovery_date=recovery_date,
+        current_drawdown=float(drawdowns[-1]),
+        current_peak_date=index[current_peak_position],
+        current_underwater_days=(index[-1] - index[current_peak_position]).days,
+        longest_underwater_days=int(days[longest]),
+        longest_underwater_start=index[peaks[longest]],
+        longest_underwater_end=index[ends[longest]],
+    )
+
+
+def compute_rolling_returns(closes: np.ndarray, window: int) -> np.ndarray:
+    """
+    一定期間ごとの騰落率を算出する (期間をずらしながら重複して算出する).
+
+    - 期間の始点と終点の終値は同じ配列のずらした位置を参照して算出し, 欠損値を含む期間は除く.
+
+    Args:
+        closes (np.ndarray): 時系列の昇順に並んだ終値.
+        window (int): 期間 (足の数).
+
+    Returns:
+        np.ndarray: 騰落率 (%). 標本がない場合は空の配列.
+    """
+    if not 0 < window < len(closes):
+        return np.empty(0)
+
+    returns = (closes[window:] / closes[:-window] - 1) * 100
+    return returns[~np.isnan(returns)]
+
+
+def compute_return_distribution(closes: np.ndarray, window: int, num_bins: int = 50) -> ReturnDistribution | None:
+    """
+    一定期間ごとの騰落率の分布 (ヒストグラムとパーセンタイル) を算出する.
+
+    Args:
+        closes (np.ndarray): 時系列の昇順に並んだ終値 (日次または週次).
+        window (int): 期間 (足の数).
+        num_bins (int, optional): ヒストグラムの階級の数. (Default: 50)
+
+    Returns:
+        ReturnDistribution | None: 分布. 標本がない場合は None.
+    """
+    returns = compute_rolling_returns(closes, window)
+
+    if len(returns) == 0:
+        return None
+
+    counts, bin_edges = np.histogram(returns, bins=num_bins)
+    percentiles = np.percentile(returns, RETURN_PERCENTILES)
+
+    return ReturnDistribution(
+        window=window,
+        count=len(returns),
+        mean=float(returns.mean()),
+        positive_ratio=float((returns > 0).mean()),
+        percentiles={
+            percentile: float(value) for percentile, value in zip(RETURN_PERCENTILES, percentiles, strict=True)
+        },
+        bin_edges=bin_edges,
+        counts=counts,
+    )
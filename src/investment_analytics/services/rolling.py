@@ -0,0 +1,139 @@
+import copy
+from typing import Self
+
+import numpy as np
+import pandas as pd
+
+MOVING_AVERAGE_KINDS = ("SMA", "EMA")
+
+
+def _accumulate(
+    values: np.ndarray,
+    initial_cumsum: np.ndarray,
+    initial_missing_counts: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    初期値から続けて値の累積和と欠損値の累積数を算出する.
+
+    - 累積和は先頭から順に加算するため, 途中から続けて算出しても全体で算出した場合と一致する.
+
+    Args:
+        values (np.ndarray): 時系列の昇順に並んだ値.
+        initial_cumsum (np.ndarray): 累積和の初期値 (形状は (1, ...)).
+        initial_missing_counts (np.ndarray): 欠損値の累積数の初期値 (形状は (1, ...)).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: 初期値を先頭に含む累積和, 欠損値の累積数.
+    """
+    is_missing = np.isnan(values)
+    cumsum = np.cumsum(np.concatenate([initial_cumsum, np.where(is_missing, 0.0, values)]), axis=0)
+    missing_counts = np.cumsum(np.concatenate([initial_missing_counts, is_missing]), axis=0)
+    return cumsum, missing_counts
+
+
+class RollingWindows:
+    """
+    1 つの系列 (または列ごとの系列) から任意の期間の移動平均を算出するクラス.
+
+    - 累積和を初期化時に 1 回だけ算出し, 単純移動平均は累積和の差分から O(n) で算出する.
+    - 欠損値を含む期間の単純移動平均は欠損値とする (pandas の rolling と同じ).
+    - 算出した移動平均は期間ごとに保持し, 同じ期間は再計算しない.
+    - 系列の途中以降が変わった場合は updated で累積和の変わらない部分を再利用する.
+
+    Attributes:
+        values (np.ndarray): 時系列の昇順に並んだ値 (1 次元, または行を時系列とする 2 次元の配列).
+    """
+
+    def __init__(self, values: np.ndarray) -> None:
+        self.values = np.asarray(values, dtype=np.float64)
+        initial_shape = (1, *self.values.shape[1:])
+        self._cumsum, self._missing_counts = _accumulate(
+            self.values, np.zeros(initial_shape), np.zeros(initial_shape, dtype=np.intp)
+        )
+        self._window_to_sma: dict[int, np.ndarray] = {}
+        self._span_to_ema: dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def updated(self, values: np.ndarray, position: int) -> Self:
+        """
+        先頭から position 個の値が変わらない新しい系列の RollingWindows を返す.
+
+        - 累積和は position までを再利用し, 以降の値のみを続けて足し合わせる (全体で算出した場合と一致する).
+        - 元の RollingWindows は変更しない (算出済みの移動平均は引き継がない).
+
+        Args:
+            values (np.ndarray): 新しい系列.
+            position (int): 最初に値が変わった位置.
+
+        Returns:
+            RollingWindows: 新しい系列の RollingWindows.
+        """
+        rolling = copy.copy(self)
+        rolling.values = np.asarray(values, dtype=np.float64)
+        cumsum, missing_counts = _accumulate(
+            rolling.values[position:],
+            self._cumsum[position : position + 1],
+            self._missing_counts[position : position + 1],
+        )
+        rolling._cumsum = np.concatenate([self._cumsum[:position], cumsum])
+        rolling._missing_counts = np.concatenate([self._missing_counts[:position], missing_counts])
+        rolling._window_to_sma = {}
+        rolling._span_to_ema = {}
+        return rolling
+
+    def sma(self, window: int) -> np.ndarray:
+        """
+        単純移動平均を返す.
+
+        Args:
+            window (int): 期間.
+
+        Returns:
+            np.ndarray: 単純移動平均 (期間に満たない先頭の値は欠損値). 読み取り専用の配列.
+        """
+        if window not in self._window_to_sma:
+            sma = np.full_like(self.values, np.nan)
+
+            if 0 < window <= len(self.values):
+                sums = self._cumsum[window:] - self._cumsum[:-window]
+                missing_counts = self._missing_counts[window:] - self._missing_counts[:-window]
+                sma[window - 1 :] = np.where(missing_counts == 0, sums / window, np.nan)
+
+            sma.setflags(write=False)
+            self._window_to_sma[window] = sma
+
+        return self._window_to_sma[window]
+
+    def ema(self, span: int) -> np.ndarray:
+        """
+        指数移動平均を返す.
+
+        Args:
+            span (int): 期間 (平滑化係数は 2 / (span + 1)).
+
+        Returns:
+            np.ndarray: 指数移動平均 (期間に満たない先頭の値は欠損値). 読み取り専用の配列.
+        """
+        if span not in self._span_to_ema:
+            frame = pd.DataFrame(self.values.reshape(len(self.values), -1))
+            ema = frame.ewm(span=span, adjust=False, min_periods=span).mean().to_numpy().reshape(self.values.shape)
+            ema.setflags(write=False)
+            self._span_to_ema[span] = ema
+
+        return self._span_to_ema[span]
+
+    def moving_average(self, kind: str, window: int) -> np.ndarray:
+        """
+        種類を指定して移動平均を返す.
+
+        Args:
+            kind (str): 移動平均の種類 ("SMA" または "EMA").
+            window (int): 期間.
+
+        Returns:
+            np.ndarray: 移動平均. 読み取り専用の配列.
+        """
+        assert kind in MOVING_AVERAGE_KINDS
+        return self.sma(window) if kind == "SMA" else self.ema(window)
@@ -0,0 +1,60 @@
+import logging
+import time
+from collections.abc import Callable
+from collections.abc import Hashable
+
+import streamlit as st
+
+from investment_analytics.services.metrics import count
+from investment_analytics.services.metrics import span
+
+logger = logging.getLogger(__name__)
+
+
+def reset_stage_report() -> None:
+    """
+    ステージのヒット・ミスの記録をリセットする. 再実行の開始時に呼び出す.
+    """
+    st.session_state["stage_report"] = {}
+
+
+def get_stage_report() -> dict[str, bool]:
+    """
+    直近の再実行における各ステージのヒット・ミスを返す.
+
+    Returns:
+        dict[str, bool]: ステージ名をキーとし, ヒットした場合に True となる辞書.
+    """
+    return dict(st.session_state.get("stage_report", {}))
+
+
+def run_stage[T](name: str, key: Hashable, compute: Callable[[], T], ttl: float | None = None) -> T:
+    """
+    処理のステージをセッション内でメモ化して実行する.
+
+    - ステージごとに直近のキーと結果を 1 件だけ保持する.
+    - キーが一致し, 有効期間内であれば保持している結果を返す.
+
+    Args:
+        name (str): ステージ名.
+        key (Hashable): ステージの入力を表すキー.
+        compute (Callable[[], T]): 結果を算出する関数.
+        ttl (float | None, optional): 有効期間 (秒). None の場合は無期限. (Default: None)
+
+    Returns:
+        T: ステージの結果.
+    """
+    stage_to_entry = st.session_state.setdefault("stage_cache", {})
+    entry = stage_to_entry.get(name)
+
+    hit = entry is not None and entry[0] == key and (ttl is None or time.monotonic() - entry[2] < ttl)
+
+    if not hit:
+        with span(f"stage.{name}"):
+            entry = (key, compute(), time.monotonic())
+        stage_to_entry[name] = entry
+
+    count("stage.hits" if hit else "stage.misses")
+    st.session_state.setdefault("stage_report", {})[name] = hit
+    logger.debug("stage %s: %s", name, "hit" if hit else "miss")
+    return entry[1]
@@ -0,0 +1,197 @@
+import datetime
+import importlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from dataclasses import field
+
+from investment_analytics.services.metrics import record
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENV = "INVESTMENT_ANALYTICS_WARMUP"
+
+WARMUP_SYMBOLS_ENV = "INVESTMENT_ANALYTICS_WARMUP_SYMBOLS"
+
+# 価格データを先に取得する銘柄数の上限 (銘柄の一覧が大きい場合にプロバイダへの要求が膨らまないようにする)
+MAX_WARMUP_SYMBOLS = 50
+
+# 各ページで最初に必要になるモジュール (バックグラウンドで読み込んでおく)
+WARMUP_MODULES = (
+    "pandas",
+    "yfinance",
+    "streamlit_echarts",
+    "investment_analytics.components.charts",
+    "investment_analytics.components.styles",
+    "investment_analytics.services.incremental_metrics",
+    "investment_analytics.services.panel_analysis",
+    "investment_analytics.services.poller",
+    "investment_analytics.services.realtime_snapshot",
+)
+
+# 時系列分析・スクリーニングの「期間」で先に取得しておく年数
+WARMUP_HISTORY_YEARS = (1, 5, 10)
+
+
+@dataclass
+class WarmupReport:
+    """
+    ウォームアップの実行結果を表すデータクラス.
+
+    Attributes:
+        started_at (datetime.datetime | None): 開始日時. 開始前は None.
+        phase_to_seconds (dict[str, float]): 段階 ("import", "realtime", "history") ごとの実行時間 (秒).
+        errors (list[str]): 失敗した段階のエラーメッセージ.
+        finished (bool): 全ての段階が終了した場合は True.
+    """
+
+    started_at: datetime.datetime | None = None
+    phase_to_seconds: dict[str, float] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)
+    finished: bool = False
+
+
+_lock = threading.Lock()
+
+_thread: threading.Thread | None = None
+
+_report = WarmupReport()
+
+
+def is_warmup_enabled() -> bool:
+    """
+    環境変数でウォームアップが有効になっているかどうかを返す.
+
+    Returns:
+        bool: 有効な場合は True.
+    """
+    return os.environ.get(WARMUP_ENV, "") not in ("", "0", "false")
+
+
+def get_warmup_symbols() -> list[str]:
+    """
+    価格データを先に取得する銘柄のシンボルを返す.
+
+    - 環境変数 INVESTMENT_ANALYTICS_WARMUP_SYMBOLS にカンマ区切りで指定した場合はその銘柄とする.
+    - 指定しない場合はリアルタイム分析の初期表示の銘柄とする.
+    - 銘柄の一覧にない銘柄は除き, 先頭から上限の数までとする.
+
+    Returns:
+        list[str]: 銘柄のシンボルのリスト.
+    """
+    from investment_analytics.models.ticker import get_ticker_registry
+    from investment_analytics.services.realtime_state import DEFAULT_TICKER_SYMBOLS
+
+    value = os.environ.get(WARMUP_SYMBOLS_ENV, "")
+    symbols = [symbol.strip() for symbol in value.split(",")] if value else DEFAULT_TICKER_SYMBOLS
+    registry = get_ticker_registry()
+    return [symbol for symbol in dict.fromkeys(symbols) if symbol in registry][:MAX_WARMUP_SYMBOLS]
+
+
+def _import_modules() -> None:
+    """
+    各ページで最初に必要になるモジュールを読み込む.
+    """
+    for module in WARMUP_MODULES:
+        importlib.import_module(module)
+
+
+def _warm_up_realtime() -> None:
+    """
+    リアルタイム分析の初期表示の銘柄のリアルタイム情報を取得する.
+    """
+    from investment_analytics.services.realtime_snapshot import fetch_realtime_snapshots
+    from investment_analytics.services.realtime_state import DEFAULT_TICKER_SYMBOLS
+
+    fetch_realtime_snapshots(DEFAULT_TICKER_SYMBOLS)
+
+
+def _warm_up_history() -> None:
+    """
+    ウォームアップの対象の銘柄の価格データを時系列分析・スクリーニングと同じ取得条件で取得する.
+    """
+    from dateutil.relativedelta import relativedelta
+
+    from investment_analytics.services.market_data import HISTORY_LOOKBACK
+    from investment_analytics.services.market_data import HistoryRequest
+    from investment_analytics.services.market_data import fetch_history_batch
+
+    today = datetime.date.today()
+    end_date = today + datetime.timedelta(days=1)
+    requests = [
+        HistoryRequest(symbol, start=today - relativedelta(years=years) - HISTORY_LOOKBACK, end=end_date)
+        for years in WARMUP_HISTORY_YEARS
+        for symbol in get_warmup_symbols()
+    ]
+    fetch_history_batch(requests)
+
+
+def run_warmup(report: WarmupReport | None = None) -> WarmupReport:
+    """
+    データ処理のモジュールを読み込み, よく使われる価格データを取得してキャッシュに保持する.
+
+    - モジュールの読み込み, リアルタイム情報, 価格データの順に実行し, 段階ごとの実行時間を記録する.
+    - 失敗した段階はエラーを記録して次の段階に進む (表示時に改めて取得する).
+
+    Args:
+        report (WarmupReport | None, optional): 結果を書き込む WarmupReport. (Default: None)
+
+    Returns:
+        WarmupReport: 実行結果.
+    """
+    report = report if report is not None else WarmupReport()
+    report.started_at = datetime.datetime.now(datetime.UTC)
+
+    phases = [("import", _import_modules), ("realtime", _warm_up_realtime), ("history", _warm_up_history)]
+
+    with record("warmup"):
+        for phase, run in phases:
+            started_at = time.perf_counter()
+
+            try:
+                run()
+            except Exception as e:
+                logger.warning("Warm-up phase %s failed", phase, exc_info=True)
+                report.errors.append(f"{phase}: {e}")
+
+            report.phase_to_seconds[phase] = time.perf_counter() - started_at
+
+    report.finished = True
+    logger.info(
+        "Warm-up finished: %s", {phase: round(seconds, 3) for phase, seconds in report.phase_to_seconds.items()}
+    )
+    return report
+
+
+def start_warmup() -> bool:
+    """
+    ウォームアップをバックグラウンドのデーモンスレッドで開始する.
+
+    - 環境変数で有効な場合のみ開始し, プロセスごとに 1 回だけ実行する.
+
+    Returns:
+        bool: このプロセスでウォームアップを開始済みの場合は True.
+    """
+    global _thread
+
+    if not is_warmup_enabled():
+        return False
+
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=run_warmup, args=(_report,), name="warmup", daemon=True)
+            _thread.start()
+
+    return True
+
+
+def get_warmup_report() -> WarmupReport:
+    """
+    このプロセスで開始したウォームアップの実行結果を返す.
+
+    Returns:
+        WarmupReport: 実行結果 (実行中の場合は終了した段階まで).
+    """
+    return _report
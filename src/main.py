@@ -1,13 +1,31 @@
 import streamlit as st
 
+from investment_analytics.services.metrics import record
+from investment_analytics.services.warmup import get_warmup_report
+from investment_analytics.services.warmup import start_warmup
+
+# ナビゲーションではデータ処理のモジュール (pandas, yfinance など) を読み込まず, 各ページの実行時に読み込む
 pages = [
     st.Page("investment_analytics/pages/top.py", title="トップ", icon=":material/home:"),
     st.Page("investment_analytics/pages/realtime.py", title="リアルタイム分析", icon=":material/show_chart:"),
     st.Page("investment_analytics/pages/history.py", title="時系列分析", icon=":material/finance:"),
+    st.Page("investment_analytics/pages/screener.py", title="スクリーニング", icon=":material/leaderboard:"),
 ]
 
 page = st.navigation(pages)
 
 st.set_page_config(layout="wide")
 
-page.run()
+# 有効な場合はプロセスごとに 1 回だけ, モジュールの読み込みと価格データの取得をバックグラウンドで開始する
+start_warmup()
+
+# 計測が有効な場合は再実行ごとに区間とカウンタを記録し, サイドバーに表示する
+with record(page.title) as recorder:
+    page.run()
+
+if recorder is not None:
+    from investment_analytics.components.metrics_panel import render_metrics_panel
+    from investment_analytics.services.market_data import history_cache
+    from investment_analytics.services.stage_cache import get_stage_report
+
+    render_metrics_panel(recorder, history_cache.stats(), get_stage_report(), get_warmup_report())
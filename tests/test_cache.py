@@ -0,0 +1,103 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from investment_analytics.services import cache
+from investment_analytics.services.cache import TTLCache
+
+NUM_THREADS = 8
+
+
+def _wait_for_coalesced(ttl_cache: TTLCache, num_waiters: int) -> None:
+    deadline = time.monotonic() + 5
+    while ttl_cache.stats().coalesced < num_waiters:
+        assert time.monotonic() < deadline, "waiters did not join the running load"
+        time.sleep(0.001)
+
+
+def test_concurrent_loads_run_loader_once():
+    ttl_cache: TTLCache[str] = TTLCache(max_bytes=100, sizeof=len)
+    release = threading.Event()
+    calls = []
+
+    def loader() -> str:
+        calls.append(None)
+        release.wait(5)
+        return "value"
+
+    with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
+        futures = [executor.submit(ttl_cache.get_or_load, "key", None, loader) for _ in range(NUM_THREADS)]
+        _wait_for_coalesced(ttl_cache, NUM_THREADS - 1)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == ["value"] * NUM_THREADS
+    assert len(calls) == 1
+    assert ttl_cache.stats().misses == 1
+    assert ttl_cache.get_or_load("key", None, lambda: "other") == "value"
+
+
+def test_failed_load_is_shared_and_not_cached():
+    ttl_cache: TTLCache[str] = TTLCache(max_bytes=100, sizeof=len)
+    release = threading.Event()
+
+    def loader() -> str:
+        release.wait(5)
+        raise ConnectionError("failed")
+
+    with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
+        futures = [executor.submit(ttl_cache.get_or_load, "key", None, loader) for _ in range(NUM_THREADS)]
+        _wait_for_coalesced(ttl_cache, NUM_THREADS - 1)
+        release.set()
+
+        for future in futures:
+            with pytest.raises(ConnectionError):
+                future.result()
+
+    assert ttl_cache.stats().entries == 0
+    assert ttl_cache.get_or_load("key", None, lambda: "value") == "value"
+
+
+def test_expired_entry_is_reloaded(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    ttl_cache: TTLCache[str] = TTLCache(max_bytes=100, sizeof=len)
+
+    assert ttl_cache.get_or_load("key", 10, lambda: "old") == "old"
+    now += 9
+    assert ttl_cache.get_or_load("key", 10, lambda: "new") == "old"
+    now += 1
+    assert ttl_cache.get_or_load("key", 10, lambda: "new") == "new"
+
+    stats = ttl_cache.stats()
+    assert (stats.hits, stats.misses, stats.entries, stats.size_bytes) == (1, 2, 1, 3)
+
+
+def test_least_recently_used_entries_are_evicted_by_size():
+    ttl_cache: TTLCache[str] = TTLCache(max_bytes=10, sizeof=len)
+
+    ttl_cache.get_or_load("a", None, lambda: "aaaa")
+    ttl_cache.get_or_load("b", None, lambda: "bbb")
+    ttl_cache.get_or_load("c", None, lambda: "ccc")
+
+    # a を使うと b が最も古く使われたエントリになる
+    ttl_cache.get_or_load("a", None, lambda: "unused")
+    ttl_cache.get_or_load("d", None, lambda: "dd")
+
+    assert ttl_cache.get_or_load("a", None, lambda: "reloaded") == "aaaa"
+    assert ttl_cache.get_or_load("c", None, lambda: "reloaded") == "ccc"
+    assert ttl_cache.get_or_load("d", None, lambda: "reloaded") == "dd"
+    assert ttl_cache.get_or_load("b", None, lambda: "BBB") == "BBB"
+
+    stats = ttl_cache.stats()
+    assert stats.size_bytes <= 10
+    assert stats.evictions == 2
+
+
+def test_value_larger_than_budget_is_not_stored():
+    ttl_cache: TTLCache[str] = TTLCache(max_bytes=3, sizeof=len)
+
+    assert ttl_cache.get_or_load("key", None, lambda: "large") == "large"
+    assert ttl_cache.stats().entries == 0
@@ -0,0 +1,28 @@
+import base64
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from investment_analytics.components.charts import create_history_base_options
+
+
+def _decode_prices(encoded: str, dtype: str) -> np.ndarray:
+    """
+    チャートの HTML 側 (decodePrices) と同様に価格を展開する.
+    """
+    return np.round(np.frombuffer(base64.b64decode(encoded), dtype=dtype).astype(np.float64), 2)
+
+
+@pytest.mark.parametrize("base_price", [123.45, 15_012_345.67])
+def test_prices_round_trip_to_cents(base_price):
+    index = pd.bdate_range("2024-01-01", periods=100)
+    closes = np.round(base_price + np.arange(100) * 0.01, 2)
+    moving_average = np.round(closes - 0.05, 2)
+    daily_df = pd.DataFrame({"Close": closes}, index=index)
+
+    options = create_history_base_options(daily_df, "green", moving_averages={"MA": moving_average})
+    payload = options["payload"]
+
+    np.testing.assert_array_equal(_decode_prices(payload["close"], payload["priceDtype"]), closes)
+    np.testing.assert_array_equal(_decode_prices(payload["lines"][0], payload["priceDtype"]), moving_average)
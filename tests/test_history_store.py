@@ -0,0 +1,107 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from investment_analytics.services.history_store import HistoryStore
+
+
+class FakeProvider:
+    """
+    保持している価格データを取得条件で切り出して返すプロバイダ.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+        self.calls: list[dict] = []
+
+    def __call__(
+        self,
+        ticker_symbol: str,
+        period: str | None = None,
+        interval: str = "1d",
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> pd.DataFrame:
+        self.calls.append({"period": period, "start": start})
+        if start is None:
+            return self.df
+        return self.df[self.df.index >= pd.Timestamp(start).tz_localize(self.df.index.tz)]
+
+
+def _create_df(num_days: int, closes: np.ndarray | None = None) -> pd.DataFrame:
+    index = pd.bdate_range("2024-01-01", periods=num_days, tz="America/New_York")
+    closes = np.arange(100.0, 100.0 + num_days) if closes is None else closes
+    return pd.DataFrame(
+        {"Close": closes, "Dividends": np.zeros(num_days), "Stock Splits": np.zeros(num_days)},
+        index=index,
+    )
+
+
+def _create_store(tmp_path, provider: FakeProvider) -> HistoryStore:
+    return HistoryStore(tmp_path, provider, refresh_interval=datetime.timedelta(0))
+
+
+def test_first_fetch_saves_full_history(tmp_path):
+    provider = FakeProvider(_create_df(10))
+    store = _create_store(tmp_path, provider)
+
+    df = store.load("TEST")
+
+    pd.testing.assert_frame_equal(df, provider.df, check_freq=False)
+    assert provider.calls == [{"period": "max", "start": None}]
+    assert store.path("TEST", "1d").exists()
+
+
+def test_tail_is_appended(tmp_path):
+    provider = FakeProvider(_create_df(10))
+    store = _create_store(tmp_path, provider)
+    store.load("TEST")
+
+    provider.df = _create_df(15)
+    df = store.load("TEST")
+
+    pd.testing.assert_frame_equal(df, provider.df, check_freq=False)
+    assert provider.calls[-1] == {"period": None, "start": provider.df.index[8].date()}
+
+
+def test_recent_file_is_not_refreshed(tmp_path):
+    provider = FakeProvider(_create_df(10))
+    store = HistoryStore(tmp_path, provider, refresh_interval=datetime.timedelta(hours=1))
+    store.load("TEST")
+
+    provider.df = _create_df(15)
+    df = store.load("TEST")
+
+    assert len(df) == 10
+    assert len(provider.calls) == 1
+
+
+def test_split_refetches_full_history(tmp_path):
+    provider = FakeProvider(_create_df(10))
+    store = _create_store(tmp_path, provider)
+    store.load("TEST")
+
+    # 分割により過去の価格が半分に調整される
+    adjusted_df = _create_df(12, np.arange(100.0, 112.0) / 2)
+    adjusted_df.iloc[-1, adjusted_df.columns.get_loc("Stock Splits")] = 2.0
+    provider.df = adjusted_df
+    df = store.load("TEST")
+
+    pd.testing.assert_frame_equal(df, adjusted_df, check_freq=False)
+    assert provider.calls[-1] == {"period": "max", "start": None}
+    pd.testing.assert_frame_equal(pd.read_parquet(store.path("TEST", "1d")), adjusted_df, check_freq=False)
+
+
+def test_changed_close_refetches_full_history(tmp_path):
+    provider = FakeProvider(_create_df(10))
+    store = _create_store(tmp_path, provider)
+    store.load("TEST")
+
+    # 配当の列がなくても, 確定済みの足の終値が変わった場合は全期間を取得し直す
+    adjusted_df = _create_df(12, np.arange(100.0, 112.0) * 0.99).drop(columns=["Dividends", "Stock Splits"])
+    provider.df = adjusted_df
+    df = store.load("TEST")
+
+    pd.testing.assert_frame_equal(df, adjusted_df, check_freq=False)
+    assert provider.calls[-1] == {"period": "max", "start": None}
@@ -0,0 +1,86 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from investment_analytics.services.analysis import compute_daily_metrics
+from investment_analytics.services.analysis import compute_weekly_metrics
+from investment_analytics.services.incremental_metrics import IncrementalMetrics
+
+START_DATE = datetime.date(2021, 1, 1)
+
+
+def _create_df(num_days: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2020-06-01", periods=num_days, tz="America/New_York")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, num_days)))
+    return pd.DataFrame({"Close": close}, index=index)
+
+
+def _assert_matches_full_recompute(metrics: IncrementalMetrics, df: pd.DataFrame, ma_period: int) -> None:
+    daily_df, weekly_df = metrics.update(df, ma_period)
+    expected_daily_df = compute_daily_metrics(df, ma_period, START_DATE)
+    expected_weekly_df = compute_weekly_metrics(expected_daily_df, START_DATE)
+
+    pd.testing.assert_frame_equal(daily_df, expected_daily_df, check_exact=True)
+    pd.testing.assert_frame_equal(weekly_df, expected_weekly_df, check_exact=True, check_freq=False)
+
+
+def _revise(df: pd.DataFrame, position: int, factor: float) -> pd.DataFrame:
+    revised_df = df.copy()
+    revised_df.iloc[position, 0] *= factor
+    return revised_df
+
+
+@pytest.mark.parametrize("ma_period", [1, 20, 100])
+def test_updates_match_full_recompute(ma_period):
+    full_df = _create_df(400, seed=ma_period)
+    metrics = IncrementalMetrics(START_DATE)
+
+    # 初回, 1 本ずつの追加, 複数本の追加
+    _assert_matches_full_recompute(metrics, full_df.iloc[:300], ma_period)
+    for end in range(301, 306):
+        _assert_matches_full_recompute(metrics, full_df.iloc[:end], ma_period)
+        assert metrics.num_updated_rows == 1
+    _assert_matches_full_recompute(metrics, full_df.iloc[:350], ma_period)
+
+    # 末尾の未確定の足の修正
+    df = _revise(full_df.iloc[:350], -1, 1.01)
+    _assert_matches_full_recompute(metrics, df, ma_period)
+    assert metrics.num_updated_rows == 1
+
+    # 途中の足の修正 (分割・配当の調整など)
+    df = _revise(df, 200, 0.98)
+    _assert_matches_full_recompute(metrics, df, ma_period)
+    assert metrics.num_updated_rows == 150
+
+    # 末尾の足の削除
+    _assert_matches_full_recompute(metrics, df.iloc[:340], ma_period)
+    _assert_matches_full_recompute(metrics, df.iloc[:340], ma_period)
+    assert metrics.num_updated_rows == 0
+
+    # 全体の置き換え
+    _assert_matches_full_recompute(metrics, _create_df(380, seed=100 + ma_period), ma_period)
+
+
+def test_changing_ma_period_reuses_state():
+    df = _create_df(400, seed=0)
+    metrics = IncrementalMetrics(START_DATE)
+    _assert_matches_full_recompute(metrics, df, 20)
+    rolling = metrics.rolling
+
+    for ma_period in (1, 100, 200, 500):
+        _assert_matches_full_recompute(metrics, df, ma_period)
+        assert metrics.num_updated_rows == 0
+        assert metrics.rolling is rolling
+
+
+def test_update_after_empty_weekly_metrics():
+    df = _create_df(400, seed=0)
+    metrics = IncrementalMetrics(START_DATE)
+
+    # 開始日以降の足がない更新のあとに, 開始日以降の足を追加する
+    _, weekly_df = metrics.update(df[df.index.date < START_DATE], 20)
+    assert weekly_df.empty
+    _assert_matches_full_recompute(metrics, df, 20)
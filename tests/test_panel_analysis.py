@@ -0,0 +1,125 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from investment_analytics.models.bars import Bars
+from investment_analytics.services.analysis import compute_daily_metrics
+from investment_analytics.services.analysis import compute_period_change
+from investment_analytics.services.analysis import compute_weekly_metrics
+from investment_analytics.services.panel_analysis import build_close_matrix
+from investment_analytics.services.panel_analysis import compute_panel_daily_metrics
+from investment_analytics.services.panel_analysis import compute_panel_summary
+from investment_analytics.services.panel_analysis import compute_panel_weekly_metrics
+
+START_DATE = datetime.date(2022, 1, 1)
+
+
+def _create_bars(index: pd.DatetimeIndex, rng: np.random.Generator) -> Bars:
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(index))))
+    return Bars.from_frame(pd.DataFrame({"Close": close}, index=index))
+
+
+def _create_symbol_to_bars() -> dict[str, Bars]:
+    """
+    取引日の異なる銘柄 (ニューヨーク, 東京, 24 時間取引) の価格データを作成する.
+    """
+    rng = np.random.default_rng(0)
+
+    new_york_index = pd.bdate_range("2021-01-01", "2023-06-30", tz="America/New_York")
+    new_york_index = new_york_index[rng.random(len(new_york_index)) > 0.03]
+
+    # 東京は開始日が遅く (行列の先頭が欠損値になる), 1 週間の休場を含む
+    tokyo_index = pd.bdate_range("2021-09-01", "2023-06-30", tz="Asia/Tokyo")
+    tokyo_index = tokyo_index[(tokyo_index < "2022-05-02") | (tokyo_index >= "2022-05-09")]
+
+    utc_index = pd.date_range("2021-03-15", "2023-06-30", freq="D", tz="UTC")
+
+    return {
+        "NY": _create_bars(new_york_index, rng),
+        "TOKYO": _create_bars(tokyo_index, rng),
+        "UTC": _create_bars(utc_index, rng),
+    }
+
+
+def _compute_reference(bars: Bars, ma_period: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    df = pd.DataFrame({"Close": bars.close}, index=bars.index.tz_localize(None).normalize())
+    daily_df = compute_daily_metrics(df, ma_period, START_DATE)
+    return daily_df, compute_weekly_metrics(daily_df, START_DATE)
+
+
+def _compute_reference_summary(
+    daily_df: pd.DataFrame,
+    weekly_df: pd.DataFrame,
+    threshold: float,
+    multiplier: int,
+) -> dict[str, float]:
+    streak = 0
+    max_streak = 0
+    last_streak = np.nan
+
+    for change in weekly_df["Change"]:
+        streak = streak + 1 if change < 0 else 0
+        max_streak = max(max_streak, streak)
+        if not np.isnan(change):
+            last_streak = streak
+
+    mads = daily_df["MAD"].dropna()
+    current_price, change = compute_period_change(daily_df)
+
+    return {
+        "Close": current_price,
+        "Change": change,
+        "MAD": mads.iloc[-1] if len(mads) else np.nan,
+        "DownStreak": last_streak,
+        "MaxDownStreak": max_streak,
+        "ThresholdWeeks": int((weekly_df["Change"] * multiplier >= threshold).sum()),
+    }
+
+
+@pytest.mark.parametrize("ma_period", [1, 20, 100])
+def test_panel_metrics_match_per_symbol_metrics(ma_period):
+    symbol_to_bars = _create_symbol_to_bars()
+    close_df = build_close_matrix(symbol_to_bars)
+    panel_daily_df = compute_panel_daily_metrics(close_df, ma_period, START_DATE)
+    panel_weekly_df = compute_panel_weekly_metrics(panel_daily_df, START_DATE)
+
+    for symbol, bars in symbol_to_bars.items():
+        daily_df, weekly_df = _compute_reference(bars, ma_period)
+
+        for metric in ("Close", "Change", "MA", "MAD"):
+            panel_values = panel_daily_df[metric][symbol]
+            pd.testing.assert_series_equal(
+                panel_values.loc[daily_df.index],
+                daily_df[metric],
+                check_exact=True,
+                check_names=False,
+                check_freq=False,
+            )
+            # 取引のない日は欠損値とする
+            assert panel_values.drop(daily_df.index).isna().all()
+
+        for metric in ("Close", "Change"):
+            pd.testing.assert_series_equal(
+                panel_weekly_df[metric][symbol].loc[weekly_df.index],
+                weekly_df[metric],
+                check_exact=True,
+                check_names=False,
+                check_freq=False,
+            )
+
+
+@pytest.mark.parametrize(("threshold", "condition", "multiplier"), [(3.0, "下落", -1), (2.0, "上昇", 1)])
+def test_panel_summary_matches_per_symbol_summary(threshold, condition, multiplier):
+    symbol_to_bars = _create_symbol_to_bars()
+    close_df = build_close_matrix(symbol_to_bars)
+    panel_daily_df = compute_panel_daily_metrics(close_df, 20, START_DATE)
+    panel_weekly_df = compute_panel_weekly_metrics(panel_daily_df, START_DATE)
+    summary_df = compute_panel_summary(panel_daily_df, panel_weekly_df, threshold, condition)
+
+    for symbol, bars in symbol_to_bars.items():
+        daily_df, weekly_df = _compute_reference(bars, 20)
+        expected = _compute_reference_summary(daily_df, weekly_df, threshold, multiplier)
+
+        assert summary_df.loc[symbol].to_dict() == expected
@@ -0,0 +1,30 @@
+import pytest
+
+from investment_analytics.services.providers import ReplayProvider
+from investment_analytics.services.providers import get_provider
+from investment_analytics.services.providers import set_provider
+from investment_analytics.services.realtime_snapshot import fetch_realtime_snapshots
+
+NUM_SYMBOLS = 20
+
+
+@pytest.fixture
+def replay_provider():
+    previous_provider = get_provider()
+    provider = ReplayProvider(error_rate=0.5, seed=0)
+    set_provider(provider)
+    yield provider
+    set_provider(previous_provider)
+
+
+def test_failed_symbols_are_excluded_from_snapshots(replay_provider):
+    symbols = [f"SNAPSHOT{i}" for i in range(NUM_SYMBOLS)]
+
+    snapshots = fetch_realtime_snapshots(symbols)
+
+    assert replay_provider.num_errors > 0
+    assert 0 < len(snapshots) < NUM_SYMBOLS
+    assert set(snapshots) <= set(symbols)
+    for snapshot in snapshots.values():
+        assert not snapshot.intraday_df.empty
+        assert snapshot.previous_price > 0
@@ -0,0 +1,29 @@
+from investment_analytics.models.ticker import Ticker
+from investment_analytics.models.ticker import TickerRegistry
+
+
+def _create_registry() -> TickerRegistry:
+    return TickerRegistry(
+        Ticker(symbol, name, "USD", 2000, 6.5)
+        for symbol, name in [
+            ("AAPL", "Apple"),
+            ("GOOG", "Alphabet"),
+            ("GOOGL", "Alphabet"),
+            ("MSFT", "Microsoft"),
+            ("NVDA", "NVIDIA"),
+        ]
+    )
+
+
+def test_search_fuzzy_matches_typos():
+    registry = _create_registry()
+
+    assert [ticker.symbol for ticker in registry.search_fuzzy("microsft")] == ["MSFT"]
+    assert [ticker.symbol for ticker in registry.search_fuzzy("nvdia")] == ["NVDA"]
+    assert registry.search_fuzzy("xyz") == []
+
+
+def test_search_fuzzy_returns_all_tickers_with_the_same_key():
+    registry = _create_registry()
+
+    assert [ticker.symbol for ticker in registry.search_fuzzy("alphabt")] == ["GOOG", "GOOGL"]